@@ -0,0 +1 @@
+"""Performance benchmarks (run from the project root, e.g. python -m benchmarks.bench_batch)"""
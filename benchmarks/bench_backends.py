@@ -0,0 +1,51 @@
+"""CPU latency per inference backend, with a check that results match PyTorch"""
+import argparse
+from pathlib import Path
+
+from src.config import MODEL_PATH
+from src.core.backends import BACKENDS
+from src.core.detector import AerialDetector
+from src.core.media_handler import MediaHandler
+from benchmarks.common import synthetic_frames, time_call, compare_detections, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--images", type=Path, nargs="*", help="Images to use (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=8, help="Number of synthetic frames")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    frames = [MediaHandler.load_image(p) for p in args.images] if args.images else synthetic_frames(args.frames)
+    
+    reference = None
+    rows = []
+    for backend in args.backends.split(","):
+        detector = AerialDetector(args.model, backend=backend)  # First run exports and caches the model
+        results = [detector.detect(f) for f in frames]
+        if reference is None:
+            reference = results
+        
+        single = time_call(lambda: [detector.detect(f) for f in frames], repeats=args.repeats)
+        batched = time_call(lambda: detector.detect_batch(frames, args.batch_size), repeats=args.repeats)
+        
+        diffs = [compare_detections(r, c) for r, c in zip(reference, results)]
+        rows.append({
+            "backend": backend,
+            "ms/frame": single["min"] * 1000 / len(frames),
+            "ms/frame batched": batched["min"] * 1000 / len(frames),
+            "recall": min(d["recall"] for d in diffs),
+            "precision": min(d["precision"] for d in diffs),
+            "max conf diff": max(d["max_conf_diff"] for d in diffs),
+            "max box diff": max(d["max_box_diff"] for d in diffs),
+        })
+    
+    print(f"{len(frames)} frames; recall/precision are relative to the first backend ({rows[0]['backend']})")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare single-frame detect() against batched detect_batch() throughput"""
+import argparse
+from pathlib import Path
+
+from src.config import MODEL_PATH
+from src.core.detector import AerialDetector
+from benchmarks.common import synthetic_frames, time_call, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--frames", type=int, default=32)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--batch-sizes", default="2,4,8,16")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    detector = AerialDetector(args.model)
+    frames = synthetic_frames(args.frames, args.width, args.height)
+    
+    rows = []
+    single = time_call(lambda: [detector.detect(f) for f in frames], repeats=args.repeats)
+    rows.append({"mode": "single", "batch": 1, "fps": args.frames / single["min"], "speedup": 1.0})
+    
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        timing = time_call(lambda: detector.detect_batch(frames, batch_size), repeats=args.repeats)
+        rows.append({
+            "mode": "batch",
+            "batch": batch_size,
+            "fps": args.frames / timing["min"],
+            "speedup": single["min"] / timing["min"],
+        })
+    
+    print(f"{args.frames} frames at {args.width}x{args.height}")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Throughput of DetectorPool layouts (contexts x threads per context) on this machine
+
+All layouts share one loaded model. The baseline is a single detector called in a
+loop with torch's default threading. Latency is per job, from submit to result,
+so it includes time spent queued behind other jobs.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.config import MODEL_PATH
+from src.core.detector import AerialDetector
+from src.core.detector_pool import DetectorPool, available_cpus
+from benchmarks.common import synthetic_frames, print_table
+
+
+def default_layouts(cores: int):
+    """Every power-of-two split of the cores into contexts x threads"""
+    layouts, contexts = [], 1
+    while contexts <= cores:
+        layouts.append((contexts, cores // contexts))
+        contexts *= 2
+    return layouts
+
+
+def run_pool(pool: DetectorPool, frames, batch_size: int):
+    submitted, latencies = [], []
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        submitted.append((time.perf_counter(), pool.submit(AerialDetector.detect_batch, frames[i:i + batch_size], batch_size)))
+    for t0, future in submitted:
+        future.result()
+        latencies.append(time.perf_counter() - t0)
+    # Futures are collected in order, so a latency can include waiting for an earlier job
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--layouts", help="Comma-separated CONTEXTSxTHREADS, e.g. 1x16,2x8,4x4 (default: all splits)")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1, help="Frames per job")
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin contexts to cores")
+    parser.add_argument("--mock", action="store_true", help="Use the mock model (checks the pool, not the CPU)")
+    parser.add_argument("--infer-ms", type=float, default=20.0, help="Mock inference time per frame")
+    args = parser.parse_args()
+    
+    cores = len(available_cpus())
+    layouts = [tuple(int(n) for n in l.split("x")) for l in args.layouts.split(",")] if args.layouts \
+        else default_layouts(cores)
+    frames = synthetic_frames(args.frames)
+    
+    if args.mock:
+        from benchmarks.mock_model import MockDetector
+        detector = MockDetector(infer_ms=args.infer_ms)
+    else:
+        detector = AerialDetector(args.model)
+    
+    detector.detect(frames[0])  # Warm-up
+    start = time.perf_counter()
+    for i in range(0, len(frames), args.batch_size):
+        detector.detect_batch(frames[i:i + args.batch_size], args.batch_size)
+    baseline = time.perf_counter() - start
+    rows = [{"layout": "single detector", "cpus": "any", "fps": len(frames) / baseline, "speedup": 1.0,
+             "p50 ms": float("nan"), "p95 ms": float("nan")}]
+    
+    for contexts, threads in layouts:
+        with DetectorPool(contexts=contexts, threads_per_context=threads, pin_cores=not args.no_pin,
+                          detector=detector) as pool:
+            elapsed, latencies = run_pool(pool, frames, args.batch_size)
+            pinned = pool.layout()[0]["cpus"]
+        rows.append({
+            "layout": f"{contexts} x {threads}",
+            "cpus": "pinned" if pinned else "any",
+            "fps": len(frames) / elapsed,
+            "speedup": baseline / elapsed,
+            "p50 ms": float(np.percentile(latencies, 50)) * 1000,
+            "p95 ms": float(np.percentile(latencies, 95)) * 1000,
+        })
+    
+    print(f"{len(frames)} frames, {cores} usable cores (os.cpu_count() = {os.cpu_count()}), "
+          f"{args.batch_size} frame(s) per job")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Accuracy vs speed of reduced-precision modes against the FP32 PyTorch baseline
+
+Every mode runs on the same fixed image set; recall/precision count how many of
+the baseline's detections each mode reproduces (same class, IoU >= 0.5), pooled
+over all images. The last line names the fastest mode within --min-recall and
+--min-precision. Static INT8 calibrates on --calibration (default: the
+QUANTIZATION_CONFIG calibration dir), which should not be the evaluation set.
+"""
+import argparse
+from pathlib import Path
+
+from src.config import MODEL_PATH
+from src.core.backends import PRECISIONS, calibration_images
+from src.core.detector import AerialDetector
+from src.core.media_handler import MediaHandler
+from benchmarks.common import synthetic_frames, time_call, compare_detections, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--modes", default=",".join(PRECISIONS), help="Precisions to run on the onnx backend")
+    parser.add_argument("--images", type=Path, nargs="*", help="Evaluation images (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=8, help="Number of synthetic frames")
+    parser.add_argument("--calibration", type=Path, help="Directory of calibration frames for int8-static")
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--min-precision", type=float, default=0.95)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    if args.images:
+        frames = [MediaHandler.load_image(p) for p in args.images]
+    else:
+        print("Warning: synthetic frames give few detections; pass --images for a meaningful accuracy check")
+        frames = synthetic_frames(args.frames)
+    calibration = calibration_images(args.calibration) if args.calibration else None
+    
+    runs = [("pytorch", "fp32")] + [("onnx", mode) for mode in args.modes.split(",")]
+    reference = None
+    rows = []
+    for backend, precision in runs:
+        try:
+            # First run exports (and quantizes) the model and caches it
+            detector = AerialDetector(args.model, backend, precision, calibration)
+        except (ImportError, ValueError) as e:
+            print(f"Skipping {backend}/{precision}: {e}")
+            continue
+        results = [detector.detect(f) for f in frames]
+        if reference is None:
+            reference = results
+        
+        timing = time_call(lambda: [detector.detect(f) for f in frames], repeats=args.repeats)
+        diffs = [compare_detections(r, c) for r, c in zip(reference, results)]
+        expected = sum(len(r) for r in reference)
+        found = sum(len(c) for c in results)
+        rows.append({
+            "mode": f"{backend}/{precision}",
+            "ms/image": timing["min"] * 1000 / len(frames),
+            "speedup": 0.0,
+            "detections": found,
+            # Pool matches over images so images with many people weigh more
+            "recall": sum(d["recall"] * len(r) for d, r in zip(diffs, reference)) / expected if expected else 1.0,
+            "precision": sum(d["precision"] * len(c) for d, c in zip(diffs, results)) / found if found else 1.0,
+            "max conf diff": max(d["max_conf_diff"] for d in diffs),
+        })
+    
+    if not rows:
+        return
+    for row in rows:
+        row["speedup"] = rows[0]["ms/image"] / row["ms/image"]
+    print(f"{len(frames)} images; recall/precision are relative to {rows[0]['mode']}")
+    print_table(rows)
+    
+    within = [r for r in rows if r["recall"] >= args.min_recall and r["precision"] >= args.min_precision]
+    best = min(within, key=lambda r: r["ms/image"])
+    print(
+        f"\nFastest within tolerance (recall >= {args.min_recall}, precision >= {args.min_precision}): "
+        f"{best['mode']} ({best['speedup']:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Decode cost of frame sampling: reading every frame vs grab()-skipping vs seeking
+
+Runs on a synthetic video (4K by default) or --video, decoding only; the model is
+not involved. "max diff" is the largest pixel difference from the frames the
+read-everything loop returns at the same indices (0 means identical frames).
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.core.media_handler import MediaHandler
+from benchmarks.common import write_synthetic_video, print_table
+
+
+def read_all(video: Path, stride: int):
+    """The old loop: decode every frame and keep every stride-th"""
+    cap, _ = MediaHandler.load_video(video)
+    try:
+        return {index: frame for index, frame in MediaHandler.iter_frames(cap) if (index + 1) % stride == 0}
+    finally:
+        cap.release()
+
+
+def sampled(video: Path, stride: int, seek_stride: int):
+    cap, _ = MediaHandler.load_video(video)
+    try:
+        return dict(MediaHandler.sample_frames(cap, stride, seek_stride))
+    finally:
+        cap.release()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def max_diff(reference: dict, frames: dict) -> int:
+    if reference.keys() != frames.keys():
+        return -1
+    return max((int(np.abs(reference[i].astype(np.int16) - frames[i]).max()) for i in reference), default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", type=Path, help="Existing video (default: synthetic)")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--strides", default="2,5,15,60")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="bench_sampling_") as temp_dir:
+        video = args.video
+        if video is None:
+            video = write_synthetic_video(Path(temp_dir) / "long.mp4", args.frames, args.width, args.height)
+        cap, metadata = MediaHandler.load_video(video)
+        cap.release()
+        print(f"{video.name}: {metadata['width']}x{metadata['height']}, {metadata['total_frames']} frames\n")
+        
+        rows = []
+        for stride in (int(s) for s in args.strides.split(",")):
+            reference, base = timed(lambda: read_all(video, stride))
+            variants = {
+                "read all": (reference, base),
+                "grab": timed(lambda: sampled(video, stride, seek_stride=stride + 1)),
+                "seek": timed(lambda: sampled(video, stride, seek_stride=1)),
+            }
+            for name, (frames, seconds) in variants.items():
+                rows.append({
+                    "stride": stride,
+                    "method": name,
+                    "frames out": len(frames),
+                    "seconds": seconds,
+                    "speedup": base / seconds if seconds else float("nan"),
+                    "max diff": max_diff(reference, frames),
+                })
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
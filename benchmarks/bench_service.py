@@ -0,0 +1,107 @@
+"""Load test for the HTTP inference service: latency percentiles and requests/sec per concurrency
+
+Start the service first (python serve.py), then run this against it.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import SERVICE_CONFIG
+from benchmarks.common import synthetic_frames, print_table
+
+
+async def request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str, body: bytes = b""
+) -> Tuple[int, dict]:
+    """Send one keep-alive HTTP/1.1 request and read the JSON response"""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host: str, port: int, payload: bytes, count: int, latencies: List[float], errors: List[int]) -> None:
+    """One connection sending count requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", "/detect", payload)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_level(host: str, port: int, payload: bytes, concurrency: int, requests: int) -> Dict[str, float]:
+    """Fire requests from concurrency connections and summarize latency"""
+    reader, writer = await asyncio.open_connection(host, port)
+    _, before = await request(reader, writer, "GET", "/health")
+    
+    latencies, errors = [], []
+    per_client = max(1, requests // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, payload, per_client, latencies, errors) for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    
+    _, after = await request(reader, writer, "GET", "/health")
+    writer.close()
+    
+    batches = after["batching"]["batches"] - before["batching"]["batches"]
+    images = after["batching"]["images"] - before["batching"]["images"]
+    ms = np.array(latencies) * 1000.0 if latencies else np.zeros(1)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "req/s": len(latencies) / wall,
+        "p50 ms": float(np.percentile(ms, 50)),
+        "p95 ms": float(np.percentile(ms, 95)),
+        "p99 ms": float(np.percentile(ms, 99)),
+        "mean batch": images / batches if batches else 0.0,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    image = synthetic_frames(1, args.width, args.height)[0]
+    payload = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+    
+    rows = []
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        rows.append(await run_level(args.host, args.port, payload, concurrency, args.requests))
+    
+    print(f"{args.width}x{args.height} JPEG ({len(payload) // 1024} KB), ~{args.requests} requests per level")
+    print_table(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=SERVICE_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=SERVICE_CONFIG["port"])
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Scaling benchmark: frames/sec of ShardedVideoProcessor against worker count"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.config import MODEL_PATH
+from src.core.media_handler import MediaHandler
+from src.core.detector import AerialDetector
+from src.core.sharding import ShardedVideoProcessor
+from benchmarks.common import write_synthetic_video, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--video", type=Path, help="Video to process (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=240, help="Length of the synthetic video")
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts, e.g. 1,2,4,8")
+    parser.add_argument("--torch-threads", type=int, default=None,
+                        help="Threads per worker (default: cores / workers)")
+    args = parser.parse_args()
+    
+    cores = os.cpu_count() or 1
+    worker_counts = [int(w) for w in args.workers.split(",")] if args.workers else \
+        [n for n in (1, 2, 4, 8, 16, 32) if n <= cores]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video = args.video or write_synthetic_video(Path(temp_dir) / "synthetic.mp4", args.frames)
+        _, metadata = MediaHandler.load_video(video)
+        total = metadata["total_frames"]
+        
+        # Baseline: single process, single detector, default torch threading
+        detector = AerialDetector(args.model)
+        start = time.perf_counter()
+        MediaHandler.stream_video(video, detector, Path(temp_dir) / "baseline.mp4")
+        baseline = time.perf_counter() - start
+        rows = [{"workers": "stream", "threads": "auto", "fps": total / baseline, "speedup": 1.0}]
+        
+        for workers in worker_counts:
+            threads = args.torch_threads or max(1, cores // workers)
+            processor = ShardedVideoProcessor(args.model, num_workers=workers, torch_threads=threads)
+            start = time.perf_counter()
+            processor.process(video, Path(temp_dir) / f"sharded_{workers}.mp4")
+            elapsed = time.perf_counter() - start
+            rows.append({"workers": workers, "threads": threads, "fps": total / elapsed, "speedup": baseline / elapsed})
+    
+    print(f"{total} frames, {cores} cores (times include model load per worker and stitching)")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Application startup time: module import, time to first window and time until the model is ready
+
+Each run launches a fresh interpreter that imports src.ui.main_window, shows the
+MainWindow (offscreen unless --show) and waits for the background model load.
+"cold" runs start with an empty bytecode cache (a new PYTHONPYCACHEPREFIX), so
+every module is compiled again; "warm" runs share a cache filled by an untimed
+run first. The OS file cache is not flushed, so a first run after a reboot can
+be slower still. Times in ms are measured from launching the process, medians
+over --runs. "heavy before window" lists inference modules that had already
+been imported when the window was created (it should be empty).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import print_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, os, sys, time
+started = time.time()
+from PyQt5.QtWidgets import QApplication
+from src.ui.main_window import MainWindow
+imported = time.time()
+heavy = [m for m in ("torch", "ultralytics", "cv2") if m in sys.modules]
+
+app = QApplication(sys.argv[:1])
+window = MainWindow()
+window.show()
+app.processEvents()
+shown = time.time()
+
+ready = None
+if sys.argv[1] == "wait":
+    from PyQt5.QtCore import QTimer
+    timer = QTimer()
+    timer.timeout.connect(lambda: app.quit() if window.detector is not None or window.model_loader.isFinished() else None)
+    timer.start(5)
+    app.exec_()
+    ready = time.time() if window.detector is not None else None
+
+print(json.dumps({"started": started, "imported": imported, "shown": shown, "ready": ready, "heavy": heavy}), flush=True)
+os._exit(0)  # Skip closeEvent, which would save these settings
+"""
+
+
+def launch(pycache: Path, wait_model: bool, show: bool) -> dict:
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(pycache))
+    if not show:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    launched = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, "wait" if wait_model else "nowait"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    
+    def ms(t):
+        return (t - launched) * 1000 if t is not None else float("nan")
+    
+    return {
+        "interpreter": ms(result["started"]),
+        "import": (result["imported"] - result["started"]) * 1000,
+        "first window": ms(result["shown"]),
+        "model ready": ms(result["ready"]),
+        "heavy": ",".join(result["heavy"]) or "-",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-model", action="store_true", help="Stop at the first window, without waiting for the model")
+    parser.add_argument("--show", action="store_true", help="Use the real display instead of offscreen rendering")
+    args = parser.parse_args()
+    
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as temp_dir:
+        warm_cache = Path(temp_dir) / "warm"
+        launch(warm_cache, not args.no_model, args.show)  # Fills the warm cache
+        
+        for mode in ("cold", "warm"):
+            runs = []
+            for i in range(args.runs):
+                cache = Path(temp_dir) / f"cold_{i}" if mode == "cold" else warm_cache
+                runs.append(launch(cache, not args.no_model, args.show))
+            row = {"start": mode}
+            for key in ("interpreter", "import", "first window", "model ready"):
+                row[f"{key} ms"] = float(np.median([r[key] for r in runs]))
+            row["heavy before window"] = runs[-1]["heavy"]
+            rows.append(row)
+    
+    print(f"{args.runs} run(s) per mode; ms since process launch except import (src.ui.main_window incl. PyQt5)")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Per-stage timing suite over synthetic images and videos, written to JSON for run-to-run comparison
+
+Stages: decode, preprocess, inference, postprocess, render, encode. Preprocess and
+inference come from the model's own per-image timings; postprocess is the rest of
+the detection call (NMS plus conversion to Detections). With --mock the model is
+replaced by a stand-in so everything except inference can be measured without weights.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+from src.config import MODEL_PATH, VIDEO_CONFIG
+from src.core.detector import AerialDetector
+from src.core.media_handler import MediaHandler
+from benchmarks.common import synthetic_frames, write_synthetic_video, print_table
+
+STAGES = ["decode", "preprocess", "inference", "postprocess", "render", "encode"]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class SpeedRecorder:
+    """Wraps a model and collects the per-image speed dict of every result"""
+    
+    def __init__(self, model):
+        self.model = model
+        self.speeds: List[Dict[str, float]] = []
+    
+    def __call__(self, *args, **kwargs):
+        results = self.model(*args, **kwargs)
+        self.speeds.extend(r.speed for r in results)
+        return results
+
+
+def time_detection(detector: AerialDetector, frames: List[np.ndarray], batch_size: int) -> Dict[str, Any]:
+    """Split detection time into preprocess, inference and postprocess seconds"""
+    model = detector.model
+    recorder = SpeedRecorder(model)
+    detector.model = recorder
+    try:
+        start = time.perf_counter()
+        detections = detector.detect_batch(frames, batch_size)
+        wall = time.perf_counter() - start
+    finally:
+        detector.model = model
+    
+    preprocess = sum(s.get("preprocess") or 0.0 for s in recorder.speeds) / 1000.0
+    inference = sum(s.get("inference") or 0.0 for s in recorder.speeds) / 1000.0
+    return {
+        "preprocess": preprocess,
+        "inference": inference,
+        "postprocess": max(0.0, wall - preprocess - inference),
+        "detections": detections,
+    }
+
+
+def time_render(frames: List[np.ndarray], detections: list) -> Dict[str, Any]:
+    start = time.perf_counter()
+    annotated = [MediaHandler.annotate_frame(f, d, show_count=True) for f, d in zip(frames, detections)]
+    return {"render": time.perf_counter() - start, "annotated": annotated}
+
+
+def run_video(detector: AerialDetector, video: Path, output: Path, batch_size: int) -> Dict[str, float]:
+    """One pass over a video; returns seconds per stage"""
+    start = time.perf_counter()
+    cap, metadata = MediaHandler.load_video(video)
+    frames = [frame for _, frame in MediaHandler.iter_frames(cap)]
+    cap.release()
+    timings = {"decode": time.perf_counter() - start}
+    
+    detected = time_detection(detector, frames, batch_size)
+    rendered = time_render(frames, detected["detections"])
+    
+    start = time.perf_counter()
+    MediaHandler.save_video(rendered["annotated"], output, metadata["fps"] or VIDEO_CONFIG["output_fps"])
+    timings["encode"] = time.perf_counter() - start
+    
+    timings.update({k: detected[k] for k in ("preprocess", "inference", "postprocess")})
+    timings["render"] = rendered["render"]
+    timings["frames"] = len(frames)
+    timings["detections"] = sum(len(d) for d in detected["detections"])
+    return timings
+
+
+def run_image(detector: AerialDetector, image_path: Path, output: Path) -> Dict[str, float]:
+    """One pass over a still image; returns seconds per stage"""
+    start = time.perf_counter()
+    image = MediaHandler.load_image(image_path)
+    timings = {"decode": time.perf_counter() - start}
+    
+    detected = time_detection(detector, [image], 1)
+    rendered = time_render([image], detected["detections"])
+    
+    start = time.perf_counter()
+    MediaHandler.save_image(rendered["annotated"][0], output)
+    timings["encode"] = time.perf_counter() - start
+    
+    timings.update({k: detected[k] for k in ("preprocess", "inference", "postprocess")})
+    timings["render"] = rendered["render"]
+    timings["frames"] = 1
+    timings["detections"] = len(detected["detections"][0])
+    return timings
+
+
+def best_of(runs: List[Dict[str, float]]) -> Dict[str, Any]:
+    """Per-stage minimum over repeats, reported in ms per frame"""
+    frames = runs[0]["frames"]
+    stages = {s: min(r[s] for r in runs) * 1000.0 / frames for s in STAGES}
+    total = sum(stages.values())
+    return {
+        "frames": frames,
+        "detections_per_frame": runs[0]["detections"] / frames,
+        "stages_ms_per_frame": stages,
+        "total_ms_per_frame": total,
+        "fps": 1000.0 / total if total else 0.0,
+    }
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    """Enough context to tell whether two result files are comparable"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "model": "mock" if args.mock else str(args.model),
+        "mock_infer_ms": args.mock_infer_ms if args.mock else None,
+        "batch_size": args.batch_size,
+        "repeats": args.repeats,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    """Print per-stage time ratios against a previous result file (< 1.0 is faster)"""
+    baseline = {
+        (r["kind"], r["resolution"], r["density"]): r for r in json.loads(baseline_path.read_text())["results"]
+    }
+    rows = []
+    for r in results:
+        old = baseline.get((r["kind"], r["resolution"], r["density"]))
+        if old is None:
+            continue
+        row = {"kind": r["kind"], "resolution": r["resolution"], "density": r["density"]}
+        for stage in STAGES + ["total"]:
+            new_ms = r["total_ms_per_frame"] if stage == "total" else r["stages_ms_per_frame"][stage]
+            old_ms = old["total_ms_per_frame"] if stage == "total" else old["stages_ms_per_frame"][stage]
+            row[stage] = new_ms / old_ms if old_ms else float("nan")
+        rows.append(row)
+    
+    print(f"\nRatio to {baseline_path} (new / old time)")
+    print_table(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--mock", action="store_true", help="Use a stand-in model instead of the weights")
+    parser.add_argument("--mock-infer-ms", type=float, default=0.0, help="Simulated inference time per image")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1920x1080")
+    parser.add_argument("--densities", default="10,100,300", help="Objects per frame")
+    parser.add_argument("--kinds", default="image,video")
+    parser.add_argument("--frames", type=int, default=30, help="Frames per synthetic video")
+    parser.add_argument("--batch-size", type=int, default=VIDEO_CONFIG["batch_size"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Result JSON (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous result JSON to compare against")
+    args = parser.parse_args()
+    
+    if args.mock:
+        from benchmarks.mock_model import MockDetector
+    detector = None if args.mock else AerialDetector(args.model)
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as temp_dir:
+        temp = Path(temp_dir)
+        for resolution in args.resolutions.split(","):
+            width, height = (int(v) for v in resolution.lower().split("x"))
+            for density in (int(d) for d in args.densities.split(",")):
+                if args.mock:
+                    # Mock detections follow the requested density; the real model sees density blobs
+                    detector = MockDetector(density, args.mock_infer_ms)
+                
+                for kind in args.kinds.split(","):
+                    if kind == "image":
+                        source = temp / f"{resolution}_{density}.jpg"
+                        cv2.imwrite(str(source), synthetic_frames(1, width, height, objects=density)[0])
+                        runs = [run_image(detector, source, temp / "out.png") for _ in range(args.repeats)]
+                    else:
+                        source = write_synthetic_video(
+                            temp / f"{resolution}_{density}.mp4", args.frames, width, height, objects=density
+                        )
+                        runs = [
+                            run_video(detector, source, temp / "out.mp4", args.batch_size)
+                            for _ in range(args.repeats)
+                        ]
+                    results.append({"kind": kind, "resolution": resolution, "density": density, **best_of(runs)})
+    
+    rows = [
+        {
+            "kind": r["kind"],
+            "resolution": r["resolution"],
+            "density": r["density"],
+            "dets/frame": r["detections_per_frame"],
+            **r["stages_ms_per_frame"],
+            "total ms": r["total_ms_per_frame"],
+            "fps": r["fps"],
+        }
+        for r in results
+    ]
+    print("Milliseconds per frame by stage")
+    print_table(rows)
+    
+    output = args.output or RESULTS_DIR / f"suite-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"environment": environment(args), "results": results}, indent=2))
+    print(f"\nResults written to {output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Cost of tiled inference against tile count, compared with one whole-image pass"""
+import argparse
+from pathlib import Path
+
+from src.config import MODEL_PATH, TILING_CONFIG
+from src.core.detector import AerialDetector
+from src.core.media_handler import MediaHandler
+from benchmarks.common import synthetic_frames, time_call, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--image", type=Path, help="Image to use (default: synthetic 6000x4000)")
+    parser.add_argument("--tile-sizes", default="1280,960,640")
+    parser.add_argument("--overlap", type=float, default=TILING_CONFIG["overlap"])
+    parser.add_argument("--batch-size", type=int, default=TILING_CONFIG["batch_size"])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    detector = AerialDetector(args.model)
+    image = MediaHandler.load_image(args.image) if args.image else synthetic_frames(1, 6000, 4000)[0]
+    
+    whole = time_call(lambda: detector.detect(image), repeats=args.repeats)
+    found = len(detector.detect(image))
+    rows = [{"mode": "whole", "tiles": 1, "ms": whole["min"] * 1000, "ms/tile": whole["min"] * 1000,
+             "cost": 1.0, "detections": found}]
+    
+    for tile_size in (int(t) for t in args.tile_sizes.split(",")):
+        run = lambda: detector.detect_tiled(image, tile_size, args.overlap, args.batch_size)
+        timing = time_call(run, repeats=args.repeats)
+        found = len(run())
+        stats = detector.last_tile_stats
+        rows.append({
+            "mode": f"tiled {tile_size}",
+            "tiles": stats["tiles"],
+            "ms": timing["min"] * 1000,
+            "ms/tile": timing["min"] * 1000 / stats["tiles"],
+            "cost": timing["min"] / whole["min"],
+            "detections": found,
+        })
+    
+    h, w = image.shape[:2]
+    print(f"{w}x{h} image, overlap {args.overlap}, {args.batch_size} tiles per batch")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
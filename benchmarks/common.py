@@ -0,0 +1,110 @@
+"""Shared helpers for benchmark scripts"""
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+
+def synthetic_frames(
+    count: int, width: int = 1280, height: int = 720, seed: int = 0, objects: int = 20
+) -> List[np.ndarray]:
+    """Generate random BGR frames with bright blobs so the model has something to look at"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 80, size=(height, width, 3), dtype=np.uint8)
+        for _ in range(objects):
+            x = int(rng.integers(0, width - 24))
+            y = int(rng.integers(0, height - 48))
+            frame[y:y + 48, x:x + 24] = rng.integers(120, 255, size=3, dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+
+def write_synthetic_video(
+    path: Path,
+    num_frames: int,
+    width: int = 1280,
+    height: int = 720,
+    fps: float = 30.0,
+    seed: int = 0,
+    objects: int = 20,
+) -> Path:
+    """Write a synthetic test video with blobs drifting across a noisy background"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    
+    base = synthetic_frames(1, width, height, seed, objects)[0]
+    for i in range(num_frames):
+        # Shift the scene a little each frame so codecs and motion checks see change
+        writer.write(np.roll(base, shift=i * 2, axis=1))
+    
+    writer.release()
+    return path
+
+
+def time_call(fn: Callable[[], object], repeats: int = 3, warmup: int = 1) -> Dict[str, float]:
+    """Time fn() and return min/mean wall time in seconds"""
+    for _ in range(warmup):
+        fn()
+    
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    
+    return {"min": min(timings), "mean": sum(timings) / len(timings)}
+
+
+def compare_detections(reference, candidate, iou_threshold: float = 0.5) -> Dict[str, float]:
+    """Match candidate Detections against reference ones by same-class IoU
+    
+    Returns recall/precision relative to the reference plus the largest
+    confidence and box-corner differences among matched pairs.
+    """
+    from src.core.tracker import iou_matrix
+    
+    if len(reference) == 0 or len(candidate) == 0:
+        same = len(reference) == len(candidate)
+        return {"recall": 1.0 if same else 0.0, "precision": 1.0 if same else 0.0,
+                "max_conf_diff": 0.0, "max_box_diff": 0.0}
+    
+    ious = iou_matrix(reference.boxes, candidate.boxes)
+    ious[reference.class_ids[:, None] != candidate.class_ids[None, :]] = 0.0
+    
+    matched_ref, matched_cand = set(), set()
+    conf_diff, box_diff = 0.0, 0.0
+    for flat in np.argsort(-ious, axis=None):
+        r, c = np.unravel_index(flat, ious.shape)
+        if ious[r, c] < iou_threshold:
+            break
+        if r in matched_ref or c in matched_cand:
+            continue
+        matched_ref.add(r)
+        matched_cand.add(c)
+        conf_diff = max(conf_diff, abs(float(reference.confidences[r]) - float(candidate.confidences[c])))
+        box_diff = max(box_diff, float(np.abs(reference.boxes[r] - candidate.boxes[c]).max()))
+    
+    return {
+        "recall": len(matched_ref) / len(reference),
+        "precision": len(matched_cand) / len(candidate),
+        "max_conf_diff": conf_diff,
+        "max_box_diff": box_diff,
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Print a list of dicts as an aligned text table"""
+    if not rows:
+        return
+    
+    headers = list(rows[0].keys())
+    cells = [[f"{row[h]:.2f}" if isinstance(row[h], float) else str(row[h]) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
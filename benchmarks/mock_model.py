@@ -0,0 +1,123 @@
+"""Stand-in for the YOLO model so non-inference stages can be benchmarked without weights"""
+import threading
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from src.config import MODEL_CONFIG
+from src.core.detector import AerialDetector
+
+
+class _HostArray:
+    """Mimics the tensor API used by Detections.from_result"""
+    
+    def __init__(self, data: np.ndarray):
+        self.data = data
+    
+    def cpu(self) -> "_HostArray":
+        return self
+    
+    def numpy(self) -> np.ndarray:
+        return self.data
+
+
+class _Boxes:
+    def __init__(self, data: np.ndarray):
+        self.data = _HostArray(data)
+
+
+class MockResult:
+    """The parts of an ultralytics Results object the app reads"""
+    
+    def __init__(self, data: np.ndarray, names: Dict[int, str], speed: Dict[str, float]):
+        self.boxes = _Boxes(data)
+        self.names = names
+        self.speed = speed
+
+
+class MockModel:
+    """Callable with the YOLO predict signature returning synthetic detections
+    
+    Preprocessing does the same letterbox resize and normalization as the
+    real model so its cost is realistic; inference sleeps for infer_ms per
+    image at input_size, scaled by pixel count for other sizes;
+    postprocessing applies the confidence threshold. Each image gets
+    objects_per_frame boxes, seeded by image size so runs are repeatable.
+    """
+    
+    def __init__(self, objects_per_frame: int = 50, infer_ms: float = 0.0, input_size: int = 640):
+        self.objects_per_frame = objects_per_frame
+        self.infer_ms = infer_ms
+        self.input_size = input_size
+        self.names = dict(enumerate(MODEL_CONFIG["classes"]))
+    
+    def __call__(
+        self, source, conf: float = 0.25, iou: float = 0.7, verbose: bool = False, **kwargs
+    ) -> List[MockResult]:
+        images = source if isinstance(source, list) else [source]
+        imgsz = kwargs.get("imgsz", self.input_size)
+        results = []
+        
+        for image in images:
+            start = time.perf_counter()
+            self._preprocess(image, imgsz)
+            preprocess = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            if self.infer_ms:
+                time.sleep(self.infer_ms * (imgsz / self.input_size) ** 2 / 1000.0)
+            inference = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            data = self._boxes(image.shape[1], image.shape[0])
+            data = data[data[:, 4] >= conf][:kwargs.get("max_det", 300)]
+            postprocess = time.perf_counter() - start
+            
+            speed = {"preprocess": preprocess * 1000, "inference": inference * 1000, "postprocess": postprocess * 1000}
+            results.append(MockResult(data, self.names, speed))
+        
+        return results
+    
+    @staticmethod
+    def _preprocess(image: np.ndarray, imgsz: int) -> np.ndarray:
+        """Letterbox to imgsz and convert to a normalized CHW float array"""
+        h, w = image.shape[:2]
+        scale = imgsz / max(h, w)
+        resized = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_LINEAR)
+        canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+        canvas[:resized.shape[0], :resized.shape[1]] = resized
+        return canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    
+    def _boxes(self, width: int, height: int) -> np.ndarray:
+        """objects_per_frame (x1, y1, x2, y2, conf, cls) rows inside the image"""
+        rng = np.random.default_rng(width * 100003 + height)
+        n = self.objects_per_frame
+        x1 = rng.uniform(0, max(1, width - 40), n)
+        y1 = rng.uniform(20, max(21, height - 60), n)
+        return np.stack([
+            x1,
+            y1,
+            x1 + rng.uniform(8, 40, n),
+            y1 + rng.uniform(16, 60, n),
+            rng.uniform(0.5, 0.95, n),
+            rng.integers(0, len(self.names), n),
+        ], axis=1).astype(np.float32)
+
+
+class MockDetector(AerialDetector):
+    """AerialDetector running on MockModel instead of loaded weights"""
+    
+    def __init__(self, objects_per_frame: int = 50, infer_ms: float = 0.0):
+        # Skip AerialDetector.__init__: there is no weights file to load
+        self.backend = "pytorch"
+        self.precision = "fp32"
+        self.model = MockModel(objects_per_frame, infer_ms, MODEL_CONFIG["input_size"])
+        self.input_size = MODEL_CONFIG["input_size"]
+        self.conf_threshold = MODEL_CONFIG["confidence_threshold"]
+        self.iou_threshold = MODEL_CONFIG["iou_threshold"]
+        self.classes = MODEL_CONFIG["classes"]
+        self.last_tile_stats = {}
+        self.adaptive = None
+        self._lock = threading.RLock()
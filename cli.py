@@ -0,0 +1,125 @@
+"""Headless Command-line Entry Point"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from src.config import MODEL_PATH, MODEL_CONFIG, OUTPUTS_DIR, VIDEO_CONFIG, SHARDING_CONFIG, ADAPTIVE_CONFIG
+from src.core.backends import BACKENDS, PRECISIONS
+from src.core.batch import BatchProcessor
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Detect persons in images and videos without the GUI")
+    parser.add_argument("inputs", nargs="+", help="Files, directories or glob patterns (quote globs)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    parser.add_argument("-o", "--output-dir", type=Path, default=OUTPUTS_DIR)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--backend", choices=list(BACKENDS), default=MODEL_CONFIG["backend"])
+    parser.add_argument(
+        "--precision", choices=PRECISIONS, default=MODEL_CONFIG["precision"],
+        help="INT8 modes quantize the model with ONNX Runtime (requires --backend onnx)",
+    )
+    parser.add_argument("-j", "--workers", type=int, default=SHARDING_CONFIG["num_workers"])
+    parser.add_argument("--torch-threads", type=int, default=SHARDING_CONFIG["torch_threads"])
+    parser.add_argument("--conf", type=float, default=MODEL_CONFIG["confidence_threshold"])
+    parser.add_argument("--iou", type=float, default=MODEL_CONFIG["iou_threshold"])
+    parser.add_argument("--imgsz", type=int, default=MODEL_CONFIG["input_size"], help="Inference resolution")
+    parser.add_argument(
+        "--latency-budget", type=float, default=ADAPTIVE_CONFIG["latency_budget_ms"],
+        help="Per-frame inference budget in ms; adapts the resolution between ADAPTIVE_CONFIG sizes",
+    )
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument(
+        "--sample-interval", type=float, default=VIDEO_CONFIG["sample_interval_s"],
+        help="Infer once per this many seconds of video (overrides --frame-skip)",
+    )
+    parser.add_argument(
+        "--sampled-only", action="store_true",
+        help="Decode and write only the sampled video frames (much faster for large strides)",
+    )
+    parser.add_argument("--batch-size", type=int, default=VIDEO_CONFIG["batch_size"])
+    parser.add_argument("--no-interpolate", action="store_true", help="Leave skipped video frames unannotated")
+    parser.add_argument("--tiled", action="store_true", help="Tiled inference for large images")
+    parser.add_argument("--show-count", action="store_true", help="Draw the count overlay")
+    parser.add_argument("--no-labels", action="store_true")
+    parser.add_argument("--no-confidence", action="store_true")
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Write <output>_stats.json with per-class totals and per-frame counts for each file",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log events such as resolution changes to stderr")
+    return parser.parse_args()
+
+
+def print_record(record: dict) -> None:
+    """One line per finished file"""
+    name = Path(record["input"]).name
+    if record["error"]:
+        print(f"  FAILED {name}: {record['error']}", flush=True)
+        return
+    
+    fps = record["frames"] / record["seconds"] if record["seconds"] else 0.0
+    print(
+        f"  {name}: {record['seconds']:.2f}s, {record['frames']} frame(s) at {fps:.1f} fps, "
+        f"{record['detections']} detection(s) -> {record['output']}",
+        flush=True,
+    )
+
+
+def main():
+    """Run batch detection"""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    
+    if not args.model.exists():
+        print(f"Error: Model not found at {args.model}")
+        sys.exit(1)
+    
+    inputs = BatchProcessor.collect_inputs(args.inputs, args.recursive)
+    if not inputs:
+        print("Error: No supported images or videos found")
+        sys.exit(1)
+    
+    processor = BatchProcessor(
+        args.model, args.backend, args.workers, args.torch_threads, args.output_dir, args.precision
+    )
+    print(f"Processing {len(inputs)} file(s) with {min(processor.num_workers, len(inputs))} worker(s)")
+    
+    result = processor.process(
+        inputs,
+        confidence=args.conf,
+        iou=args.iou,
+        imgsz=args.imgsz,
+        latency_budget_ms=args.latency_budget,
+        show_labels=not args.no_labels,
+        show_confidence=not args.no_confidence,
+        show_count=args.show_count,
+        tiled=args.tiled,
+        frame_skip=args.frame_skip,
+        batch_size=args.batch_size,
+        interpolate=not args.no_interpolate,
+        sample_interval_s=args.sample_interval,
+        keep_skipped_frames=not args.sampled_only,
+        save_stats=args.stats,
+        file_callback=print_record,
+    )
+    
+    summary = result["summary"]
+    print(
+        f"\nDone: {summary['files'] - summary['failed']}/{summary['files']} file(s) "
+        f"({summary['images']} image(s), {summary['videos']} video(s)) in {summary['wall_s']:.2f}s"
+    )
+    print(
+        f"Throughput: {summary['files_per_s']:.2f} files/s, {summary['frames_per_s']:.1f} frames/s, "
+        f"{summary['detections']} detection(s), parallelism {summary['parallelism']:.1f}x "
+        f"over {summary['workers']} worker(s)"
+    )
+    if summary["classes"]:
+        print("Classes: " + ", ".join(f"{name} {count}" for name, count in summary["classes"].items()))
+    
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Local HTTP Inference Service Entry Point"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from src.config import MODEL_PATH, MODEL_CONFIG, SERVICE_CONFIG
+from src.core.backends import BACKENDS, PRECISIONS
+from src.core.detector import AerialDetector
+from src.service import InferenceService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve person detection over local HTTP")
+    parser.add_argument("--host", default=SERVICE_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=SERVICE_CONFIG["port"])
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--backend", choices=list(BACKENDS), default=MODEL_CONFIG["backend"])
+    parser.add_argument(
+        "--precision", choices=PRECISIONS, default=MODEL_CONFIG["precision"],
+        help="INT8 modes quantize the model with ONNX Runtime (requires --backend onnx)",
+    )
+    parser.add_argument("--conf", type=float, default=MODEL_CONFIG["confidence_threshold"])
+    parser.add_argument("--iou", type=float, default=MODEL_CONFIG["iou_threshold"])
+    parser.add_argument("--imgsz", type=int, default=MODEL_CONFIG["input_size"], help="Inference resolution")
+    parser.add_argument("--max-batch-size", type=int, default=SERVICE_CONFIG["max_batch_size"])
+    parser.add_argument("--max-wait-ms", type=float, default=SERVICE_CONFIG["max_wait_ms"])
+    parser.add_argument("--max-queue", type=int, default=SERVICE_CONFIG["max_queue"])
+    parser.add_argument(
+        "--media-root", type=Path, default=SERVICE_CONFIG["media_root"],
+        help='Allow JSON {"path": ...} video jobs for files under this directory',
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Load the model and serve until interrupted"""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    if not args.model.exists():
+        print(f"Error: Model not found at {args.model}")
+        sys.exit(1)
+    
+    detector = AerialDetector(args.model, args.backend, args.precision)
+    detector.set_thresholds(args.conf, args.iou)
+    detector.set_input_size(args.imgsz)
+    service = InferenceService(
+        detector, args.host, args.port, args.max_batch_size, args.max_wait_ms, args.max_queue,
+        media_root=args.media_root,
+    )
+    
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ from typing import Dict, Any
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 MODEL_DIR = PROJECT_ROOT / "YOLOv8_Aerial_Person_Detection" / "YOLOv8_Aerial_Person_Detection" / "runs" / "aerial_person_detection" / "weights"
-MODEL_PATH = MODEL_DIR / "best.pt"  # Using PyTorch format instead of ONNX
+MODEL_PATH = MODEL_DIR / "best.pt"  # PyTorch weights; other backends are exported from these
+MODEL_CACHE_DIR = PROJECT_ROOT / "model_cache"  # Exported ONNX/OpenVINO/TorchScript models
 OUTPUTS_DIR = PROJECT_ROOT / "outputs"
 ASSETS_DIR = PROJECT_ROOT / "assets"
 CONFIG_FILE = PROJECT_ROOT / "app_settings.json"
@@ -36,6 +37,15 @@ MODEL_CONFIG = {
         "van"
     ],
     "num_classes": 12,
+    "backend": "pytorch",  # "pytorch", "onnx", "openvino" or "torchscript"
+    "precision": "fp32",  # "fp32", "int8-dynamic" or "int8-static" (INT8 modes run on the onnx backend)
+}
+
+# INT8 quantization with ONNX Runtime
+QUANTIZATION_CONFIG = {
+    "calibration_dir": ASSETS_DIR / "calibration",  # Sample aerial frames for static INT8 calibration
+    "max_calibration_images": 64,
+    "per_channel": True,  # Per-channel weight scales; slower to quantize, usually more accurate
 }
 
 # UI Configuration
@@ -43,6 +53,10 @@ UI_CONFIG = {
     "window_width": 1600,
     "window_height": 1000,
     "theme": "dark",  # "light" or "dark"
+    "preview_max_width": 900,  # Frames are downscaled to fit this box before display
+    "preview_max_height": 650,
+    "preview_fps": 30,  # How often the preview pulls the latest video frame
+    "progress_interval_ms": 100,  # Minimum time between progress bar updates
 }
 
 # Video Configuration
@@ -51,6 +65,108 @@ VIDEO_CONFIG = {
     "frame_skip": 1,  # Process every nth frame
     "output_fps": 24,
     "codec": "mp4v",
+    "batch_size": 4,  # Frames per forward pass in video processing
+    "queue_size": 8,  # Items buffered between pipeline stages
+    "interpolate_skipped": True,  # Fill frame_skip gaps with tracker-predicted boxes
+    "motion_gate": False,  # Skip inference while the scene is static (see MOTION_CONFIG)
+    "keep_skipped_frames": True,  # False decodes and outputs only the frames that are inferred
+    "sample_interval_s": None,  # Infer once per this many seconds instead of every frame_skip frames
+    "seek_stride": 60,  # Sampling strides at least this long seek instead of grabbing every frame
+}
+
+# Motion gate: reuse detections while the scene is static
+MOTION_CONFIG = {
+    "threshold": 0.02,  # Mean absolute thumbnail difference (0-1) that forces a fresh detection
+    "downscale_width": 160,  # Width of the grayscale thumbnail used for comparison
+    "max_reuse": 30,  # Force a detection after this many reused frames
+}
+
+# Tracker used to interpolate detections on skipped frames
+TRACKER_CONFIG = {
+    "iou_threshold": 0.3,  # Minimum IoU between a predicted track box and a detection
+    "max_misses": 2,  # Keyframes a track may go unmatched before it is dropped
+    "velocity_smoothing": 0.5,  # Weight of the previous velocity when blending in a new measurement
+}
+
+# Adaptive inference resolution under a per-frame latency budget
+ADAPTIVE_CONFIG = {
+    "latency_budget_ms": None,  # None disables adaptation; input_size is then used as is
+    "sizes": [320, 416, 512, 640, 768, 960, 1280],  # Allowed input sizes (multiples of the model stride, 32)
+    "window": 10,  # Frames measured at a size before deciding to change it
+    "headroom": 0.8,  # Step up only if the larger size is predicted to use at most this share of the budget
+    "retry_windows": 10,  # Windows to wait before retrying a size that went over budget
+}
+
+# Tiled inference for large stills
+TILING_CONFIG = {
+    "tile_size": 640,  # Tile edge in pixels (matches the model input size)
+    "overlap": 0.2,  # Fraction of a tile shared with its neighbour
+    "batch_size": 8,  # Tiles per forward pass
+    "include_full_image": True,  # Also run the whole image to keep large objects intact
+    "merge_metric": "ios",  # "iou" or "ios" (intersection over smaller box) for cross-tile NMS
+}
+
+# Raw-candidate cache for re-thresholding without re-inference
+CANDIDATE_CONFIG = {
+    "enabled": True,
+    "conf_floor": 0.05,  # Lowest confidence that can be selected without re-running the model
+    "max_candidates": 1000,  # Candidates kept per frame before NMS
+    "max_det": 300,  # Detections kept per frame after NMS (ultralytics default)
+    "memory_budget_mb": 256,  # Least recently used frames are evicted above this
+}
+
+# Multi-process video sharding
+SHARDING_CONFIG = {
+    "num_workers": max(1, (os.cpu_count() or 1) // 4),  # Worker processes, each with its own model
+    "torch_threads": 4,  # Intra-op threads per worker process
+    # Without ffmpeg on PATH to join segments by stream copy, workers write this lossless
+    # intermediate and the stitch does the one lossy encode
+    "segment_codec": "FFV1",
+    "segment_suffix": ".avi",
+}
+
+# In-process pool of inference contexts sharing one set of weights (DetectorPool)
+POOL_CONFIG = {
+    "contexts": 2,  # Inference threads, each with its own predictor
+    "threads_per_context": max(1, (os.cpu_count() or 1) // 2),  # Torch intra-op threads per context
+    "interop_threads": 1,  # Torch inter-op threads for the process (can only be set once)
+    "pin_cores": True,  # Pin each context to its own block of cores (Linux only)
+}
+
+# Disk-backed store for processed video frames (UI scrubbing and saving)
+FRAME_STORE_CONFIG = {
+    "directory": None,  # Where the backing file goes; None uses the system temp dir
+    "cache_mb": 256,  # Recently viewed frames kept in memory
+    "chunk_frames": 64,  # Frames added to the file each time it grows
+}
+
+# Live camera / stream input
+LIVE_CONFIG = {
+    "reconnect_delay_s": 1.0,  # Wait before reopening a stream that stopped delivering frames
+    "max_reconnects": 5,  # Consecutive failed reads before a stream is given up
+    "stats_interval_s": 0.5,  # How often live latency and drop counts are reported
+}
+
+# Local HTTP inference service
+SERVICE_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "max_batch_size": 8,  # Requests grouped into one forward pass
+    "max_wait_ms": 10,  # How long the first request in a batch waits for company
+    "max_queue": 256,  # Pending images before requests are rejected with 503
+    "max_body_mb": 512,  # Largest accepted request body (video uploads)
+    "job_ttl_s": 3600,  # Finished video jobs (and their detections) are forgotten after this long
+    "max_finished_jobs": 64,  # At most this many finished jobs are kept; the oldest go first
+    "media_root": None,  # Directory whose videos /jobs/video may open by path; None disables path jobs
+}
+
+# Per-stage profiling (near zero cost while disabled)
+PROFILING_CONFIG = {
+    "enabled": False,
+    "window": 512,  # Most recent per-frame samples kept per stage for percentiles
+    "emit_interval_s": 0.5,  # Live stats refresh rate in the UI
+    "prometheus_path": None,  # Write Prometheus text-format metrics here (e.g. a node_exporter textfile dir)
+    "export_interval_s": 5.0,
 }
 
 # Color map for classes (BGR format for OpenCV)
@@ -73,13 +189,21 @@ CLASS_COLORS = {
 DEFAULT_SETTINGS = {
     "confidence_threshold": 0.5,
     "iou_threshold": 0.45,
+    "input_size": 640,
+    "latency_budget_ms": None,
     "show_bboxes": True,
     "show_labels": True,
     "show_confidence": True,
     "show_count": True,
     "frame_skip": 1,
+    "sample_interval_s": None,
+    "keep_skipped_frames": True,
+    "interpolate_skipped": True,
+    "motion_gate": False,
     "theme": "dark",
     "side_by_side": True,
+    "tiled": False,
+    "profiling": False,
 }
 
 
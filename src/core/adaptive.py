@@ -0,0 +1,94 @@
+"""Latency-budget Adaptive Inference Resolution"""
+import logging
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.config import ADAPTIVE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveResolution:
+    """Pick the model input size that keeps per-frame inference within a latency budget
+    
+    observe() is fed the measured seconds per frame. Once window frames have
+    been seen at the current size, the median is compared with the budget:
+    over budget steps down to the next smaller allowed size, and if the next
+    larger size is predicted to fit within headroom * budget (cost scales with
+    pixel count) it steps up. Samples are discarded after each change so the
+    new size is judged on its own timings, and a size that went over budget
+    is not retried for retry_windows windows, which stops oscillation when
+    the pixel-count estimate is optimistic. Every change is logged at INFO
+    level, recorded in changes and, if given, passed to on_change.
+    """
+    
+    def __init__(
+        self,
+        budget_ms: float,
+        sizes: Sequence[int] = ADAPTIVE_CONFIG["sizes"],
+        initial_size: Optional[int] = None,
+        window: int = ADAPTIVE_CONFIG["window"],
+        headroom: float = ADAPTIVE_CONFIG["headroom"],
+        retry_windows: int = ADAPTIVE_CONFIG["retry_windows"],
+        on_change: Optional[Callable[[Dict[str, float]], None]] = None,
+    ):
+        if budget_ms <= 0:
+            raise ValueError("Latency budget must be positive")
+        self.budget = budget_ms / 1000.0
+        self.sizes = sorted(set(int(s) for s in sizes))
+        self.window = max(1, window)
+        self.headroom = headroom
+        self.retry_frames = retry_windows * self.window
+        self._over_budget: Dict[int, int] = {}  # size -> frame count when it last went over budget
+        self.on_change = on_change
+        self._samples: deque = deque(maxlen=self.window)
+        self.frames = 0
+        self.changes: List[Dict[str, float]] = []
+        
+        initial = initial_size if initial_size is not None else self.sizes[-1]
+        # Start from the allowed size closest to the requested one
+        self._index = min(range(len(self.sizes)), key=lambda i: abs(self.sizes[i] - initial))
+    
+    @property
+    def size(self) -> int:
+        """Current input size"""
+        return self.sizes[self._index]
+    
+    def observe(self, seconds_per_frame: float, count: int = 1) -> int:
+        """Record count frames that took seconds_per_frame each; returns the size to use next"""
+        self.frames += count
+        for _ in range(min(count, self.window)):
+            self._samples.append(seconds_per_frame)
+        if len(self._samples) < self.window:
+            return self.size
+        
+        latency = sorted(self._samples)[len(self._samples) // 2]
+        if latency > self.budget and self._index > 0:
+            self._over_budget[self.size] = self.frames
+            self._change(self._index - 1, latency)
+        elif self._index < len(self.sizes) - 1:
+            larger = self.sizes[self._index + 1]
+            recently_over = self.frames - self._over_budget.get(larger, -self.retry_frames) < self.retry_frames
+            if not recently_over and latency * (larger / self.size) ** 2 < self.budget * self.headroom:
+                self._change(self._index + 1, latency)
+        return self.size
+    
+    def _change(self, index: int, latency: float) -> None:
+        change = {
+            "time": time.time(),
+            "frame": self.frames,
+            "from": self.size,
+            "to": self.sizes[index],
+            "latency_ms": latency * 1000.0,
+            "budget_ms": self.budget * 1000.0,
+        }
+        self._index = index
+        self._samples.clear()
+        self.changes.append(change)
+        logger.info(
+            "Adaptive resolution: %d -> %d at frame %d (%.1f ms/frame, budget %.1f ms)",
+            change["from"], change["to"], change["frame"], change["latency_ms"], change["budget_ms"],
+        )
+        if self.on_change is not None:
+            self.on_change(change)
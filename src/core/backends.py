@@ -0,0 +1,201 @@
+"""Inference Backends with Cached Model Exports"""
+import hashlib
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+import cv2
+import numpy as np
+
+from src.config import MODEL_CACHE_DIR, QUANTIZATION_CONFIG
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+# backend name -> (ultralytics export format, exported artifact name, supports batched input)
+# Batched backends are exported with dynamic axes, which also makes their input size dynamic
+BACKENDS = {
+    "pytorch": (None, None, True),
+    "onnx": ("onnx", "best.onnx", True),
+    "openvino": ("openvino", "best_openvino_model", True),
+    "torchscript": ("torchscript", "best.torchscript", False),
+}
+
+# Numeric precision modes; the INT8 ones are ONNX Runtime quantizations of the onnx export
+PRECISIONS = ("fp32", "int8-dynamic", "int8-static")
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
+
+
+def weights_hash(model_path: Path) -> str:
+    """Short SHA-256 of the weights file, used as part of the cache key"""
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def cache_path(model_path: Path, backend: str, input_size: int) -> Path:
+    """Where the exported artifact for these weights and input size is cached"""
+    _, artifact, _ = BACKENDS[backend]
+    key = f"{weights_hash(model_path)}_{input_size}"
+    return MODEL_CACHE_DIR / backend / key / artifact
+
+
+def export_model(model_path: Path, backend: str, input_size: int) -> Path:
+    """Export weights to backend format once and return the cached artifact path"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+    
+    target = cache_path(model_path, backend, input_size)
+    if target.exists():
+        return target
+    
+    from ultralytics import YOLO
+    
+    export_format, _, batched = BACKENDS[backend]
+    # Dynamic axes (batch and spatial) let ONNX/OpenVINO models take batches and other input
+    # sizes; TorchScript is traced at a fixed shape
+    exported = Path(YOLO(str(model_path)).export(format=export_format, imgsz=input_size, dynamic=batched))
+    
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(exported), str(target))
+    return target
+
+
+def calibration_images(directory: Path = QUANTIZATION_CONFIG["calibration_dir"]) -> List[Path]:
+    """Sample frames for static quantization, in a stable order"""
+    if not directory.is_dir():
+        return []
+    images = sorted(p for p in directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    return images[:QUANTIZATION_CONFIG["max_calibration_images"]]
+
+
+def _files_hash(paths: List[Path]) -> str:
+    """Short hash of file names, sizes and modification times"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def letterbox_input(image: np.ndarray, input_size: int) -> np.ndarray:
+    """Model input tensor (1, 3, size, size) as float32 RGB in 0-1, letterboxed like ultralytics"""
+    h, w = image.shape[:2]
+    scale = input_size / max(h, w)
+    new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((input_size, input_size, 3), 114, dtype=np.uint8)
+    top, left = (input_size - new_h) // 2, (input_size - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return np.ascontiguousarray(canvas[:, :, ::-1].transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+def _calibration_reader(onnx_path: Path, images: List[Path], input_size: int):
+    """ONNX Runtime CalibrationDataReader feeding letterboxed calibration frames"""
+    import onnxruntime
+    from onnxruntime.quantization import CalibrationDataReader
+    
+    input_name = onnxruntime.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self.images = iter(images)
+        
+        def get_next(self):
+            for path in self.images:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    return {input_name: letterbox_input(image, input_size)}
+            return None
+    
+    return Reader()
+
+
+def quantize_model(
+    model_path: Path,
+    input_size: int,
+    precision: str,
+    calibration: Optional[List[Path]] = None,
+) -> Path:
+    """ONNX model for the given precision, quantizing and caching it on first use
+    
+    int8-dynamic stores INT8 weights and quantizes activations on the fly.
+    int8-static also fixes activation ranges from calibration frames
+    (default: QUANTIZATION_CONFIG["calibration_dir"]) and is usually the
+    faster of the two on CPU. Needs the onnxruntime package.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {list(PRECISIONS)}")
+    
+    fp32_path = export_model(model_path, "onnx", input_size)
+    if precision == "fp32":
+        return fp32_path
+    
+    try:
+        from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+    except ImportError as e:
+        raise ImportError("INT8 precision modes need ONNX Runtime: pip install onnxruntime") from e
+    
+    if precision == "int8-dynamic":
+        target = fp32_path.with_name("best_int8_dynamic.onnx")
+        if not target.exists():
+            quantize_dynamic(str(fp32_path), str(target), weight_type=QuantType.QInt8)
+        return target
+    
+    images = calibration if calibration is not None else calibration_images()
+    if not images:
+        raise ValueError(
+            f"Static INT8 quantization needs calibration images in {QUANTIZATION_CONFIG['calibration_dir']}"
+        )
+    # The cache key includes the calibration set, which determines the activation ranges
+    target = fp32_path.with_name(f"best_int8_static_{_files_hash(images)}.onnx")
+    if not target.exists():
+        quantize_static(
+            str(fp32_path),
+            str(target),
+            _calibration_reader(fp32_path, images, input_size),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=QUANTIZATION_CONFIG["per_channel"],
+        )
+    return target
+
+
+def load_model(
+    model_path: Path,
+    backend: str = "pytorch",
+    input_size: int = 640,
+    precision: str = "fp32",
+    calibration: Optional[List[Path]] = None,
+) -> "YOLO":
+    """Load a YOLO model for the given backend and precision, exporting and caching it if needed"""
+    # Imported here: ultralytics pulls in torch, which dominates startup time
+    from ultralytics import YOLO
+    
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+    
+    if precision != "fp32":
+        if backend != "onnx":
+            raise ValueError(f"Precision '{precision}' runs on the onnx backend, not {backend}")
+        return YOLO(str(quantize_model(model_path, input_size, precision, calibration)), task="detect")
+    
+    if backend == "pytorch":
+        return YOLO(str(model_path))
+    
+    # Exported models run through the same ultralytics pre/post-processing as best.pt
+    return YOLO(str(export_model(model_path, backend, input_size)), task="detect")
+
+
+def supports_batching(backend: str) -> bool:
+    """True if the backend accepts more than one image per forward pass"""
+    return BACKENDS[backend][2]
+
+
+def supports_resizing(backend: str) -> bool:
+    """True if the backend accepts input sizes other than the one it was exported at"""
+    # The export's dynamic flag is the batching flag, and it makes the spatial axes dynamic too
+    return supports_batching(backend)
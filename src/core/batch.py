@@ -0,0 +1,264 @@
+"""Headless Batch Processing with a Process Pool"""
+import glob
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config import MODEL_PATH, MODEL_CONFIG, OUTPUTS_DIR, VIDEO_CONFIG, SHARDING_CONFIG, ADAPTIVE_CONFIG
+from src.core.detector import AerialDetector
+from src.core.media_handler import MediaHandler
+from src.core.statistics import DetectionStatistics
+
+# One detector per worker process, created by _init_worker
+_worker_detector: Optional[AerialDetector] = None
+
+
+def _init_worker(
+    model_path: Path, backend: str, torch_threads: int, precision: str = "fp32", log_level: int = logging.WARNING
+) -> None:
+    """Process initializer: pin torch thread count, set up logging and load the model once"""
+    global _worker_detector
+    import torch
+    
+    # Spawned workers start without the parent's logging setup
+    logging.basicConfig(level=log_level, format="%(message)s")
+    torch.set_num_threads(max(1, torch_threads))
+    
+    _worker_detector = AerialDetector(model_path, backend, precision)
+
+
+def _process_file(input_path: Path, output_path: Path, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Detect and annotate one image or video; returns a timing record"""
+    detector = _worker_detector
+    detector.set_thresholds(settings["confidence"], settings["iou"])
+    record = {"input": str(input_path), "output": str(output_path), "frames": 0, "detections": 0, "error": None}
+    start = time.perf_counter()
+    
+    try:
+        detector.set_input_size(settings["imgsz"])
+        detector.set_latency_budget(settings["latency_budget_ms"])
+        if input_path.suffix.lower() in MediaHandler.SUPPORTED_IMAGES:
+            record["kind"] = "image"
+            image = MediaHandler.load_image(input_path)
+            detections = detector.detect_tiled(image) if settings["tiled"] else detector.detect(image)
+            annotated = MediaHandler.annotate_frame(
+                image,
+                detections,
+                settings["show_boxes"],
+                settings["show_labels"],
+                settings["show_confidence"],
+                settings["show_count"],
+                inplace=True,
+            )
+            MediaHandler.save_image(annotated, output_path)
+            stats = DetectionStatistics.from_detections([detections])
+        else:
+            record["kind"] = "video"
+            _, all_detections = MediaHandler.stream_video(
+                input_path,
+                detector,
+                output_path,
+                settings["show_boxes"],
+                settings["show_labels"],
+                settings["show_confidence"],
+                settings["show_count"],
+                frame_skip=settings["frame_skip"],
+                batch_size=settings["batch_size"],
+                interpolate=settings["interpolate"],
+                codec=settings["codec"],
+                sample_interval_s=settings["sample_interval_s"],
+                keep_skipped_frames=settings["keep_skipped_frames"],
+            )
+            stats = DetectionStatistics.from_detections(all_detections)
+        
+        record["frames"] = stats.frames
+        record["detections"] = stats.total
+        record["classes"] = stats.class_totals()
+        record["peak"] = stats.peak[0]
+        if detector.adaptive is not None:
+            record["resolution_changes"] = detector.adaptive.changes
+        if settings["save_stats"]:
+            record["stats"] = str(stats.save_json(output_path.with_name(f"{output_path.stem}_stats.json")))
+    except Exception as e:
+        record["error"] = str(e)
+    
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+class BatchProcessor:
+    """Process many images and videos across worker processes without the GUI
+    
+    Files are the unit of work: each worker process loads its own model and
+    handles whole files, so throughput scales with file count rather than
+    video length (use ShardedVideoProcessor to split a single long video).
+    """
+    
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        backend: str = MODEL_CONFIG["backend"],
+        num_workers: int = SHARDING_CONFIG["num_workers"],
+        torch_threads: int = SHARDING_CONFIG["torch_threads"],
+        output_dir: Path = OUTPUTS_DIR,
+        precision: str = MODEL_CONFIG["precision"],
+    ):
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model not found: {model_path}")
+        
+        self.model_path = model_path
+        self.backend = backend
+        self.num_workers = max(1, num_workers)
+        self.torch_threads = max(1, torch_threads)
+        self.output_dir = output_dir
+        self.precision = precision
+    
+    @staticmethod
+    def collect_inputs(patterns: Iterable[str], recursive: bool = False) -> List[Path]:
+        """Expand files, directories and glob patterns into supported media files"""
+        supported = MediaHandler.SUPPORTED_IMAGES | MediaHandler.SUPPORTED_VIDEOS
+        found = []
+        
+        for pattern in patterns:
+            path = Path(pattern)
+            if path.is_dir():
+                candidates = path.rglob("*") if recursive else path.iterdir()
+            elif path.is_file():
+                candidates = [path]
+            else:
+                candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+            
+            found.extend(sorted(p for p in candidates if p.is_file() and p.suffix.lower() in supported))
+        
+        # Keep first occurrence order when patterns overlap
+        return list(dict.fromkeys(p.resolve() for p in found))
+    
+    def plan_outputs(self, inputs: List[Path]) -> List[Tuple[Path, Path]]:
+        """Pair each input with a unique output path in output_dir"""
+        used = set()
+        plan = []
+        
+        for input_path in inputs:
+            extension = ".png" if input_path.suffix.lower() in MediaHandler.SUPPORTED_IMAGES else ".mp4"
+            output_path = self.output_dir / f"{input_path.stem}_detected{extension}"
+            
+            # Same file names from different directories get a numeric suffix
+            counter = 2
+            while output_path in used:
+                output_path = self.output_dir / f"{input_path.stem}_detected_{counter}{extension}"
+                counter += 1
+            
+            used.add(output_path)
+            plan.append((input_path, output_path))
+        
+        return plan
+    
+    def process(
+        self,
+        inputs: List[Path],
+        confidence: Optional[float] = None,
+        iou: Optional[float] = None,
+        imgsz: int = MODEL_CONFIG["input_size"],
+        latency_budget_ms: Optional[float] = ADAPTIVE_CONFIG["latency_budget_ms"],
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        tiled: bool = False,
+        frame_skip: int = 1,
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        interpolate: bool = VIDEO_CONFIG["interpolate_skipped"],
+        codec: str = VIDEO_CONFIG["codec"],
+        sample_interval_s: Optional[float] = VIDEO_CONFIG["sample_interval_s"],
+        keep_skipped_frames: bool = VIDEO_CONFIG["keep_skipped_frames"],
+        save_stats: bool = False,
+        file_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Process all inputs; returns per-file records and an aggregate summary
+        
+        With save_stats, each output gets a <name>_stats.json with per-class totals
+        and the per-frame count series.
+        """
+        settings = {
+            "confidence": MODEL_CONFIG["confidence_threshold"] if confidence is None else confidence,
+            "iou": MODEL_CONFIG["iou_threshold"] if iou is None else iou,
+            "imgsz": imgsz,
+            "latency_budget_ms": latency_budget_ms,
+            "show_boxes": show_boxes,
+            "show_labels": show_labels,
+            "show_confidence": show_confidence,
+            "show_count": show_count,
+            "tiled": tiled,
+            "frame_skip": max(1, frame_skip),
+            "batch_size": max(1, batch_size),
+            "interpolate": interpolate,
+            "codec": codec,
+            "sample_interval_s": sample_interval_s,
+            "keep_skipped_frames": keep_skipped_frames,
+            "save_stats": save_stats,
+        }
+        plan = self.plan_outputs(inputs)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        records = []
+        start = time.perf_counter()
+        initargs = (
+            self.model_path, self.backend, self.torch_threads, self.precision, logging.getLogger().getEffectiveLevel()
+        )
+        workers = min(self.num_workers, len(plan))
+        
+        if workers <= 1:
+            # No pool for a single worker: avoids spawning and a second model load
+            _init_worker(*initargs)
+            for input_path, output_path in plan:
+                records.append(_process_file(input_path, output_path, settings))
+                if file_callback:
+                    file_callback(records[-1])
+        else:
+            # Spawn rather than fork: forking after torch has started threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=initargs,
+            ) as pool:
+                futures = [pool.submit(_process_file, i, o, settings) for i, o in plan]
+                for future in as_completed(futures):
+                    records.append(future.result())
+                    if file_callback:
+                        file_callback(records[-1])
+        
+        wall = time.perf_counter() - start
+        return {"files": records, "summary": self.summarize(records, wall, workers)}
+    
+    @staticmethod
+    def summarize(records: List[Dict[str, Any]], wall: float, workers: int) -> Dict[str, Any]:
+        """Aggregate throughput over all successfully processed files"""
+        done = [r for r in records if r["error"] is None]
+        busy = sum(r["seconds"] for r in done)
+        frames = sum(r["frames"] for r in done)
+        classes: Dict[str, int] = {}
+        for r in done:
+            for name, count in r["classes"].items():
+                classes[name] = classes.get(name, 0) + count
+        
+        return {
+            "files": len(records),
+            "failed": len(records) - len(done),
+            "images": sum(1 for r in done if r["kind"] == "image"),
+            "videos": sum(1 for r in done if r["kind"] == "video"),
+            "frames": frames,
+            "detections": sum(r["detections"] for r in done),
+            "classes": classes,
+            "workers": workers,
+            "wall_s": wall,
+            "busy_s": busy,
+            "files_per_s": len(done) / wall if wall else 0.0,
+            "frames_per_s": frames / wall if wall else 0.0,
+            # Worker-seconds spent per wall-second; approaches workers when the pool is saturated
+            "parallelism": busy / wall if wall else 0.0,
+        }
@@ -0,0 +1,100 @@
+"""Raw Detection Candidate Cache"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import CANDIDATE_CONFIG
+from src.core.detector import AerialDetector, Detections
+
+
+class CandidateCache:
+    """LRU cache of per-frame raw candidates, bounded by a memory budget
+    
+    Keys are (media_key, frame_index), where media_key also names the
+    backend, precision and input size the candidates were inferred with.
+    Entries hold the low-threshold, pre-NMS output of
+    AerialDetector.detect_candidates so thresholds can be changed with
+    Detections.filter instead of another inference pass.
+    """
+    
+    def __init__(self, memory_budget_mb: float = CANDIDATE_CONFIG["memory_budget_mb"]):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._entries: "OrderedDict[Tuple[Hashable, int], Detections]" = OrderedDict()
+        self.nbytes = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def media_key(path: Path, detector: AerialDetector) -> str:
+        """Key that changes when the file is modified or the detector's model setup changes"""
+        return (
+            f"{path.resolve()}:{path.stat().st_mtime_ns}:"
+            f"{detector.backend}:{detector.precision}:{detector.input_size}"
+        )
+    
+    def get(self, media_key: Hashable, frame_index: int) -> Optional[Detections]:
+        """Cached candidates for a frame, or None"""
+        key = (media_key, frame_index)
+        candidates = self._entries.get(key)
+        if candidates is not None:
+            self._entries.move_to_end(key)
+        return candidates
+    
+    def put(self, media_key: Hashable, frame_index: int, candidates: Detections) -> None:
+        """Store candidates, evicting least recently used frames over budget"""
+        key = (media_key, frame_index)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        
+        self._entries[key] = candidates
+        self.nbytes += candidates.nbytes
+        
+        while self.nbytes > self.memory_budget and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+    
+    def detect(
+        self,
+        detector: AerialDetector,
+        media_key: Hashable,
+        frames: List[Tuple[int, np.ndarray]],
+        batch_size: int = 8,
+    ) -> List[Detections]:
+        """Detections for (frame_index, frame) pairs at the detector's thresholds
+        
+        Frames with cached candidates skip the model; the rest are run through
+        detect_candidates in batches and cached before filtering.
+        """
+        candidates = [self.get(media_key, index) for index, _ in frames]
+        missing = [i for i, c in enumerate(candidates) if c is None]
+        
+        fresh = detector.detect_candidates([frames[i][1] for i in missing], batch_size) if missing else []
+        for i, c in zip(missing, fresh):
+            self.put(media_key, frames[i][0], c)
+            candidates[i] = c
+        
+        return [c.filter(detector.conf_threshold, detector.iou_threshold) for c in candidates]
+    
+    def frames(self, media_key: Hashable) -> Dict[int, Detections]:
+        """All cached frames of one media item, by frame index"""
+        return {index: c for (key, index), c in self._entries.items() if key == media_key}
+    
+    def refilter(self, media_key: Hashable, conf: float, iou: float) -> Dict[int, Detections]:
+        """Re-apply thresholds to every cached frame of one media item"""
+        return {index: c.filter(conf, iou) for index, c in self.frames(media_key).items()}
+    
+    def clear(self, media_key: Optional[Hashable] = None) -> None:
+        """Drop everything, or only the frames of one media item"""
+        if media_key is None:
+            self._entries.clear()
+            self.nbytes = 0
+            return
+        
+        for key in [k for k in self._entries if k[0] == media_key]:
+            self.nbytes -= self._entries.pop(key).nbytes
+    
+    def __len__(self) -> int:
+        return len(self._entries)
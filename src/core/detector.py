@@ -1,76 +1,373 @@
 """PyTorch Model Inference Engine"""
+import copy
+import threading
+import time
 import cv2
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator, Optional, Union
 from pathlib import Path
-from ultralytics import YOLO
-
-from src.config import MODEL_PATH, MODEL_CONFIG, CLASS_COLORS
+from src.config import MODEL_PATH, MODEL_CONFIG, CLASS_COLORS, TILING_CONFIG, CANDIDATE_CONFIG, ADAPTIVE_CONFIG
+from src.core.adaptive import AdaptiveResolution
+from src.core.backends import load_model, supports_batching, supports_resizing
+from src.core.postprocess import batched_nms
+from src.utils.profiling import profiler
 
 
 class Detection:
     """Detection result container"""
     
-    def __init__(self, box: Tuple[int, int, int, int], confidence: float, class_id: int, class_name: str):
+    def __init__(
+        self,
+        box: Tuple[int, int, int, int],
+        confidence: float,
+        class_id: int,
+        class_name: str,
+        track_id: Optional[int] = None,
+    ):
         self.box = box  # (x1, y1, x2, y2)
         self.confidence = confidence
         self.class_id = class_id
         self.class_name = class_name
+        self.track_id = track_id
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "box": self.box,
             "confidence": float(self.confidence),
             "class_id": self.class_id,
             "class_name": self.class_name,
         }
+        if self.track_id is not None:
+            data["track_id"] = self.track_id
+        return data
+
+
+class Detections:
+    """Columnar detection results for one frame
+    
+    Boxes, confidences and class ids are stored as NumPy arrays. Iterating or
+    indexing yields Detection objects, which are built lazily on first access.
+    """
+    
+    def __init__(
+        self,
+        boxes: Optional[np.ndarray] = None,
+        confidences: Optional[np.ndarray] = None,
+        class_ids: Optional[np.ndarray] = None,
+        names: Optional[Dict[int, str]] = None,
+        track_ids: Optional[np.ndarray] = None,
+    ):
+        self.boxes = np.zeros((0, 4), dtype=np.int32) if boxes is None else np.asarray(boxes).astype(np.int32).reshape(-1, 4)
+        self.confidences = np.zeros(0, dtype=np.float32) if confidences is None else np.asarray(confidences, dtype=np.float32).reshape(-1)
+        self.class_ids = np.zeros(0, dtype=np.int32) if class_ids is None else np.asarray(class_ids).astype(np.int32).reshape(-1)
+        self.names = names or {}
+        self.track_ids = None if track_ids is None else np.asarray(track_ids).astype(np.int32).reshape(-1)
+        self._items: Optional[List[Detection]] = None
+    
+    @classmethod
+    def from_result(cls, result) -> "Detections":
+        """Build from a YOLO result with a single device-to-host transfer"""
+        # Columns: x1, y1, x2, y2, [track_id,] conf, cls
+        data = result.boxes.data.cpu().numpy()
+        return cls(data[:, :4], data[:, -2], data[:, -1], result.names)
+    
+    @classmethod
+    def from_list(cls, detections: List[Detection]) -> "Detections":
+        """Build from a list of Detection objects"""
+        names = {det.class_id: det.class_name for det in detections}
+        return cls(
+            np.array([det.box for det in detections], dtype=np.int32).reshape(-1, 4),
+            np.array([det.confidence for det in detections], dtype=np.float32),
+            np.array([det.class_id for det in detections], dtype=np.int32),
+            names,
+        )
+    
+    def class_name(self, class_id: int) -> str:
+        """Look up the name for a class id"""
+        return self.names.get(class_id, f"Class {class_id}")
+    
+    def to_list(self) -> List[Detection]:
+        """Materialize Detection objects (cached)"""
+        if self._items is None:
+            track_ids = self.track_ids.tolist() if self.track_ids is not None else [None] * len(self)
+            self._items = [
+                Detection(
+                    box=(int(x1), int(y1), int(x2), int(y2)),
+                    confidence=float(conf),
+                    class_id=int(cls_id),
+                    class_name=self.class_name(int(cls_id)),
+                    track_id=track_id,
+                )
+                for (x1, y1, x2, y2), conf, cls_id, track_id in zip(
+                    self.boxes.tolist(), self.confidences.tolist(), self.class_ids.tolist(), track_ids
+                )
+            ]
+        return self._items
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Serialize using the Detection.to_dict schema"""
+        return [det.to_dict() for det in self.to_list()]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays"""
+        size = self.boxes.nbytes + self.confidences.nbytes + self.class_ids.nbytes
+        return size + (self.track_ids.nbytes if self.track_ids is not None else 0)
+    
+    def filter(self, conf: float, iou: float, max_det: int = CANDIDATE_CONFIG["max_det"]) -> "Detections":
+        """Apply a confidence threshold and class-aware NMS in NumPy
+        
+        Used to re-threshold raw candidates without running the model again.
+        """
+        mask = np.flatnonzero(self.confidences >= conf)
+        keep = mask[batched_nms(self.boxes[mask], self.confidences[mask], self.class_ids[mask], iou)][:max_det]
+        return Detections(
+            self.boxes[keep],
+            self.confidences[keep],
+            self.class_ids[keep],
+            self.names,
+            self.track_ids[keep] if self.track_ids is not None else None,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.confidences)
+    
+    def __iter__(self) -> Iterator[Detection]:
+        return iter(self.to_list())
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Detection, List[Detection]]:
+        return self.to_list()[index]
+    
+    def __repr__(self) -> str:
+        return f"Detections(n={len(self)})"
 
 
 class AerialDetector:
-    """PyTorch-based aerial person detector"""
+    """PyTorch-based aerial person detector
+    
+    Safe to call from several threads: calls are serialized by a per-detector
+    lock. For parallel inference, give each thread its own share() of the
+    detector, or use DetectorPool.
+    """
     
-    def __init__(self, model_path: Path = MODEL_PATH):
-        """Initialize detector with PyTorch model"""
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        backend: str = MODEL_CONFIG["backend"],
+        precision: str = MODEL_CONFIG["precision"],
+        calibration: Optional[List[Path]] = None,
+    ):
+        """Initialize detector with PyTorch model, or a cached export of it for other backends
+        
+        INT8 precisions quantize the ONNX export with ONNX Runtime on first use;
+        int8-static calibrates on the given images (default: the calibration dir).
+        """
         if not model_path.exists():
             raise FileNotFoundError(f"Model not found: {model_path}")
         
-        # Load YOLO model from local file
-        self.model = YOLO(str(model_path))
+        # Load YOLO model from local file (exported to ONNX/OpenVINO/TorchScript on first use)
+        self.backend = backend
+        self.precision = precision
+        self.model = load_model(model_path, backend, MODEL_CONFIG["input_size"], precision, calibration)
         
         # Configuration
         self.input_size = MODEL_CONFIG["input_size"]
         self.conf_threshold = MODEL_CONFIG["confidence_threshold"]
         self.iou_threshold = MODEL_CONFIG["iou_threshold"]
         self.classes = MODEL_CONFIG["classes"]
+        self.last_tile_stats: Dict[str, Any] = {}
+        self.adaptive: Optional[AdaptiveResolution] = None  # Set by set_latency_budget
+        self._lock = threading.RLock()
+    
+    def share(self) -> "AerialDetector":
+        """Another detector on the same loaded weights, with its own settings, predictor and lock
+        
+        PyTorch weights are shared, not copied. Other backends build their own
+        runtime session on the first call.
+        """
+        with self._lock:
+            shared = copy.copy(self)
+            shared.model = copy.copy(self.model)
+            if getattr(shared.model, "predictor", None) is not None:
+                shared.model.predictor = None  # Rebuilt lazily; predictors hold per-call state
+            shared._lock = threading.RLock()
+            shared.adaptive = None
+            shared.last_tile_stats = {}
+            return shared
+    
+    def set_input_size(self, size: int) -> None:
+        """Change the inference resolution (rounded to a multiple of the model stride, 32)"""
+        with self._lock:
+            size = max(32, int(round(size / 32)) * 32)
+            if size != MODEL_CONFIG["input_size"] and not supports_resizing(self.backend):
+                raise ValueError(f"The {self.backend} backend only runs at {MODEL_CONFIG['input_size']}")
+            self.input_size = size
+    
+    def set_latency_budget(
+        self, budget_ms: Optional[float], sizes: Optional[List[int]] = None
+    ) -> Optional[AdaptiveResolution]:
+        """Adapt input_size to keep per-frame inference within budget_ms; None turns it off"""
+        with self._lock:
+            if not budget_ms:
+                self.adaptive = None
+                return None
+            if not supports_resizing(self.backend):
+                raise ValueError(f"Adaptive resolution needs a resizable backend, not {self.backend}")
+            self.adaptive = AdaptiveResolution(budget_ms, sizes or ADAPTIVE_CONFIG["sizes"], self.input_size)
+            self.input_size = self.adaptive.size
+            return self.adaptive
     
     def set_thresholds(self, conf: float, iou: float) -> None:
         """Update detection thresholds"""
-        self.conf_threshold = max(0.0, min(1.0, conf))
-        self.iou_threshold = max(0.0, min(1.0, iou))
+        with self._lock:
+            self.conf_threshold = max(0.0, min(1.0, conf))
+            self.iou_threshold = max(0.0, min(1.0, iou))
+    
+    def detect(self, image: np.ndarray, imgsz: Optional[int] = None) -> Detections:
+        """Run detection on image, at imgsz instead of input_size if given"""
+        with self._lock:
+            # Inference with YOLO (handles preprocessing internally)
+            start = time.perf_counter()
+            results = self._predict(image, **({"imgsz": imgsz} if imgsz else {}))
+            elapsed = time.perf_counter() - start
+            profiler.record("inference", elapsed)
+            if imgsz is None:
+                self._adapt(elapsed, 1)
+            
+            if results and len(results) > 0:
+                with profiler.stage("postprocess"):
+                    return self._parse_result(results[0])
+            return Detections()
+    
+    def detect_batch(
+        self, frames: List[np.ndarray], batch_size: int = 8, imgsz: Optional[int] = None
+    ) -> List[Detections]:
+        """Run detection on several frames, batch_size frames per forward pass"""
+        return self._detect_batches(frames, batch_size, **({"imgsz": imgsz} if imgsz else {}))
     
-    def detect(self, image: np.ndarray) -> List[Detection]:
-        """Run detection on image"""
-        # Inference with YOLO (handles preprocessing internally)
-        results = self.model(image, conf=self.conf_threshold, iou=self.iou_threshold, verbose=False)
+    def detect_candidates(self, frames: List[np.ndarray], batch_size: int = 8) -> List[Detections]:
+        """Run the model at a low confidence floor with NMS effectively disabled
         
-        detections = []
-        if results and len(results) > 0:
-            result = results[0]
-            for box in result.boxes:
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                conf = box.conf[0].cpu().numpy()
-                cls_id = int(box.cls[0].cpu().numpy())
-                cls_name = result.names.get(cls_id, f"Class {cls_id}")
+        The returned raw candidates can be narrowed to any conf/iou setting
+        above the floor with Detections.filter, without another forward pass.
+        """
+        return self._detect_batches(
+            frames,
+            batch_size,
+            conf=CANDIDATE_CONFIG["conf_floor"],
+            iou=1.0,  # Only boxes with IoU > 1 are suppressed, i.e. none
+            max_det=CANDIDATE_CONFIG["max_candidates"],
+        )
+    
+    def _detect_batches(self, frames: List[np.ndarray], batch_size: int, **overrides) -> List[Detections]:
+        """Run frames through the model in batches of batch_size"""
+        with self._lock:
+            # Backends traced at a fixed shape fall back to one frame per pass
+            batch_size = max(1, int(batch_size)) if supports_batching(self.backend) else 1
+            all_detections = []
+            
+            for start in range(0, len(frames), batch_size):
+                batch = frames[start:start + batch_size]
+                # A list input is letterboxed and stacked into a single tensor by YOLO
+                t0 = time.perf_counter()
+                results = self._predict(batch, **overrides)
+                elapsed = time.perf_counter() - t0
+                profiler.record("inference", elapsed, len(batch))
+                if "imgsz" not in overrides:
+                    self._adapt(elapsed, len(batch))
                 
-                detection = Detection(
-                    box=(int(x1), int(y1), int(x2), int(y2)),
-                    confidence=float(conf),
-                    class_id=cls_id,
-                    class_name=cls_name
-                )
-                detections.append(detection)
+                post_t0 = profiler.timer()
+                all_detections.extend(self._parse_result(result) for result in results)
+                profiler.record_since("postprocess", post_t0, len(batch))
+            
+            return all_detections
+    
+    def _predict(self, source, **overrides) -> list:
+        """Call the model with the current thresholds and input size unless overridden"""
+        kwargs = {"conf": self.conf_threshold, "iou": self.iou_threshold, "imgsz": self.input_size, "verbose": False}
+        kwargs.update(overrides)
+        return self.model(source, **kwargs)
+    
+    def _adapt(self, seconds: float, count: int) -> None:
+        """Feed a measured forward pass to adaptive resolution, if enabled"""
+        if self.adaptive is not None:
+            self.input_size = self.adaptive.observe(seconds / count, count)
+    
+    @staticmethod
+    def tile_grid(width: int, height: int, tile_size: int, overlap: float) -> List[Tuple[int, int, int, int]]:
+        """Overlapping (x1, y1, x2, y2) tiles covering the image"""
+        step = max(1, int(tile_size * (1.0 - overlap)))
+        
+        def starts(length: int) -> List[int]:
+            if length <= tile_size:
+                return [0]
+            positions = list(range(0, length - tile_size + 1, step))
+            if positions[-1] != length - tile_size:
+                positions.append(length - tile_size)  # Last tile flush with the edge
+            return positions
+        
+        return [
+            (x, y, min(x + tile_size, width), min(y + tile_size, height))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+    
+    def detect_tiled(
+        self,
+        image: np.ndarray,
+        tile_size: int = TILING_CONFIG["tile_size"],
+        overlap: float = TILING_CONFIG["overlap"],
+        batch_size: int = TILING_CONFIG["batch_size"],
+        include_full_image: bool = TILING_CONFIG["include_full_image"],
+    ) -> Detections:
+        """Run detection on overlapping tiles of a large image
         
-        return detections
+        Tiles are sent to the model batch_size at a time, mapped back to image
+        coordinates and merged with class-aware NMS. The full, downscaled image
+        can be added as one more input so large objects split across tiles
+        are still found whole. Timing is stored in last_tile_stats.
+        """
+        with self._lock:
+            h, w = image.shape[:2]
+            tiles = self.tile_grid(w, h, tile_size, overlap)
+            inputs = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+            offsets = [(x1, y1) for x1, y1, _, _ in tiles]
+            if include_full_image and len(tiles) > 1:
+                inputs.append(image)
+                offsets.append((0, 0))
+            
+            start = time.perf_counter()
+            tile_detections = self.detect_batch(inputs, batch_size)
+            inference_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            boxes = np.concatenate(
+                [d.boxes + np.array([x, y, x, y], dtype=np.int32) for d, (x, y) in zip(tile_detections, offsets)]
+            )
+            confidences = np.concatenate([d.confidences for d in tile_detections])
+            class_ids = np.concatenate([d.class_ids for d in tile_detections])
+            names = {}
+            for d in tile_detections:
+                names.update(d.names)
+            
+            keep = batched_nms(boxes, confidences, class_ids, self.iou_threshold, TILING_CONFIG["merge_metric"])
+            merged = Detections(boxes[keep], confidences[keep], class_ids[keep], names)
+            merge_time = time.perf_counter() - start
+            profiler.record("postprocess", merge_time)
+            
+            self.last_tile_stats = {
+                "tiles": len(inputs),
+                "inference_s": inference_time,
+                "per_tile_ms": inference_time / len(inputs) * 1000,
+                "merge_s": merge_time,
+                "candidates": len(boxes),
+                "kept": len(keep),
+            }
+            return merged
+    
+    def _parse_result(self, result) -> Detections:
+        """Convert a single YOLO result into columnar Detections"""
+        return Detections.from_result(result)
     
     @staticmethod
     def draw_detections(
@@ -0,0 +1,186 @@
+"""Pool of Inference Contexts Sharing One Set of Model Weights"""
+import os
+import queue
+import threading
+import warnings
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import MODEL_PATH, MODEL_CONFIG, POOL_CONFIG
+from src.core.detector import AerialDetector, Detections
+
+# Torch only accepts the inter-op thread count once per process
+_interop_threads: Optional[int] = None
+
+
+def available_cpus() -> List[int]:
+    """CPU ids this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def core_layout(contexts: int, threads: int, cpus: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """Consecutive blocks of threads CPUs, one per context (blocks wrap around if there are too few)"""
+    cpus = sorted(cpus) if cpus is not None else available_cpus()
+    return [[cpus[(i * threads + j) % len(cpus)] for j in range(threads)] for i in range(contexts)]
+
+
+def _set_interop_threads(threads: int) -> None:
+    global _interop_threads
+    if _interop_threads is not None:
+        if _interop_threads != threads:
+            warnings.warn(f"torch inter-op threads already set to {_interop_threads}, keeping it", RuntimeWarning)
+        return
+    
+    import torch
+    try:
+        torch.set_num_interop_threads(threads)
+    except RuntimeError:
+        # Inter-op work already ran in this process; the count is fixed from then on
+        warnings.warn("torch inter-op threads can no longer be changed in this process", RuntimeWarning)
+    _interop_threads = threads
+
+
+class DetectorPool:
+    """N inference contexts over one loaded model, each on its own thread
+    
+    Contexts are share()d copies of one AerialDetector, so PyTorch weights are
+    loaded once. Each context thread runs with threads_per_context torch
+    intra-op threads and, with pin_cores, is pinned to its own block of cores
+    before its first inference, so the threads torch starts for it stay there
+    as well. Jobs go to one queue and are taken by whichever context is free.
+    Keep contexts * threads_per_context at or below the core count to avoid
+    oversubscription. Non-PyTorch backends load one runtime session per
+    context.
+    """
+    
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        backend: str = MODEL_CONFIG["backend"],
+        contexts: int = POOL_CONFIG["contexts"],
+        threads_per_context: int = POOL_CONFIG["threads_per_context"],
+        interop_threads: Optional[int] = POOL_CONFIG["interop_threads"],
+        pin_cores: bool = POOL_CONFIG["pin_cores"],
+        detector: Optional[AerialDetector] = None,
+    ):
+        """Load the model (or reuse detector) and start the context threads"""
+        self.detector = detector or AerialDetector(model_path, backend)
+        self.threads_per_context = max(1, threads_per_context)
+        num_contexts = max(1, contexts)
+        
+        cpus = available_cpus()
+        if num_contexts * self.threads_per_context > len(cpus):
+            warnings.warn(
+                f"{num_contexts} contexts x {self.threads_per_context} threads oversubscribes {len(cpus)} cores",
+                RuntimeWarning,
+            )
+        if pin_cores and not hasattr(os, "sched_setaffinity"):
+            warnings.warn("CPU pinning is not supported on this platform", RuntimeWarning)
+            pin_cores = False
+        self.affinity = core_layout(num_contexts, self.threads_per_context, cpus) if pin_cores else None
+        
+        if interop_threads:
+            _set_interop_threads(interop_threads)
+        
+        self.contexts: List[AerialDetector] = []
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        for index in range(num_contexts):
+            context = self.detector.share()
+            ready: Future = Future()
+            thread = threading.Thread(
+                target=self._run, args=(index, context, ready), name=f"detector-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+            try:
+                # One at a time: building a predictor prepares (fuses) the shared model
+                ready.result()
+            except Exception:
+                self.close()
+                raise
+            self.contexts.append(context)
+    
+    def __enter__(self) -> "DetectorPool":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+    
+    def layout(self) -> List[Dict[str, Any]]:
+        """Threads and pinned CPUs of each context"""
+        return [
+            {"context": i, "threads": self.threads_per_context, "cpus": self.affinity[i] if self.affinity else None}
+            for i in range(len(self.contexts))
+        ]
+    
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run fn(context, *args, **kwargs) on the next free context"""
+        if not self._threads:
+            raise RuntimeError("DetectorPool is closed")
+        future: Future = Future()
+        self._jobs.put((future, fn, args, kwargs))
+        return future
+    
+    def detect(self, image: np.ndarray) -> Detections:
+        """Detect on image using any free context; blocks until done"""
+        return self.submit(AerialDetector.detect, image).result()
+    
+    def detect_many(self, frames: List[np.ndarray], batch_size: int = 1) -> List[Detections]:
+        """Detect on frames in parallel, batch_size frames per job; results keep frame order"""
+        batch_size = max(1, batch_size)
+        futures = [
+            self.submit(AerialDetector.detect_batch, frames[start:start + batch_size], batch_size)
+            for start in range(0, len(frames), batch_size)
+        ]
+        return [detections for future in futures for detections in future.result()]
+    
+    def set_thresholds(self, conf: float, iou: float) -> None:
+        for context in self.contexts:
+            context.set_thresholds(conf, iou)
+    
+    def set_input_size(self, size: int) -> None:
+        for context in self.contexts:
+            context.set_input_size(size)
+    
+    def close(self) -> None:
+        """Finish queued jobs and stop the context threads"""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+    
+    def _run(self, index: int, context: AerialDetector, ready: Future) -> None:
+        """Context thread: configure threading, warm up, then serve jobs"""
+        try:
+            import torch
+            torch.set_num_threads(self.threads_per_context)
+            if self.affinity:
+                os.sched_setaffinity(0, self.affinity[index])  # 0 is the calling thread on Linux
+            
+            # Builds this context's predictor before any real work
+            size = context.input_size
+            context.detect(np.zeros((size, size, 3), dtype=np.uint8), imgsz=size)
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(context, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
@@ -0,0 +1,166 @@
+"""Live Camera and Stream Capture"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.config import LIVE_CONFIG
+
+
+class LiveSource:
+    """Capture thread feeding a size-1 latest-frame buffer
+    
+    The source is a device index (V4L2 / webcam), a stream URL (rtsp://,
+    http://) or a video file, which is replayed at its native frame rate to
+    stand in for a camera. Capture never waits for the consumer: a frame
+    that is still unread when the next one arrives is replaced and counted
+    as dropped, so read() always returns the newest frame and latency stays
+    bounded by one frame plus processing time.
+    """
+    
+    def __init__(
+        self,
+        source: Union[int, str, Path],
+        reconnect_delay_s: float = LIVE_CONFIG["reconnect_delay_s"],
+        max_reconnects: int = LIVE_CONFIG["max_reconnects"],
+    ):
+        self.source = self.parse_source(source)
+        self.is_file = isinstance(self.source, str) and Path(self.source).is_file()
+        self.reconnect_delay_s = reconnect_delay_s
+        self.max_reconnects = 0 if self.is_file else max_reconnects
+        self.fps = 0.0
+        self.frame_size: Tuple[int, int] = (0, 0)
+        self.error: Optional[str] = None
+        
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._cond = threading.Condition()
+        self._latest: Optional[Tuple[int, float, np.ndarray]] = None  # (seq, captured_at, frame)
+        self._seq = 0
+        self._read_seq = 0
+        self.captured = 0
+        self.dropped = 0
+    
+    @staticmethod
+    def parse_source(source: Union[int, str, Path]) -> Union[int, str]:
+        """Device indices may be given as strings ("0"); everything else is a path or URL"""
+        if isinstance(source, str) and source.strip().isdigit():
+            return int(source.strip())
+        return str(source) if isinstance(source, Path) else source
+    
+    def start(self) -> "LiveSource":
+        """Open the source and start capturing; raises ValueError if it cannot be opened"""
+        self._cap = self._open()
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.frame_size = (
+            int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+        self._running = True
+        self._thread = threading.Thread(target=self._capture, name="live-capture", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop capturing; the capture thread releases the device"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        return self._running
+    
+    def read(self, timeout: float = 1.0) -> Optional[Tuple[int, float, np.ndarray]]:
+        """Newest unread (sequence number, capture time, frame), waiting up to timeout
+        
+        Returns None on timeout or once capture has ended. Capture times are
+        time.perf_counter() values.
+        """
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._latest is None or self._latest[0] == self._read_seq:
+                remaining = deadline - time.perf_counter()
+                if not self._running or remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self._read_seq = self._latest[0]
+            return self._latest
+    
+    def stats(self) -> Dict[str, Any]:
+        """Capture counters for display"""
+        with self._cond:
+            return {
+                "captured": self.captured,
+                "dropped": self.dropped,
+                "source_fps": self.fps,
+                "error": self.error,
+            }
+    
+    def _open(self) -> cv2.VideoCapture:
+        cap = cv2.VideoCapture(self.source)
+        if not self.is_file:
+            # Keep the driver's own queue short so frames are not stale before we see them
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not cap.isOpened():
+            cap.release()
+            raise ValueError(f"Could not open live source: {self.source}")
+        return cap
+    
+    def _capture(self) -> None:
+        """Capture loop; replays files at native rate and reconnects dropped streams"""
+        try:
+            self._capture_frames()
+        finally:
+            # Released here rather than in stop(): a stream read may still be blocking
+            self._cap.release()
+            self._running = False
+            with self._cond:
+                self._cond.notify_all()
+    
+    def _capture_frames(self) -> None:
+        interval = 1.0 / self.fps if self.is_file and self.fps > 0 else 0.0
+        next_due = time.perf_counter()
+        reconnects = 0
+        
+        while self._running:
+            ret, frame = self._cap.read()
+            if not ret:
+                if reconnects >= self.max_reconnects:
+                    if not self.is_file:
+                        self.error = "Live source ended or disconnected"
+                    return
+                reconnects += 1
+                time.sleep(self.reconnect_delay_s)
+                try:
+                    self._cap.release()
+                    self._cap = self._open()
+                    self.error = None
+                except ValueError as e:
+                    self.error = str(e)
+                continue
+            reconnects = 0
+            
+            if interval:
+                # Files decode far faster than real time; release frames on the source's clock
+                next_due += interval
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_due = time.perf_counter()
+            
+            with self._cond:
+                if self._latest is not None and self._latest[0] != self._read_seq:
+                    self.dropped += 1
+                self._seq += 1
+                self.captured += 1
+                self._latest = (self._seq, time.perf_counter(), frame)
+                self._cond.notify_all()
@@ -2,10 +2,17 @@
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import List, Tuple, Optional, Generator
+from typing import Dict, List, Tuple, Optional, Generator, Iterable, Callable, Union
 from datetime import datetime
 
-from src.core.detector import Detection, AerialDetector
+from src.config import VIDEO_CONFIG
+from src.core.detector import Detection, Detections, AerialDetector
+from src.core.candidate_cache import CandidateCache
+from src.core.motion import MotionGate
+from src.core.renderer import AnnotationRenderer
+from src.core.statistics import class_breakdown
+from src.core.tracker import IoUTracker
+from src.utils.profiling import profiler
 
 
 class MediaHandler:
@@ -14,6 +21,9 @@ class MediaHandler:
     SUPPORTED_IMAGES = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
     SUPPORTED_VIDEOS = {".mp4", ".avi", ".mov", ".mkv", ".flv", ".wmv"}
     
+    # Shared so label sprites are rasterized once per process
+    renderer = AnnotationRenderer()
+    
     @staticmethod
     def load_image(image_path: Path) -> Optional[np.ndarray]:
         """Load image from file"""
@@ -62,26 +72,45 @@ class MediaHandler:
         return output_path
     
     @staticmethod
-    def save_video(
-        frames: List[np.ndarray],
+    def open_video_writer(
         output_path: Path,
+        frame_shape: Tuple[int, ...],
         fps: float = 24,
         codec: str = "mp4v"
-    ) -> Path:
-        """Save annotated video"""
-        if not frames:
-            raise ValueError("No frames to save")
-        
+    ) -> cv2.VideoWriter:
+        """Open a video writer sized for frames of frame_shape"""
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        h, w = frames[0].shape[:2]
+        h, w = frame_shape[:2]
         fourcc = cv2.VideoWriter_fourcc(*codec)
         writer = cv2.VideoWriter(str(output_path), fourcc, fps, (w, h))
+        if not writer.isOpened():
+            raise ValueError(f"Could not open video writer: {output_path}")
         
-        for frame in frames:
-            writer.write(frame)
+        return writer
+    
+    @staticmethod
+    def save_video(
+        frames: Iterable[np.ndarray],
+        output_path: Path,
+        fps: float = 24,
+        codec: str = "mp4v"
+    ) -> Path:
+        """Save annotated video from any iterable of frames (a list, FrameStore or generator)"""
+        writer = None
+        try:
+            for frame in frames:
+                if writer is None:
+                    writer = MediaHandler.open_video_writer(output_path, frame.shape, fps, codec)
+                start = profiler.timer()
+                writer.write(frame)
+                profiler.record_since("encode", start)
+        finally:
+            if writer is not None:
+                writer.release()
         
-        writer.release()
+        if writer is None:
+            raise ValueError("No frames to save")
         return output_path
     
     @staticmethod
@@ -91,7 +120,7 @@ class MediaHandler:
         show_boxes: bool = True,
         show_labels: bool = True,
         show_confidence: bool = True,
-    ) -> Tuple[np.ndarray, List[Detection]]:
+    ) -> Tuple[np.ndarray, Detections]:
         """Process single image"""
         image = MediaHandler.load_image(image_path)
         detections = detector.detect(image)
@@ -100,6 +129,299 @@ class MediaHandler:
         )
         return annotated, detections
     
+    @staticmethod
+    def iter_frames(cap: cv2.VideoCapture) -> Generator[Tuple[int, np.ndarray], None, None]:
+        """Yield (frame index, frame) until the capture is exhausted"""
+        index = 0
+        while True:
+            start = profiler.timer()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            profiler.record_since("decode", start)
+            yield index, frame
+            index += 1
+    
+    @staticmethod
+    def sampling_stride(fps: float, frame_skip: int = 1, interval_s: Optional[float] = None) -> int:
+        """Frames between inferences: frame_skip, or interval_s converted at the video's fps"""
+        if interval_s:
+            return max(1, int(round(interval_s * (fps or VIDEO_CONFIG["output_fps"]))))
+        return max(1, frame_skip)
+    
+    @staticmethod
+    def sample_frames(
+        cap: cv2.VideoCapture,
+        stride: int = 1,
+        seek_stride: int = VIDEO_CONFIG["seek_stride"],
+    ) -> Generator[Tuple[int, np.ndarray], None, None]:
+        """Yield (frame index, frame) for every stride-th frame without converting the rest
+        
+        Frames in between are only grab()bed, which skips the color conversion
+        and copy of retrieve(). Strides of at least seek_stride seek straight
+        to the next sample instead, which is cheaper once the stride spans a
+        keyframe interval. Indices follow detect_frames' frame_skip schedule
+        (stride - 1, 2 * stride - 1, ...).
+        """
+        stride = max(1, stride)
+        seek = stride >= seek_stride
+        index = stride - 1
+        position = 0  # Index of the frame the next read returns
+        while True:
+            start = profiler.timer()
+            if seek and index > position:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            else:
+                while position < index:
+                    if not cap.grab():
+                        return
+                    position += 1
+            ret, frame = cap.read()
+            if not ret:
+                break
+            profiler.record_since("decode", start)
+            yield index, frame
+            position = index + 1
+            index += stride
+    
+    @staticmethod
+    def detect_frames(
+        frames: Iterable[Tuple[int, np.ndarray]],
+        detector: AerialDetector,
+        frame_skip: int = 1,
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        tracker: Optional[IoUTracker] = None,
+        motion_gate: Optional[MotionGate] = None,
+        candidate_cache: Optional[CandidateCache] = None,
+        media_key: Optional[str] = None,
+    ) -> Generator[Tuple[int, np.ndarray, Detections, bool], None, None]:
+        """Yield (index, frame, detections, inferred) in input order
+        
+        Every frame_skip-th frame is buffered and sent to the model in batches
+        of batch_size. The other frames get boxes predicted by tracker, or
+        empty detections when no tracker is given. With a motion_gate, due
+        frames whose scene has not changed reuse the last inferred detections.
+        With a candidate_cache, raw candidates are cached under media_key and
+        cached frames are re-filtered instead of re-inferred.
+        """
+        frame_skip = max(1, frame_skip)
+        batch_size = max(1, batch_size)
+        pending = []  # (index, frame, mode) waiting for the next batch
+        num_inferred = 0
+        last_detections = Detections()
+        
+        def flush():
+            nonlocal last_detections
+            batch = [(index, frame) for index, frame, mode in pending if mode == "infer"]
+            if candidate_cache is not None:
+                batch_detections = iter(candidate_cache.detect(detector, media_key, batch, batch_size))
+            else:
+                batch_detections = iter(detector.detect_batch([frame for _, frame in batch], batch_size))
+            for index, frame, mode in pending:
+                if mode == "infer":
+                    detections = next(batch_detections)
+                    if tracker is not None:
+                        detections = tracker.update(detections, index)
+                    last_detections = detections
+                elif mode == "reuse":
+                    detections = last_detections
+                elif tracker is not None:
+                    detections = tracker.predict(index)
+                else:
+                    detections = Detections()
+                yield index, frame, detections, mode == "infer"
+            pending.clear()
+        
+        for index, frame in frames:
+            mode = "skip"
+            if (index + 1) % frame_skip == 0:
+                mode = "infer" if motion_gate is None or motion_gate.should_infer(frame) else "reuse"
+            pending.append((index, frame, mode))
+            num_inferred += mode == "infer"
+            
+            if num_inferred >= batch_size:
+                yield from flush()
+                num_inferred = 0
+        
+        yield from flush()
+    
+    @staticmethod
+    def replay_detections(
+        schedule: List[Tuple[int, str]],
+        keyframes: Dict[int, Detections],
+        tracker: Optional[IoUTracker] = None,
+    ) -> List[Detections]:
+        """Rebuild every frame's detections from new keyframe detections
+        
+        schedule holds the (frame index, mode) of each output frame of a
+        detect_frames run, mode being "infer", "reuse" or "skip". Inferred
+        frames take keyframes[index]; the others are derived from them the
+        way detect_frames did, so tracked and reused frames follow the
+        keyframes (pass a new tracker if the run used one).
+        """
+        results = []
+        last_detections = Detections()
+        for index, mode in schedule:
+            if mode == "infer":
+                detections = keyframes[index]
+                if tracker is not None:
+                    detections = tracker.update(detections, index)
+                last_detections = detections
+            elif mode == "reuse":
+                detections = last_detections
+            elif tracker is not None:
+                detections = tracker.predict(index)
+            else:
+                detections = Detections()
+            results.append(detections)
+        return results
+    
+    @staticmethod
+    def annotate_frame(
+        frame: np.ndarray,
+        detections: Detections,
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        side_by_side: bool = False,
+        inplace: bool = False,
+    ) -> np.ndarray:
+        """Draw detections and the optional count overlay on a frame
+        
+        inplace draws straight onto frame (no copy) when the raw frame is not
+        needed afterwards; it is ignored for side-by-side output.
+        """
+        out = frame if inplace and not side_by_side else None
+        with profiler.stage("render"):
+            return MediaHandler.renderer.render(
+                frame, detections, show_boxes, show_labels, show_confidence, show_count, side_by_side, out
+            )
+    
+    @staticmethod
+    def iter_video(
+        video_path: Path,
+        detector: AerialDetector,
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        frame_skip: int = 1,
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        interpolate: bool = VIDEO_CONFIG["interpolate_skipped"],
+        motion_gate: Optional[MotionGate] = None,
+        sample_interval_s: Optional[float] = VIDEO_CONFIG["sample_interval_s"],
+        keep_skipped_frames: bool = VIDEO_CONFIG["keep_skipped_frames"],
+    ) -> Generator[Tuple[int, np.ndarray, Detections], None, None]:
+        """Decode, detect and annotate a video lazily, yielding (index, frame, detections)"""
+        cap, _ = MediaHandler.load_video(video_path)
+        try:
+            yield from MediaHandler._annotate_capture(
+                cap, detector, show_boxes, show_labels, show_confidence, show_count, frame_skip, batch_size,
+                interpolate, motion_gate, sample_interval_s, keep_skipped_frames,
+            )
+        finally:
+            cap.release()
+    
+    @staticmethod
+    def _annotate_capture(
+        cap: cv2.VideoCapture,
+        detector: AerialDetector,
+        show_boxes: bool,
+        show_labels: bool,
+        show_confidence: bool,
+        show_count: bool,
+        frame_skip: int,
+        batch_size: int,
+        interpolate: bool,
+        motion_gate: Optional[MotionGate] = None,
+        sample_interval_s: Optional[float] = None,
+        keep_skipped_frames: bool = True,
+    ) -> Generator[Tuple[int, np.ndarray, Detections], None, None]:
+        """Annotate frames from an open capture
+        
+        Skipped frames carry tracker-predicted boxes when interpolate is set and
+        are otherwise passed through raw. Without keep_skipped_frames they are
+        not decoded or yielded at all.
+        """
+        frame_skip = MediaHandler.sampling_stride(cap.get(cv2.CAP_PROP_FPS), frame_skip, sample_interval_s)
+        if keep_skipped_frames:
+            source = MediaHandler.iter_frames(cap)
+        else:
+            # Every sampled frame is inferred
+            source = MediaHandler.sample_frames(cap, frame_skip)
+            frame_skip = 1
+        tracker = IoUTracker() if interpolate else None
+        stream = MediaHandler.detect_frames(source, detector, frame_skip, batch_size, tracker, motion_gate)
+        for index, frame, detections, inferred in stream:
+            if inferred or len(detections):
+                # Decoded frames are not reused after detection, so draw on them directly
+                frame = MediaHandler.annotate_frame(
+                    frame, detections, show_boxes, show_labels, show_confidence, show_count, inplace=True
+                )
+            yield index, frame, detections
+    
+    @staticmethod
+    def stream_video(
+        video_path: Path,
+        detector: AerialDetector,
+        output_path: Path,
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        frame_skip: int = 1,
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        interpolate: bool = VIDEO_CONFIG["interpolate_skipped"],
+        motion_gate: Optional[MotionGate] = None,
+        codec: str = VIDEO_CONFIG["codec"],
+        progress_callback: Optional[Callable[[int], None]] = None,
+        detection_callback: Optional[Callable[[int, Detections], None]] = None,
+        sample_interval_s: Optional[float] = VIDEO_CONFIG["sample_interval_s"],
+        keep_skipped_frames: bool = VIDEO_CONFIG["keep_skipped_frames"],
+    ) -> Tuple[Path, List[Detections]]:
+        """Process a video and write annotated frames straight to output_path
+        
+        Only the current batch of frames is held in memory, so memory use does
+        not grow with video length. Returns the output path and per-frame detections
+        (per sampled frame when keep_skipped_frames is off).
+        """
+        cap, metadata = MediaHandler.load_video(video_path)
+        fps = metadata["fps"] or VIDEO_CONFIG["output_fps"]
+        if not keep_skipped_frames:
+            # Sampled frames keep the original duration
+            fps /= MediaHandler.sampling_stride(fps, frame_skip, sample_interval_s)
+        writer = None
+        all_detections = []
+        
+        try:
+            frames = MediaHandler._annotate_capture(
+                cap, detector, show_boxes, show_labels, show_confidence, show_count, frame_skip, batch_size,
+                interpolate, motion_gate, sample_interval_s, keep_skipped_frames,
+            )
+            for index, frame, detections in frames:
+                if writer is None:
+                    writer = MediaHandler.open_video_writer(output_path, frame.shape, fps, codec)
+                start = profiler.timer()
+                writer.write(frame)
+                profiler.record_since("encode", start)
+                profiler.frame_done()
+                all_detections.append(detections)
+                
+                if detection_callback:
+                    detection_callback(index, detections)
+                if progress_callback and metadata["total_frames"] > 0:
+                    progress_callback(min(100, int(((index + 1) / metadata["total_frames"]) * 100)))
+        finally:
+            cap.release()
+            if writer is not None:
+                writer.release()
+        
+        if writer is None:
+            raise ValueError(f"No frames decoded from video: {video_path}")
+        
+        return output_path, all_detections
+    
     @staticmethod
     def process_video(
         video_path: Path,
@@ -109,37 +431,32 @@ class MediaHandler:
         show_confidence: bool = True,
         frame_skip: int = 1,
         progress_callback=None,
-    ) -> Tuple[List[np.ndarray], List[List[Detection]]]:
-        """Process video and return frames and detections"""
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        interpolate: bool = VIDEO_CONFIG["interpolate_skipped"],
+    ) -> Tuple[List[np.ndarray], List[Detections]]:
+        """Process video and return frames and detections
+        
+        Keeps every frame in memory; prefer stream_video for long videos.
+        """
         cap, metadata = MediaHandler.load_video(video_path)
         
         frames = []
         all_detections = []
-        frame_count = 0
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            frame_count += 1
-            
-            if frame_count % frame_skip == 0:
-                detections = detector.detect(frame)
-                annotated = detector.draw_detections(
-                    frame, detections, show_boxes, show_labels, show_confidence
-                )
-                frames.append(annotated)
-                all_detections.append(detections)
-            else:
+        try:
+            stream = MediaHandler._annotate_capture(
+                cap, detector, show_boxes, show_labels, show_confidence, False, frame_skip, batch_size,
+                interpolate,
+            )
+            for index, frame, detections in stream:
                 frames.append(frame)
-                all_detections.append([])
-            
-            if progress_callback:
-                progress = int((frame_count / metadata["total_frames"]) * 100)
-                progress_callback(progress)
+                all_detections.append(detections)
+                
+                if progress_callback and metadata["total_frames"] > 0:
+                    progress_callback(min(100, int(((index + 1) / metadata["total_frames"]) * 100)))
+        finally:
+            cap.release()
         
-        cap.release()
         return frames, all_detections
     
     @staticmethod
@@ -176,15 +493,15 @@ class MediaHandler:
     @staticmethod
     def add_count_overlay(
         image: np.ndarray,
-        detections: List[Detection]
+        detections: Union[Detections, List[Detection]]
     ) -> np.ndarray:
         """Add detection count overlay"""
         result = image.copy()
+        if not isinstance(detections, Detections):
+            detections = Detections.from_list(detections)
         
         # Count by class
-        class_counts = {}
-        for det in detections:
-            class_counts[det.class_name] = class_counts.get(det.class_name, 0) + 1
+        class_counts = dict(class_breakdown(detections))
         
         # Draw count panel
         y_offset = 40
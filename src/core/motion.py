@@ -0,0 +1,67 @@
+"""Motion-gated Inference Scheduling"""
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+from src.config import MOTION_CONFIG
+
+
+class MotionGate:
+    """Decide per frame whether the scene changed enough to need a fresh detection
+    
+    Frames are compared as small grayscale thumbnails against the frame of the
+    last inference, so slow drift still adds up to a refresh. The mean absolute
+    difference is normalized to 0..1; at or above threshold the frame is
+    inferred. max_reuse bounds how long old detections can be reused.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = MOTION_CONFIG["threshold"],
+        downscale_width: int = MOTION_CONFIG["downscale_width"],
+        max_reuse: int = MOTION_CONFIG["max_reuse"],
+    ):
+        self.threshold = threshold
+        self.downscale_width = downscale_width
+        self.max_reuse = max_reuse
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget the reference frame and counters"""
+        self._reference: Optional[np.ndarray] = None
+        self._reused = 0
+        self.checked = 0
+        self.skipped = 0
+        self.last_score = 0.0
+    
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """True if frame differs enough from the last inferred frame"""
+        h, w = frame.shape[:2]
+        scale = self.downscale_width / w
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumb = cv2.resize(gray, (self.downscale_width, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        
+        self.checked += 1
+        if self._reference is not None and self._reference.shape == thumb.shape:
+            self.last_score = float(cv2.absdiff(thumb, self._reference).mean()) / 255.0
+            if self.last_score < self.threshold and self._reused < self.max_reuse:
+                self._reused += 1
+                self.skipped += 1
+                return False
+        
+        self._reference = thumb
+        self._reused = 0
+        return True
+    
+    @property
+    def saved_fraction(self) -> float:
+        """Fraction of candidate inferences that were skipped"""
+        return self.skipped / self.checked if self.checked else 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "saved_fraction": self.saved_fraction,
+        }
@@ -0,0 +1,192 @@
+"""Fast Annotation Renderer"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import CLASS_COLORS
+from src.core.detector import Detections
+from src.core.statistics import class_breakdown
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+DEFAULT_COLOR = (0, 255, 0)
+
+# Solid block (or None) and its offset from the anchor point, then the rows,
+# columns and colors of any other drawn pixels relative to the anchor
+Sprite = Tuple[Optional[np.ndarray], Tuple[int, int], np.ndarray, np.ndarray, np.ndarray]
+
+
+class AnnotationRenderer:
+    """Draw boxes, labels, count panel and side-by-side view in one pass
+    
+    Labels are rasterized once per (class, rounded confidence, label options)
+    into small masked sprites and blitted with array slicing, instead of
+    measuring and drawing text for every box. The count panel is cached the
+    same way. Both caches are LRU, capped at max_sprites entries and guarded
+    by a lock, since one renderer is shared across threads. Output goes
+    to a caller-supplied buffer (which may be the input frame itself) so a
+    frame costs at most one copy. Output matches AerialDetector.draw_detections
+    followed by MediaHandler.add_count_overlay, except for the odd glyph pixel
+    where OpenCV clips strokes at the frame border.
+    """
+    
+    def __init__(self, label_scale: float = 0.6, max_sprites: int = 4096):
+        self.label_scale = label_scale
+        self.max_sprites = max_sprites
+        self._label_sprites: "OrderedDict[Hashable, Sprite]" = OrderedDict()
+        self._panel_sprites: "OrderedDict[Hashable, Sprite]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def render(
+        self,
+        frame: np.ndarray,
+        detections: Detections,
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        side_by_side: bool = False,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Render annotations into out (allocated if None; may be frame for in-place drawing)"""
+        h, w = frame.shape[:2]
+        shape = (h, w * 2, 3) if side_by_side else frame.shape
+        if out is None or out.shape != shape:
+            out = np.empty(shape, dtype=frame.dtype)
+        
+        if side_by_side:
+            out[:, :w] = frame
+            canvas = out[:, w:]
+        else:
+            canvas = out
+        if canvas is not frame:
+            np.copyto(canvas, frame)
+        
+        if show_boxes or show_labels or show_confidence:
+            self._draw_detections(canvas, detections, show_boxes, show_labels or show_confidence, show_confidence)
+        
+        if show_count:
+            self._draw_count_panel(canvas, detections)
+        
+        if side_by_side:
+            cv2.putText(out, "Original", (10, 30), FONT, 1, (255, 255, 255), 2)
+            cv2.putText(out, "Annotated", (w + 10, 30), FONT, 1, (255, 255, 255), 2)
+        
+        return out
+    
+    def _draw_detections(
+        self,
+        canvas: np.ndarray,
+        detections: Detections,
+        show_boxes: bool,
+        show_labels: bool,
+        show_confidence: bool,
+    ) -> None:
+        """Draw each box followed by its label sprite, in detection order"""
+        class_ids = detections.class_ids.tolist()
+        confidences = detections.confidences.tolist()
+        
+        for (x1, y1, x2, y2), class_id, confidence in zip(detections.boxes.tolist(), class_ids, confidences):
+            name = detections.class_name(class_id)
+            color = CLASS_COLORS.get(name, DEFAULT_COLOR)
+            if show_boxes:
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+            if show_labels:
+                # Confidence is rounded as printed; the name is in the key because models map class ids differently
+                rounded = round(confidence, 2) if show_confidence else None
+                key = (class_id, name, rounded, show_labels, show_confidence)
+                sprite = self._cached(self._label_sprites, key, lambda: self._make_label(name, rounded, color))
+                self._blit(canvas, sprite, x1, y1)
+    
+    def _cached(self, cache: "OrderedDict[Hashable, Sprite]", key: Hashable, build: Callable[[], Sprite]) -> Sprite:
+        """Sprite for key, built on a miss; evicts the least recently used beyond max_sprites"""
+        with self._lock:
+            sprite = cache.get(key)
+            if sprite is not None:
+                cache.move_to_end(key)
+                return sprite
+        
+        # Rasterize outside the lock; a concurrent miss on the same key just builds it twice
+        sprite = build()
+        with self._lock:
+            cache[key] = sprite
+            while len(cache) > self.max_sprites:
+                cache.popitem(last=False)
+        return sprite
+    
+    def _make_label(self, name: str, confidence: Optional[float], color: Tuple[int, int, int]) -> Sprite:
+        """Filled label box with text, anchored at the box's top-left corner"""
+        label = name if confidence is None else f"{name}: {confidence:.2f}"
+        (tw, th), baseline = cv2.getTextSize(label, FONT, self.label_scale, 2)
+        # Pad so glyph pixels falling outside the filled box (descenders) are kept too
+        pad = baseline + 2
+        top = th + 6 + pad
+        image = np.zeros((top + pad + 1, tw + 5 + 2 * pad, 3), dtype=np.uint8)
+        mask = np.zeros(image.shape[:2], dtype=np.uint8)
+        for target, fill, ink in ((image, color, (0, 0, 0)), (mask, 255, 255)):
+            cv2.rectangle(target, (pad, pad), (pad + tw + 4, top), fill, -1)
+            cv2.putText(target, label, (pad + 2, top - 2), FONT, self.label_scale, ink, 2)
+        
+        # The filled box is copied as one block; only stray glyph pixels go through fancy indexing
+        block = image[pad:top + 1, pad:pad + tw + 5].copy()
+        mask[pad:top + 1, pad:pad + tw + 5] = 0
+        return self._make_sprite(block, (0, -th - 6), image, mask, (-pad, -top))
+    
+    def _draw_count_panel(self, canvas: np.ndarray, detections: Detections) -> None:
+        """Blit the cached total/per-class count text"""
+        lines = [(f"Total: {len(detections)}", 1.0)]
+        lines += [(f"{name}: {count}", 0.8) for name, count in class_breakdown(detections)]
+        sprite = self._cached(self._panel_sprites, tuple(lines), lambda: self._make_panel(lines))
+        self._blit(canvas, sprite, 0, 0)
+    
+    @staticmethod
+    def _make_panel(lines: List[Tuple[str, float]]) -> Sprite:
+        """Rasterize the count lines as drawn by add_count_overlay"""
+        width = 10 + max(cv2.getTextSize(text, FONT, scale, 2)[0][0] for text, scale in lines) + 10
+        height = 40 + 35 * (len(lines) - 1) + 20
+        
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        y = 40
+        for i, (text, scale) in enumerate(lines):
+            if i > 0:
+                y += 35
+            cv2.putText(image, text, (10, y), FONT, scale, (0, 255, 0), 2)
+            cv2.putText(mask, text, (10, y), FONT, scale, 255, 2)
+        
+        return AnnotationRenderer._make_sprite(None, (0, 0), image, mask, (0, 0))
+    
+    @staticmethod
+    def _make_sprite(
+        block: Optional[np.ndarray],
+        block_offset: Tuple[int, int],
+        image: np.ndarray,
+        mask: np.ndarray,
+        offset: Tuple[int, int],
+    ) -> Sprite:
+        """Solid block plus the coordinates and colors of the remaining masked pixels"""
+        ys, xs = np.nonzero(mask)
+        return block, block_offset, ys + offset[1], xs + offset[0], image[ys, xs]
+    
+    @staticmethod
+    def _blit(canvas: np.ndarray, sprite: Sprite, x: int, y: int) -> None:
+        """Draw a sprite anchored at (x, y), clipped to the canvas"""
+        block, (bx, by), ys, xs, values = sprite
+        ch, cw = canvas.shape[:2]
+        
+        if block is not None:
+            bx, by = x + bx, y + by
+            bh, bw = block.shape[:2]
+            x0, y0 = max(bx, 0), max(by, 0)
+            x1, y1 = min(bx + bw, cw), min(by + bh, ch)
+            if x0 < x1 and y0 < y1:
+                canvas[y0:y1, x0:x1] = block[y0 - by:y1 - by, x0 - bx:x1 - bx]
+        
+        if len(ys):
+            ys, xs = ys + y, xs + x
+            inside = (ys >= 0) & (ys < ch) & (xs >= 0) & (xs < cw)
+            if not inside.all():
+                ys, xs, values = ys[inside], xs[inside], values[inside]
+            canvas[ys, xs] = values
@@ -0,0 +1,241 @@
+"""Multi-process Video Sharding
+
+Tracks restart at every shard boundary: each worker runs its own
+IoUTracker, so track ids are only unique within a shard, and skipped frames
+just after a boundary get no interpolated boxes until the shard's first
+keyframe.
+"""
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+
+from src.config import MODEL_PATH, MODEL_CONFIG, VIDEO_CONFIG, SHARDING_CONFIG
+from src.core.detector import AerialDetector, Detections
+from src.core.media_handler import MediaHandler
+from src.core.tracker import IoUTracker
+
+# One detector per worker process, created by _init_worker
+_worker_detector: Optional[AerialDetector] = None
+
+
+def _init_worker(model_path: Path, torch_threads: int) -> None:
+    """Process initializer: pin torch thread count and load the model once"""
+    global _worker_detector
+    import torch
+    
+    torch.set_num_threads(max(1, torch_threads))
+    
+    _worker_detector = AerialDetector(model_path)
+
+
+def _process_shard(
+    shard_index: int,
+    video_path: Path,
+    start: int,
+    end: int,
+    segment_path: Path,
+    fps: float,
+    settings: Dict[str, Any],
+) -> Tuple[int, Path, List[Detections]]:
+    """Detect and annotate frames [start, end) of a video into segment_path"""
+    detector = _worker_detector
+    detector.set_thresholds(settings["confidence"], settings["iou"])
+    
+    cap, _ = MediaHandler.load_video(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    
+    def shard_frames():
+        # Global frame indices keep frame_skip aligned with a single-process run
+        for offset, frame in MediaHandler.iter_frames(cap):
+            if start + offset >= end:
+                break
+            yield start + offset, frame
+    
+    writer = None
+    all_detections = []
+    try:
+        # Tracks restart at each shard boundary; track ids are only unique within a shard
+        tracker = IoUTracker() if settings["interpolate"] else None
+        stream = MediaHandler.detect_frames(
+            shard_frames(), detector, settings["frame_skip"], settings["batch_size"], tracker
+        )
+        for _, frame, detections, inferred in stream:
+            if inferred or len(detections):
+                frame = MediaHandler.annotate_frame(
+                    frame,
+                    detections,
+                    settings["show_boxes"],
+                    settings["show_labels"],
+                    settings["show_confidence"],
+                    settings["show_count"],
+                    inplace=True,
+                )
+            if writer is None:
+                writer = MediaHandler.open_video_writer(segment_path, frame.shape, fps, settings["codec"])
+            writer.write(frame)
+            all_detections.append(detections)
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+    
+    return shard_index, segment_path, all_detections
+
+
+class ShardedVideoProcessor:
+    """Split a video into frame ranges and process each range in its own process
+    
+    Every worker process loads its own model and uses torch_threads intra-op
+    threads, so num_workers * torch_threads should not exceed the core count.
+    Segments are written to a temp directory and joined in order afterwards.
+    With ffmpeg on PATH, workers encode with the output codec and segments
+    are concatenated by stream copy, so every frame is encoded once and the
+    join is a fast serial step. Otherwise workers write a lossless
+    intermediate (SHARDING_CONFIG["segment_codec"]) and the join decodes and
+    encodes it once, on one thread.
+    Note that seeking relies on CAP_PROP_POS_FRAMES, which is frame-accurate
+    for the FFmpeg backend but may drift for some variable-frame-rate files.
+    """
+    
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        num_workers: int = SHARDING_CONFIG["num_workers"],
+        torch_threads: int = SHARDING_CONFIG["torch_threads"],
+    ):
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model not found: {model_path}")
+        
+        self.model_path = model_path
+        self.num_workers = max(1, num_workers)
+        self.torch_threads = max(1, torch_threads)
+    
+    @staticmethod
+    def plan_shards(total_frames: int, num_shards: int) -> List[Tuple[int, int]]:
+        """Split [0, total_frames) into at most num_shards contiguous ranges"""
+        num_shards = max(1, min(num_shards, total_frames))
+        size, remainder = divmod(total_frames, num_shards)
+        
+        shards = []
+        start = 0
+        for i in range(num_shards):
+            end = start + size + (1 if i < remainder else 0)
+            shards.append((start, end))
+            start = end
+        
+        return shards
+    
+    def process(
+        self,
+        video_path: Path,
+        output_path: Path,
+        confidence: Optional[float] = None,
+        iou: Optional[float] = None,
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_confidence: bool = True,
+        show_count: bool = False,
+        frame_skip: int = 1,
+        batch_size: int = VIDEO_CONFIG["batch_size"],
+        interpolate: bool = VIDEO_CONFIG["interpolate_skipped"],
+        codec: str = VIDEO_CONFIG["codec"],
+        progress_callback: Optional[Callable[[int], None]] = None,
+    ) -> Tuple[Path, List[Detections]]:
+        """Process a video across worker processes; returns output path and ordered detections"""
+        cap, metadata = MediaHandler.load_video(video_path)
+        cap.release()
+        
+        if metadata["total_frames"] <= 0:
+            raise ValueError(f"Cannot shard video without a frame count: {video_path}")
+        
+        fps = metadata["fps"] or VIDEO_CONFIG["output_fps"]
+        shards = self.plan_shards(metadata["total_frames"], self.num_workers)
+        settings = {
+            "confidence": MODEL_CONFIG["confidence_threshold"] if confidence is None else confidence,
+            "iou": MODEL_CONFIG["iou_threshold"] if iou is None else iou,
+            "show_boxes": show_boxes,
+            "show_labels": show_labels,
+            "show_confidence": show_confidence,
+            "show_count": show_count,
+            "frame_skip": max(1, frame_skip),
+            "batch_size": max(1, batch_size),
+            "interpolate": interpolate,
+            "codec": codec,
+        }
+        
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            suffix = output_path.suffix or ".mp4"
+        else:
+            settings["codec"], suffix = SHARDING_CONFIG["segment_codec"], SHARDING_CONFIG["segment_suffix"]
+        segments: List[Optional[Tuple[Path, List[Detections]]]] = [None] * len(shards)
+        
+        with tempfile.TemporaryDirectory(prefix="shards_") as temp_dir:
+            # Spawn rather than fork: forking after torch has started threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=len(shards),
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.model_path, self.torch_threads),
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _process_shard, i, video_path, start, end,
+                        Path(temp_dir) / f"segment_{i:04d}{suffix}", fps, settings,
+                    )
+                    for i, (start, end) in enumerate(shards)
+                ]
+                
+                for done, future in enumerate(as_completed(futures), start=1):
+                    index, segment_path, detections = future.result()
+                    segments[index] = (segment_path, detections)
+                    if progress_callback:
+                        progress_callback(int(done / len(futures) * 100))
+            
+            if ffmpeg:
+                self._concat(ffmpeg, [segment_path for segment_path, _ in segments], output_path)
+            else:
+                self._stitch([segment_path for segment_path, _ in segments], output_path, fps, codec)
+        
+        all_detections = [d for _, detections in segments for d in detections]
+        return output_path, all_detections
+    
+    @staticmethod
+    def _concat(ffmpeg: str, segment_paths: List[Path], output_path: Path) -> None:
+        """Join same-codec segments into output_path by stream copy (ffmpeg concat demuxer)"""
+        list_path = segment_paths[0].with_name("segments.txt")
+        list_path.write_text("".join(f"file '{path.as_posix()}'\n" for path in segment_paths))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        result = subprocess.run(
+            [ffmpeg, "-v", "error", "-y", "-f", "concat", "-safe", "0", "-i", str(list_path),
+             "-c", "copy", str(output_path)],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg could not join segments: {result.stderr.strip()}")
+    
+    @staticmethod
+    def _stitch(segment_paths: List[Path], output_path: Path, fps: float, codec: str) -> None:
+        """Decode lossless segments in order and encode them once into output_path"""
+        writer = None
+        try:
+            for segment_path in segment_paths:
+                cap = cv2.VideoCapture(str(segment_path))
+                try:
+                    for _, frame in MediaHandler.iter_frames(cap):
+                        if writer is None:
+                            writer = MediaHandler.open_video_writer(output_path, frame.shape, fps, codec)
+                        writer.write(frame)
+                finally:
+                    cap.release()
+        finally:
+            if writer is not None:
+                writer.release()
@@ -0,0 +1,195 @@
+"""Incremental Detection Statistics"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from src.config import MODEL_CONFIG
+from src.core.detector import Detections
+
+
+def class_breakdown(detections: Detections) -> List[Tuple[str, int]]:
+    """(class name, count) pairs in order of first appearance"""
+    if len(detections) == 0:
+        return []
+    
+    class_ids, first_index, counts = np.unique(detections.class_ids, return_index=True, return_counts=True)
+    order = np.argsort(first_index)
+    return [(detections.class_name(int(class_ids[i])), int(counts[i])) for i in order]
+
+
+class DetectionStatistics:
+    """Per-frame and per-class detection counts, kept up to date frame by frame
+    
+    Each frame adds one row of per-class counts to a compact (frames x classes)
+    int32 array, which doubles in size when full, and updates running totals.
+    Adding or replacing a frame therefore costs O(classes) regardless of how many
+    frames came before, and totals, averages and the peak are read without
+    rescanning. The per-frame total series and per-class series are views into
+    these arrays.
+    """
+    
+    def __init__(self, num_classes: int = MODEL_CONFIG["num_classes"], capacity: int = 1024):
+        self._counts = np.zeros((max(1, capacity), max(1, num_classes)), dtype=np.int32)
+        self._frame_totals = np.zeros(max(1, capacity), dtype=np.int32)
+        self._class_totals = np.zeros(self._counts.shape[1], dtype=np.int64)
+        self._seen = np.zeros(self._counts.shape[1], dtype=bool)
+        self._order: List[int] = []  # Class ids in order of first appearance
+        self._names: Dict[int, str] = {}
+        self.frames = 0
+        self.total = 0
+        self._peak = 0
+        self._peak_frame = -1
+        self._peak_stale = False
+        self.last_breakdown: List[Tuple[str, int]] = []  # Count overlay lines of the latest frame
+    
+    @classmethod
+    def from_detections(cls, frames: Iterable[Detections]) -> "DetectionStatistics":
+        stats = cls()
+        for detections in frames:
+            stats.add(detections)
+        return stats
+    
+    def add(self, detections: Detections) -> int:
+        """Count the next frame's detections and return its frame index"""
+        if self.frames == len(self._frame_totals):
+            self._grow_frames()
+        row = self._class_row(detections)
+        index = self.frames
+        count = len(detections)
+        
+        self._counts[index] = row
+        self._frame_totals[index] = count
+        self._class_totals += row
+        self.frames += 1
+        self.total += count
+        if count > self._peak and not self._peak_stale:
+            self._peak, self._peak_frame = count, index
+        self.last_breakdown = class_breakdown(detections)
+        return index
+    
+    def replace(self, index: int, detections: Detections) -> None:
+        """Swap in new detections for an already counted frame (e.g. after re-thresholding)"""
+        if not 0 <= index < self.frames:
+            raise IndexError(f"Frame index {index} out of range ({self.frames} frames)")
+        row = self._class_row(detections)
+        count = len(detections)
+        
+        self._class_totals += row - self._counts[index]
+        self.total += count - int(self._frame_totals[index])
+        self._counts[index] = row
+        self._frame_totals[index] = count
+        if count > self._peak and not self._peak_stale:
+            self._peak, self._peak_frame = count, index
+        elif index == self._peak_frame and count < self._peak:
+            self._peak_stale = True  # Recomputed on the next read
+        if index == self.frames - 1:
+            self.last_breakdown = class_breakdown(detections)
+    
+    def reset(self) -> None:
+        self.__init__(self._counts.shape[1], len(self._frame_totals))
+    
+    @property
+    def series(self) -> np.ndarray:
+        """Detections per frame (a view; do not modify)"""
+        return self._frame_totals[:self.frames]
+    
+    def class_series(self, name: str) -> np.ndarray:
+        """Detections of one class per frame (a view; zeros for an unseen class)"""
+        for class_id, class_name in self._names.items():
+            if class_name == name:
+                return self._counts[:self.frames, class_id]
+        return np.zeros(self.frames, dtype=np.int32)
+    
+    @property
+    def average(self) -> float:
+        """Mean detections per frame"""
+        return self.total / self.frames if self.frames else 0.0
+    
+    @property
+    def peak(self) -> Tuple[int, int]:
+        """(most detections in one frame, index of the first such frame); (0, -1) when empty"""
+        if self._peak_stale:
+            self._peak_stale = False
+            if self.frames:
+                self._peak_frame = int(np.argmax(self.series))
+                self._peak = int(self.series[self._peak_frame])
+        return self._peak, self._peak_frame
+    
+    def class_totals(self) -> Dict[str, int]:
+        """Detections per class over all frames, in order of first appearance"""
+        return {self._class_name(i): int(self._class_totals[i]) for i in self._order if self._class_totals[i]}
+    
+    def frame_breakdown(self, index: int) -> List[Tuple[str, int]]:
+        """(class name, count) pairs of one frame, by class id"""
+        if not 0 <= index < self.frames:
+            raise IndexError(f"Frame index {index} out of range ({self.frames} frames)")
+        row = self._counts[index]
+        return [(self._class_name(int(i)), int(row[i])) for i in np.flatnonzero(row)]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Totals for display and export"""
+        peak, peak_frame = self.peak
+        return {
+            "frames": self.frames,
+            "total": self.total,
+            "average_per_frame": self.average,
+            "peak": peak,
+            "peak_frame": peak_frame,
+            "classes": self.class_totals(),
+        }
+    
+    def to_dict(self, include_series: bool = True) -> Dict[str, Any]:
+        data = self.summary()
+        if include_series:
+            data["series"] = self.series.tolist()
+            data["class_series"] = {
+                self._class_name(i): self._counts[:self.frames, i].tolist() for i in self._order
+            }
+        return data
+    
+    def save_json(self, path: Path, include_series: bool = True) -> Path:
+        """Write to_dict() as JSON and return the path"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(include_series), f, indent=2)
+        return path
+    
+    def _class_name(self, class_id: int) -> str:
+        return self._names.get(class_id, f"Class {class_id}")
+    
+    def _class_row(self, detections: Detections) -> np.ndarray:
+        """Per-class counts of one frame; records names and first appearances"""
+        columns = self._counts.shape[1]
+        if len(detections) == 0:
+            return np.zeros(columns, dtype=np.int32)
+        
+        highest = int(detections.class_ids.max())
+        if highest >= columns:
+            self._grow_classes(highest + 1)
+            columns = highest + 1
+        row = np.bincount(detections.class_ids, minlength=columns).astype(np.int32)
+        
+        new = np.flatnonzero((row > 0) & ~self._seen)
+        if len(new):
+            self._seen[new] = True
+            # Classes new in the same frame are ordered by their first detection, as in class_breakdown
+            for class_id in sorted(new, key=lambda c: np.argmax(detections.class_ids == c)):
+                self._order.append(int(class_id))
+                self._names[int(class_id)] = detections.class_name(int(class_id))
+        return row
+    
+    def _grow_frames(self) -> None:
+        capacity = 2 * len(self._frame_totals)
+        counts = np.zeros((capacity, self._counts.shape[1]), dtype=np.int32)
+        counts[:self.frames] = self._counts[:self.frames]
+        frame_totals = np.zeros(capacity, dtype=np.int32)
+        frame_totals[:self.frames] = self._frame_totals[:self.frames]
+        self._counts, self._frame_totals = counts, frame_totals
+    
+    def _grow_classes(self, columns: int) -> None:
+        extra = columns - self._counts.shape[1]
+        self._counts = np.pad(self._counts, ((0, 0), (0, extra)))
+        self._class_totals = np.pad(self._class_totals, (0, extra))
+        self._seen = np.pad(self._seen, (0, extra))
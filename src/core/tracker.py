@@ -0,0 +1,140 @@
+"""Lightweight IoU Multi-Object Tracker"""
+from typing import List
+
+import numpy as np
+
+from src.config import TRACKER_CONFIG
+from src.core.detector import Detections
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes"""
+    a = boxes_a.astype(np.float32)[:, None, :]
+    b = boxes_b.astype(np.float32)[None, :, :]
+    
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+class Track:
+    """State of one tracked object"""
+    
+    def __init__(self, track_id: int, box: np.ndarray, confidence: float, class_id: int, frame_index: int):
+        self.track_id = track_id
+        self.box = box.astype(np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)  # Box corner motion per frame
+        self.confidence = confidence
+        self.class_id = class_id
+        self.frame_index = frame_index
+        self.misses = 0
+    
+    def predict(self, frame_index: int) -> np.ndarray:
+        """Extrapolate the box to frame_index with constant velocity"""
+        return self.box + self.velocity * (frame_index - self.frame_index)
+
+
+class IoUTracker:
+    """Associate detections across keyframes and predict boxes in between
+    
+    Detections on keyframes are matched to existing tracks by greedy IoU
+    against each track's predicted box (same class only). Track motion is
+    an alpha-beta filter, i.e. a steady-state constant-velocity Kalman filter,
+    so skipped frames can be filled with extrapolated boxes.
+    """
+    
+    def __init__(
+        self,
+        iou_threshold: float = TRACKER_CONFIG["iou_threshold"],
+        max_misses: int = TRACKER_CONFIG["max_misses"],
+        velocity_smoothing: float = TRACKER_CONFIG["velocity_smoothing"],
+    ):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.velocity_smoothing = velocity_smoothing
+        self.tracks: List[Track] = []
+        self.names = {}
+        self._next_id = 1
+    
+    def reset(self) -> None:
+        """Forget all tracks and class names"""
+        self.tracks = []
+        self.names = {}
+        self._next_id = 1
+    
+    def update(self, detections: Detections, frame_index: int) -> Detections:
+        """Associate keyframe detections with tracks; returns detections with track ids"""
+        self.names.update(detections.names)
+        track_ids = np.zeros(len(detections), dtype=np.int32)
+        matched_tracks = set()
+        
+        if self.tracks and len(detections):
+            predicted = np.stack([t.predict(frame_index) for t in self.tracks])
+            ious = iou_matrix(predicted, detections.boxes)
+            track_classes = np.array([t.class_id for t in self.tracks])
+            ious[track_classes[:, None] != detections.class_ids[None, :]] = 0.0
+            
+            # Greedy assignment, best overlaps first
+            for flat in np.argsort(-ious, axis=None):
+                t, d = np.unravel_index(flat, ious.shape)
+                if ious[t, d] < self.iou_threshold:
+                    break
+                if t in matched_tracks or track_ids[d]:
+                    continue
+                self._correct(self.tracks[t], detections, d, frame_index)
+                matched_tracks.add(t)
+                track_ids[d] = self.tracks[t].track_id
+        
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.misses += 1
+        
+        for d in np.flatnonzero(track_ids == 0):
+            track = Track(
+                self._next_id,
+                detections.boxes[d],
+                float(detections.confidences[d]),
+                int(detections.class_ids[d]),
+                frame_index,
+            )
+            self.tracks.append(track)
+            track_ids[d] = track.track_id
+            self._next_id += 1
+        
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        
+        return Detections(
+            detections.boxes, detections.confidences, detections.class_ids, detections.names, track_ids
+        )
+    
+    def predict(self, frame_index: int) -> Detections:
+        """Predicted boxes for a frame without inference (tracks seen at the last keyframe)"""
+        live = [t for t in self.tracks if t.misses == 0]
+        if not live:
+            return Detections(names=self.names)
+        
+        return Detections(
+            np.stack([t.predict(frame_index) for t in live]),
+            np.array([t.confidence for t in live], dtype=np.float32),
+            np.array([t.class_id for t in live], dtype=np.int32),
+            self.names,
+            np.array([t.track_id for t in live], dtype=np.int32),
+        )
+    
+    def _correct(self, track: Track, detections: Detections, index: int, frame_index: int) -> None:
+        """Blend a matched detection into the track state"""
+        box = detections.boxes[index].astype(np.float32)
+        gap = max(1, frame_index - track.frame_index)
+        measured_velocity = (box - track.box) / gap
+        
+        alpha = self.velocity_smoothing
+        track.velocity = alpha * track.velocity + (1.0 - alpha) * measured_velocity
+        track.box = box
+        track.confidence = float(detections.confidences[index])
+        track.frame_index = frame_index
+        track.misses = 0
+
@@ -0,0 +1,5 @@
+"""Local HTTP inference service"""
+from .batcher import MicroBatcher
+from .server import InferenceService
+
+__all__ = ["MicroBatcher", "InferenceService"]
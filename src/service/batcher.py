@@ -0,0 +1,121 @@
+"""Dynamic Micro-batching for Concurrent Requests"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import SERVICE_CONFIG
+from src.core.detector import AerialDetector, Detections
+
+
+class MicroBatcher:
+    """Group concurrently submitted images into batched forward passes
+    
+    The first queued image opens a batch; the batch is closed when it reaches
+    max_batch_size or max_wait_ms has passed. While a batch runs, new requests
+    queue up, so under load batches fill without waiting. Inference runs on a
+    single background thread because the model is not safe to call concurrently.
+    """
+    
+    def __init__(
+        self,
+        detector: AerialDetector,
+        max_batch_size: int = SERVICE_CONFIG["max_batch_size"],
+        max_wait_ms: float = SERVICE_CONFIG["max_wait_ms"],
+        max_queue: int = SERVICE_CONFIG["max_queue"],
+    ):
+        self.detector = detector
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue = max_queue
+        self.batches = 0
+        self.items = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+    
+    async def start(self) -> None:
+        """Start collecting batches on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop batching and release the inference thread"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+    
+    async def submit(self, image: np.ndarray, block: bool = False) -> Detections:
+        """Queue one image and wait for its detections
+        
+        Raises asyncio.QueueFull when max_queue images are already pending,
+        unless block is set, in which case it waits for room.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if block:
+            await self._queue.put((image, future))
+        else:
+            self._queue.put_nowait((image, future))
+        return await future
+    
+    async def submit_many(self, images: List[np.ndarray]) -> List[Detections]:
+        """Queue several images (e.g. video frames), waiting for room, and return all detections"""
+        return list(await asyncio.gather(*(self.submit(image, block=True) for image in images)))
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(loop)
+            batch = [(image, future) for image, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+            
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.detector.detect_batch, [image for image, _ in batch], len(batch)
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), detections in zip(batch, results):
+                if not future.done():
+                    future.set_result(detections)
+    
+    async def _collect(self, loop: asyncio.AbstractEventLoop) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        """Wait for one item, then gather more until the batch is full or max_wait expires"""
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "images": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
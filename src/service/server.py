@@ -0,0 +1,344 @@
+"""Local HTTP Inference Service"""
+import asyncio
+import json
+import logging
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+from src.config import OUTPUTS_DIR, SERVICE_CONFIG, VIDEO_CONFIG
+from src.core.detector import AerialDetector, Detections
+from src.core.media_handler import MediaHandler
+from src.service.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    """Request failure with an HTTP status code"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _BatchedDetector:
+    """detect_batch() adapter that routes video frames through the micro-batcher
+    
+    Lets MediaHandler.stream_video run on a job thread while its frames share
+    forward passes with concurrent image requests.
+    """
+    
+    def __init__(self, batcher: MicroBatcher, loop: asyncio.AbstractEventLoop):
+        self.batcher = batcher
+        self.loop = loop
+    
+    def detect_batch(self, frames: List[np.ndarray], batch_size: int = 8) -> List[Detections]:
+        future = asyncio.run_coroutine_threadsafe(self.batcher.submit_many(frames), self.loop)
+        return future.result()
+
+
+class InferenceService:
+    """asyncio HTTP/1.1 server wrapping AerialDetector
+    
+    Endpoints:
+        GET  /health                  service and batching statistics
+        POST /detect                  encoded image body -> detections JSON
+        POST /jobs/video              video body, or JSON {"path": ...} for a file under media_root -> job id
+        GET  /jobs/<id>               job status and progress
+        GET  /jobs/<id>/detections    per-frame detections of a finished job
+    
+    Detections use the Detection.to_dict schema. Finished jobs are kept for
+    job_ttl_s, and only the max_finished_jobs most recent of them.
+    """
+    
+    def __init__(
+        self,
+        detector: AerialDetector,
+        host: str = SERVICE_CONFIG["host"],
+        port: int = SERVICE_CONFIG["port"],
+        max_batch_size: int = SERVICE_CONFIG["max_batch_size"],
+        max_wait_ms: float = SERVICE_CONFIG["max_wait_ms"],
+        max_queue: int = SERVICE_CONFIG["max_queue"],
+        max_body_mb: int = SERVICE_CONFIG["max_body_mb"],
+        job_ttl_s: float = SERVICE_CONFIG["job_ttl_s"],
+        max_finished_jobs: int = SERVICE_CONFIG["max_finished_jobs"],
+        media_root: Optional[Path] = SERVICE_CONFIG["media_root"],
+        output_dir: Path = OUTPUTS_DIR,
+    ):
+        self.detector = detector
+        self.host = host
+        self.port = port
+        self.max_body = max_body_mb * 1024 * 1024
+        self.output_dir = output_dir
+        self.media_root = Path(media_root).resolve() if media_root else None
+        self.batcher = MicroBatcher(detector, max_batch_size, max_wait_ms, max_queue)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.job_ttl = job_ttl_s
+        self.max_finished_jobs = max(0, max_finished_jobs)
+        self.requests = 0
+        # Video jobs decode/encode on their own thread; their inference goes through the batcher
+        self._job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-job")
+    
+    async def serve_forever(self) -> None:
+        """Run until cancelled"""
+        await self.batcher.start()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        logger.info("Serving on http://%s:%d", self.host, self.port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self._job_executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = await self._route(method, target, headers, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except asyncio.QueueFull:
+                    status, payload = 503, {"error": "Inference queue is full"}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Parse one request; None when the client closed the connection"""
+        line = await reader.readline()
+        if not line:
+            return None
+        
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        length = int(headers.get("content-length", 0) or 0)
+        if length > self.max_body:
+            raise HTTPError(413, f"Body larger than {self.max_body // (1024 * 1024)} MB")
+        body = await reader.readexactly(length) if length else b""
+        
+        return method.upper(), target, headers, body
+    
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+    
+    async def _route(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        self.requests += 1
+        self._evict_jobs()
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        
+        if parts == ["health"]:
+            self._require(method, "GET")
+            return 200, {
+                "status": "ok",
+                "requests": self.requests,
+                "jobs": len(self.jobs),
+                "batching": self.batcher.stats(),
+            }
+        
+        if parts == ["detect"]:
+            self._require(method, "POST")
+            return 200, await self._detect(body)
+        
+        if parts == ["jobs", "video"]:
+            self._require(method, "POST")
+            return 202, await self._start_video_job(headers, body, parse_qs(url.query))
+        
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            self._require(method, "GET")
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"Unknown job {parts[1]}")
+            if len(parts) == 2:
+                return 200, self._job_status(job)
+            if parts[2] == "detections":
+                if job["status"] != "done":
+                    raise HTTPError(400, f"Job is {job['status']}")
+                return 200, {"frames": [d.to_dicts() for d in job["detections"]]}
+        
+        raise HTTPError(404, f"No route for {url.path}")
+    
+    @staticmethod
+    def _require(method: str, expected: str) -> None:
+        if method != expected:
+            raise HTTPError(405, f"Use {expected}")
+    
+    async def _detect(self, body: bytes) -> Dict[str, Any]:
+        """Decode an image body and detect through the micro-batcher"""
+        start = time.perf_counter()
+        image = None
+        if body:
+            # Decoding a large JPEG takes milliseconds; keep it off the event loop
+            buffer = np.frombuffer(body, dtype=np.uint8)
+            image = await asyncio.get_running_loop().run_in_executor(None, cv2.imdecode, buffer, cv2.IMREAD_COLOR)
+        if image is None:
+            raise HTTPError(400, "Body is not a decodable image")
+        
+        detections = await self.batcher.submit(image)
+        return {
+            "width": image.shape[1],
+            "height": image.shape[0],
+            "count": len(detections),
+            "detections": detections.to_dicts(),
+            "latency_ms": (time.perf_counter() - start) * 1000.0,
+        }
+    
+    async def _start_video_job(self, headers: Dict[str, str], body: bytes, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Queue a video job from a local path (JSON body) or an uploaded file"""
+        try:
+            frame_skip = int(query.get("frame_skip", ["1"])[0])
+        except ValueError:
+            frame_skip = 0
+        if frame_skip < 1:
+            raise HTTPError(400, "frame_skip must be an integer >= 1")
+        
+        upload = None
+        name = None
+        if headers.get("content-type", "").startswith("application/json"):
+            if self.media_root is None:
+                raise HTTPError(400, "Path jobs are disabled (no media root configured); upload the video instead")
+            try:
+                requested = Path(json.loads(body or b"{}")["path"])
+            except (ValueError, KeyError, TypeError):
+                raise HTTPError(400, 'Expected JSON body {"path": "<video file>"}')
+            # Relative paths are taken from the media root; nothing outside it may be opened
+            video_path = (self.media_root / requested).resolve()
+            if not video_path.is_relative_to(self.media_root):
+                raise HTTPError(400, "Path is outside the media root")
+            if not video_path.is_file():
+                raise HTTPError(400, f"Video not found: {requested}")
+        else:
+            if not body:
+                raise HTTPError(400, "Empty video upload")
+            name = Path(query.get("name", ["upload.mp4"])[0])
+            # Uploads can be hundreds of MB; write them off the event loop so batching keeps going
+            video_path = upload = await asyncio.get_running_loop().run_in_executor(
+                None, self._save_upload, body, name.suffix or ".mp4"
+            )
+        
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "progress": 0,
+            "input": str(video_path),
+            "output": str(self.output_dir / f"{(name or video_path).stem}_{job_id}_detected.mp4"),
+            "frames": 0,
+            "detections": [],
+            "error": None,
+            "seconds": None,
+            "finished_at": None,
+        }
+        self.jobs[job_id] = job
+        
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(self._job_executor, self._run_video_job, job, upload, frame_skip, loop)
+        return self._job_status(job)
+    
+    @staticmethod
+    def _save_upload(body: bytes, suffix: str) -> Path:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            f.write(body)
+        return Path(f.name)
+    
+    def _run_video_job(
+        self,
+        job: Dict[str, Any],
+        upload: Optional[Path],
+        frame_skip: int,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Stream a video through the batcher into an annotated output (job thread)"""
+        job["status"] = "running"
+        start = time.perf_counter()
+        try:
+            def on_frame(index: int, detections: Detections) -> None:
+                job["frames"] = index + 1
+            
+            _, all_detections = MediaHandler.stream_video(
+                Path(job["input"]),
+                _BatchedDetector(self.batcher, loop),
+                Path(job["output"]),
+                frame_skip=frame_skip,
+                batch_size=self.batcher.max_batch_size,
+                interpolate=VIDEO_CONFIG["interpolate_skipped"],
+                progress_callback=lambda p: job.update(progress=p),
+                detection_callback=on_frame,
+            )
+            job.update(status="done", progress=100, detections=all_detections, frames=len(all_detections))
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+        finally:
+            job["seconds"] = time.perf_counter() - start
+            job["finished_at"] = time.time()
+            if upload is not None:
+                upload.unlink(missing_ok=True)
+    
+    def _evict_jobs(self) -> None:
+        """Forget finished jobs past the TTL, then the oldest beyond max_finished_jobs"""
+        now = time.time()
+        finished = sorted(
+            (job["finished_at"], job_id) for job_id, job in list(self.jobs.items()) if job["finished_at"] is not None
+        )
+        excess = len(finished) - self.max_finished_jobs
+        for i, (finished_at, job_id) in enumerate(finished):
+            if i < excess or now - finished_at > self.job_ttl:
+                self.jobs.pop(job_id, None)
+    
+    @staticmethod
+    def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+        status = {k: v for k, v in job.items() if k != "detections"}
+        status["total_detections"] = sum(len(d) for d in job["detections"])
+        return status
@@ -1,25 +1,28 @@
 """Main Application Window"""
 import sys
-import cv2
+import time
 from pathlib import Path
 from typing import Optional, List
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QSlider, QCheckBox, QSpinBox, QFileDialog,
-    QMessageBox, QProgressBar, QComboBox, QFrame, QScrollArea,
-    QSizePolicy
+    QPushButton, QSlider, QCheckBox, QSpinBox, QDoubleSpinBox, QFileDialog,
+    QMessageBox, QProgressBar, QComboBox, QFrame, QScrollArea, QInputDialog,
+    QSizePolicy, QApplication
 )
 from PyQt5.QtGui import QPixmap, QImage, QIcon, QFont, QColor, QPalette
 from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSlot
 
 from src.config import (
-    MODEL_CONFIG, UI_CONFIG, settings,
+    MODEL_CONFIG, UI_CONFIG, VIDEO_CONFIG, CANDIDATE_CONFIG, ADAPTIVE_CONFIG, settings,
     OUTPUTS_DIR, MODEL_PATH
 )
-from src.core.detector import AerialDetector
-from src.core.media_handler import MediaHandler
-from src.utils.worker import ProcessingWorker
+from src.utils.frame_store import FrameStore
+from src.utils.model_loader import ModelLoader
+from src.utils.profiling import profiler
+
+# Modules that pull in OpenCV, torch or ultralytics are imported where they are used,
+# after ModelLoader has loaded them in the background, so the window appears quickly.
 
 
 class SettingsPanel(QFrame):
@@ -62,6 +65,20 @@ class SettingsPanel(QFrame):
         self.iou_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.iou_label)
         
+        # Inference resolution
+        layout.addWidget(QLabel("Input Size"))
+        self.input_size = QComboBox()
+        for size in ADAPTIVE_CONFIG["sizes"]:
+            self.input_size.addItem(str(size), size)
+        self.input_size.setCurrentText(str(settings.get("input_size", MODEL_CONFIG["input_size"])))
+        layout.addWidget(self.input_size)
+        
+        layout.addWidget(QLabel("Latency Budget (ms/frame, 0 = fixed size)"))
+        self.latency_budget = QSpinBox()
+        self.latency_budget.setRange(0, 5000)
+        self.latency_budget.setValue(settings.get("latency_budget_ms") or 0)
+        layout.addWidget(self.latency_budget)
+        
         layout.addWidget(QLabel(""))  # Spacer
         
         # Visualization options
@@ -89,6 +106,10 @@ class SettingsPanel(QFrame):
         self.side_by_side.setChecked(settings.get("side_by_side", True))
         layout.addWidget(self.side_by_side)
         
+        self.tiled = QCheckBox("Tiled Inference (large images)")
+        self.tiled.setChecked(settings.get("tiled", False))
+        layout.addWidget(self.tiled)
+        
         layout.addWidget(QLabel(""))  # Spacer
         
         # Video options
@@ -102,6 +123,29 @@ class SettingsPanel(QFrame):
         self.frame_skip.setValue(settings.get("frame_skip", 1))
         layout.addWidget(self.frame_skip)
         
+        layout.addWidget(QLabel("Sample Interval (s, 0 = use frame skip)"))
+        self.sample_interval = QDoubleSpinBox()
+        self.sample_interval.setRange(0.0, 60.0)
+        self.sample_interval.setSingleStep(0.5)
+        self.sample_interval.setValue(settings.get("sample_interval_s") or 0.0)
+        layout.addWidget(self.sample_interval)
+        
+        self.sampled_only = QCheckBox("Decode Only Sampled Frames")
+        self.sampled_only.setChecked(not settings.get("keep_skipped_frames", True))
+        layout.addWidget(self.sampled_only)
+        
+        self.interpolate = QCheckBox("Track Objects on Skipped Frames")
+        self.interpolate.setChecked(settings.get("interpolate_skipped", True))
+        layout.addWidget(self.interpolate)
+        
+        self.motion_gate = QCheckBox("Skip Inference on Static Scenes")
+        self.motion_gate.setChecked(settings.get("motion_gate", False))
+        layout.addWidget(self.motion_gate)
+        
+        self.profiling = QCheckBox("Profile Pipeline Stages")
+        self.profiling.setChecked(settings.get("profiling", False))
+        layout.addWidget(self.profiling)
+        
         layout.addStretch()
         
         self.setLayout(layout)
@@ -111,12 +155,20 @@ class SettingsPanel(QFrame):
         return {
             "confidence": self.conf_slider.value() / 100.0,
             "iou": self.iou_slider.value() / 100.0,
+            "input_size": self.input_size.currentData(),
+            "latency_budget_ms": self.latency_budget.value() or None,
             "show_boxes": self.show_boxes.isChecked(),
             "show_labels": self.show_labels.isChecked(),
             "show_confidence": self.show_confidence.isChecked(),
             "show_count": self.show_count.isChecked(),
             "side_by_side": self.side_by_side.isChecked(),
+            "tiled": self.tiled.isChecked(),
             "frame_skip": self.frame_skip.value(),
+            "sample_interval_s": self.sample_interval.value() or None,
+            "keep_skipped_frames": not self.sampled_only.isChecked(),
+            "interpolate_skipped": self.interpolate.isChecked(),
+            "motion_gate": self.motion_gate.isChecked(),
+            "profiling": self.profiling.isChecked(),
         }
 
 
@@ -139,6 +191,11 @@ class PreviewArea(QFrame):
         self.image_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         layout.addWidget(self.image_label)
         
+        # Frame scrubber for processed videos
+        self.scrub_slider = QSlider(Qt.Horizontal)
+        self.scrub_slider.setVisible(False)
+        layout.addWidget(self.scrub_slider)
+        
         # Info label
         self.info_label = QLabel("📁 Load an image or video to start detection")
         self.info_label.setAlignment(Qt.AlignCenter)
@@ -149,23 +206,22 @@ class PreviewArea(QFrame):
     
     def set_image(self, cv_image):
         """Display OpenCV image"""
-        h, w = cv_image.shape[:2]
-        
-        # Resize if too large
-        max_w, max_h = 900, 650
-        if w > max_w or h > max_h:
-            scale = min(max_w / w, max_h / h)
-            w, h = int(w * scale), int(h * scale)
-            cv_image = cv2.resize(cv_image, (w, h))
-        
-        # Convert
-        cv_rgb = cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB)
-        h, w, ch = cv_rgb.shape
-        bytes_per_line = 3 * w
-        qt_image = QImage(cv_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        self.image_label.setPixmap(pixmap)
+        from src.utils.preview import to_preview_rgb
+        self.set_rgb_image(to_preview_rgb(cv_image))
+    
+    def set_rgb_image(self, rgb):
+        """Display an RGB image already scaled to preview size"""
+        h, w = rgb.shape[:2]
+        qt_image = QImage(rgb.data, w, h, 3 * w, QImage.Format_RGB888)
+        self.image_label.setPixmap(QPixmap.fromImage(qt_image))
+    
+    def set_scrub_range(self, count: int):
+        """Show the scrubber for count frames, positioned on the last; hide it for fewer than two"""
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setRange(0, max(0, count - 1))
+        self.scrub_slider.setValue(max(0, count - 1))
+        self.scrub_slider.blockSignals(False)
+        self.scrub_slider.setVisible(count > 1)
     
     def set_info(self, text: str, status: str = "info"):
         """Set info label"""
@@ -186,27 +242,24 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        # Initialize detector
-        try:
-            if not MODEL_PATH.exists():
-                raise FileNotFoundError(f"Model not found: {MODEL_PATH}")
-            self.detector = AerialDetector(MODEL_PATH)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load model:\n{str(e)}")
-            sys.exit(1)
-        
-        # Initialize worker
-        self.worker = ProcessingWorker(self.detector)
-        self.worker.frame_processed.connect(self.on_frame_processed)
-        self.worker.finished.connect(self.on_processing_finished)
-        self.worker.progress.connect(self.on_progress)
-        self.worker.error.connect(self.on_error)
+        # Detector, cache and workers are created by on_model_loaded
+        self.detector = None
+        self.candidate_cache = None
+        self.worker = None
+        self.live_worker = None
         
         # State
         self.current_frames: List = []
         self.current_detections: List = []
         self.current_media_path: Optional[Path] = None
+        self.current_image = None  # Raw image, kept for re-rendering
+        self.statistics = None  # DetectionStatistics of the current run, updated per frame
+        self.statistics_name = ""  # Export file stem for the statistics
+        self.rerender_pending = False  # Visualization changed during a run
+        self.frame_store: Optional[FrameStore] = None  # Processed video frames, kept on disk
         self.is_processing = False
+        self.is_live = False
+        self.display_latency_ms = 0.0  # Smoothed capture-to-display latency of the live preview
         
         # Setup UI
         self.setWindowTitle("🦅 Aerial Person Detection")
@@ -215,6 +268,82 @@ class MainWindow(QMainWindow):
         
         # Load settings
         self.load_settings()
+        
+        # Re-threshold shortly after the sliders stop moving
+        self.threshold_timer = QTimer(self)
+        self.threshold_timer.setSingleShot(True)
+        self.threshold_timer.setInterval(150)
+        self.threshold_timer.timeout.connect(self.apply_thresholds)
+        self.settings_panel.conf_slider.valueChanged.connect(self.on_threshold_changed)
+        self.settings_panel.iou_slider.valueChanged.connect(self.on_threshold_changed)
+        
+        # Visualization changes redraw from stored detections
+        for checkbox in (
+            self.settings_panel.show_boxes,
+            self.settings_panel.show_labels,
+            self.settings_panel.show_confidence,
+            self.settings_panel.show_count,
+        ):
+            checkbox.stateChanged.connect(self.rerender)
+        
+        # Video previews are pulled from the worker at display rate; stale frames are dropped
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setInterval(int(1000 / UI_CONFIG["preview_fps"]))
+        self.preview_timer.timeout.connect(self.poll_preview)
+        
+        # Scrub through processed video frames
+        self.preview.scrub_slider.valueChanged.connect(self.on_scrub)
+        
+        # Load and warm up the model in the background; detection stays disabled until it is ready
+        self.webcam_btn.setEnabled(False)
+        self.preview.set_info("⏳ Loading model... (images and videos can be opened meanwhile)", "processing")
+        self.model_loader = ModelLoader(MODEL_PATH)
+        self.model_loader.loaded.connect(self.on_model_loaded)
+        self.model_loader.failed.connect(self.on_model_failed)
+        self.model_loader.start()
+    
+    @pyqtSlot(object, dict)
+    def on_model_loaded(self, detector, timings: dict):
+        """Create the workers around the loaded detector and enable detection"""
+        from src.core.candidate_cache import CandidateCache
+        from src.utils.worker import ProcessingWorker, LiveWorker
+        
+        self.detector = detector
+        
+        # Raw candidates let threshold changes skip re-inference
+        self.candidate_cache = CandidateCache() if CANDIDATE_CONFIG["enabled"] else None
+        
+        # Initialize worker
+        self.worker = ProcessingWorker(self.detector, self.candidate_cache)
+        self.worker.frame_processed.connect(self.on_frame_processed)
+        self.worker.finished.connect(self.on_processing_finished)
+        self.worker.cancelled.connect(self.on_processing_cancelled)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.error.connect(self.on_error)
+        self.worker.pipeline_stats.connect(self.on_pipeline_stats)
+        self.worker.profile_updated.connect(self.on_profile_updated)
+        
+        # Live camera / stream worker
+        self.live_worker = LiveWorker(self.detector)
+        self.live_worker.live_stats.connect(self.on_live_stats)
+        self.live_worker.finished.connect(self.on_live_finished)
+        self.live_worker.error.connect(self.on_error)
+        
+        self.webcam_btn.setEnabled(True)
+        self.process_btn.setEnabled(self.current_media_path is not None)
+        if self.current_media_path is None:
+            self.preview.set_info(
+                f"✓ Model ready in {sum(timings.values()):.1f}s (imports {timings['import_s']:.1f}s, "
+                f"load {timings['load_s']:.1f}s, warm-up {timings['warmup_s']:.1f}s). "
+                "Load an image or video to start detection",
+                "success",
+            )
+    
+    @pyqtSlot(str)
+    def on_model_failed(self, error_msg: str):
+        """Without a model the app cannot do anything useful"""
+        QMessageBox.critical(self, "Error", f"Failed to load model:\n{error_msg}")
+        QApplication.exit(1)
     
     def init_ui(self):
         """Initialize main UI"""
@@ -295,6 +424,11 @@ class MainWindow(QMainWindow):
         self.save_video_btn.setEnabled(False)
         output_layout.addWidget(self.save_video_btn)
         
+        self.save_stats_btn = QPushButton("📈 Export Statistics")
+        self.save_stats_btn.clicked.connect(self.save_statistics)
+        self.save_stats_btn.setEnabled(False)
+        output_layout.addWidget(self.save_stats_btn)
+        
         self.open_output_btn = QPushButton("📂 Open Outputs Folder")
         self.open_output_btn.clicked.connect(self.open_outputs_folder)
         output_layout.addWidget(self.open_output_btn)
@@ -315,10 +449,20 @@ class MainWindow(QMainWindow):
         self.count_label.setFont(QFont("Arial", 10))
         stats_layout.addWidget(self.count_label)
         
-        self.class_label = QLabel("Person: 0")
+        self.class_label = QLabel("No detections")
         self.class_label.setFont(QFont("Arial", 10))
         stats_layout.addWidget(self.class_label)
         
+        self.live_label = QLabel("")
+        self.live_label.setFont(QFont("Arial", 9))
+        self.live_label.setVisible(False)
+        stats_layout.addWidget(self.live_label)
+        
+        self.profile_label = QLabel("")
+        self.profile_label.setFont(QFont("Courier", 8))
+        self.profile_label.setVisible(False)
+        stats_layout.addWidget(self.profile_label)
+        
         stats_frame.setLayout(stats_layout)
         left_layout.addWidget(stats_frame)
         
@@ -436,12 +580,14 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
+            from src.core.media_handler import MediaHandler
             self.current_media_path = Path(file_path)
             try:
                 image = MediaHandler.load_image(self.current_media_path)
+                self.current_image = image
                 self.preview.set_image(image)
                 self.preview.set_info(f"✓ Loaded: {self.current_media_path.name}", "success")
-                self.process_btn.setEnabled(True)
+                self.process_btn.setEnabled(self.detector is not None)
             except Exception as e:
                 self.preview.set_info(f"✗ Error: {str(e)}", "error")
     
@@ -453,6 +599,7 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
+            from src.core.media_handler import MediaHandler
             self.current_media_path = Path(file_path)
             try:
                 cap, _ = MediaHandler.load_video(self.current_media_path)
@@ -462,13 +609,48 @@ class MainWindow(QMainWindow):
                 if ret:
                     self.preview.set_image(frame)
                     self.preview.set_info(f"✓ Loaded: {self.current_media_path.name}", "success")
-                    self.process_btn.setEnabled(True)
+                    self.process_btn.setEnabled(self.detector is not None)
             except Exception as e:
                 self.preview.set_info(f"✗ Error: {str(e)}", "error")
     
     def use_webcam(self):
-        """Use webcam"""
-        QMessageBox.info(self, "Webcam", "Webcam support coming soon!")
+        """Run live detection on a camera, stream or replayed video file"""
+        if self.is_processing:
+            return
+        source, ok = QInputDialog.getText(
+            self, "Live Source", "Camera index, stream URL (rtsp://, http://) or video file to replay:", text="0"
+        )
+        if not ok or not source.strip():
+            return
+        
+        settings_dict = self.settings_panel.get_settings()
+        if not self._apply_model_settings(settings_dict):
+            return
+        self.live_worker.set_source(source.strip())
+        self.live_worker.set_settings(
+            show_boxes=settings_dict["show_boxes"],
+            show_labels=settings_dict["show_labels"],
+            show_confidence=settings_dict["show_confidence"],
+            show_count=settings_dict["show_count"],
+        )
+        
+        self.is_processing = True
+        self.is_live = True
+        self.display_latency_ms = 0.0
+        self.current_frames = []
+        self.current_detections = []
+        self._reset_statistics("live")
+        self._close_frame_store()
+        self.preview.set_scrub_range(0)
+        self.process_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.save_video_btn.setEnabled(False)
+        self.live_label.setText("Connecting...")
+        self.live_label.setVisible(True)
+        
+        self.live_worker.start()
+        self.preview_timer.start()
+        self.preview.set_info(f"Live: {source.strip()}", "processing")
     
     def run_detection(self):
         """Run detection on selected media"""
@@ -476,14 +658,56 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Please select an image or video first")
             return
         
+        self._start_worker(render_only=False)
+    
+    def rerender(self, _state=None):
+        """Redraw annotations from stored detections after a visualization change"""
+        if not self.current_detections or self.current_media_path is None:
+            return
+        if self.is_processing:
+            self.rerender_pending = True
+            return
+        
+        if self.worker.is_video:
+            # Raw frames are re-decoded from the file; the model is not run
+            self._start_worker(render_only=True)
+        elif self.current_image is not None:
+            from src.core.media_handler import MediaHandler
+            settings_dict = self.settings_panel.get_settings()
+            annotated = MediaHandler.annotate_frame(
+                self.current_image,
+                self.current_detections[0],
+                show_boxes=settings_dict["show_boxes"],
+                show_labels=settings_dict["show_labels"],
+                show_confidence=settings_dict["show_confidence"],
+                show_count=settings_dict["show_count"],
+            )
+            self.current_frames = [annotated]
+            self.preview.set_image(annotated)
+    
+    def _apply_model_settings(self, settings_dict: dict) -> bool:
+        """Push thresholds, input size and latency budget to the detector; False if rejected"""
+        self.detector.set_thresholds(settings_dict["confidence"], settings_dict["iou"])
+        try:
+            self.detector.set_input_size(settings_dict["input_size"])
+            self.detector.set_latency_budget(settings_dict["latency_budget_ms"])
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return False
+        return True
+    
+    def _start_worker(self, render_only: bool):
+        """Start a detection run, or a render-only run from stored detections"""
         # Get settings
         settings_dict = self.settings_panel.get_settings()
         
-        # Update detector thresholds
-        self.detector.set_thresholds(settings_dict["confidence"], settings_dict["iou"])
+        # Update detector thresholds and resolution
+        if not self._apply_model_settings(settings_dict):
+            return
         
         # Disable buttons
         self.is_processing = True
+        self.rerender_pending = False
         self.process_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.progress_bar.setVisible(True)
@@ -491,6 +715,18 @@ class MainWindow(QMainWindow):
         # Determine if video or image
         is_video = self.current_media_path.suffix.lower() in {".mp4", ".avi", ".mov", ".mkv", ".flv"}
         
+        # Keep the stored detections for a render-only run
+        self.worker.set_render_only(list(self.current_detections) if render_only else None)
+        
+        # Video frames go to a disk-backed store instead of being held in memory
+        self.current_frames = []
+        self.current_detections = []
+        self._reset_statistics(self.current_media_path.stem)
+        self._close_frame_store()
+        self.preview.set_scrub_range(0)
+        if is_video:
+            self.frame_store = FrameStore()
+        
         # Start worker
         self.worker.set_media(self.current_media_path, is_video)
         self.worker.set_settings(
@@ -499,38 +735,144 @@ class MainWindow(QMainWindow):
             show_confidence=settings_dict["show_confidence"],
             show_count=settings_dict["show_count"],
             frame_skip=settings_dict["frame_skip"],
+            sample_interval_s=settings_dict["sample_interval_s"],
+            keep_skipped_frames=settings_dict["keep_skipped_frames"],
+            interpolate_skipped=settings_dict["interpolate_skipped"],
+            motion_gate=settings_dict["motion_gate"],
+            tiled=settings_dict["tiled"],
+            profiling=settings_dict["profiling"],
+            frame_store=self.frame_store,
         )
+        self.profile_label.setVisible(settings_dict["profiling"])
         self.worker.start()
+        if is_video:
+            self.preview_timer.start()
         
-        self.preview.set_info("Processing...", "processing")
+        self.preview.set_info("Redrawing..." if render_only else "Processing...", "processing")
     
     def stop_processing(self):
         """Stop detection"""
+        if self.is_live:
+            self.live_worker.stop()  # on_live_finished resets the UI
+            return
         self.worker.stop()
+        self._stop_preview()
+        if self.frame_store is not None:
+            self.preview.set_scrub_range(len(self.frame_store))
         self.is_processing = False
         self.process_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.progress_bar.setVisible(False)
         self.preview.set_info("Processing stopped", "info")
     
-    @pyqtSlot(object, list)
+    @pyqtSlot(object, object)
     def on_frame_processed(self, frame, detections):
         """Handle processed frame"""
         self.current_frames.append(frame)
         self.current_detections.append(detections)
+        self.statistics.add(detections)
         
         # Display latest frame
-        self.preview.set_image(frame)
+        with profiler.stage("ui_handoff"):
+            self.preview.set_image(frame)
         
-        # Update stats
-        total = sum(len(d) for d in self.current_detections)
-        self.count_label.setText(f"Objects: {total}")
-        self.class_label.setText(f"Person: {total}")
+        self.update_stats()
+    
+    def poll_preview(self):
+        """Show the worker's newest video frame, if one arrived since the last poll"""
+        worker = self.live_worker if self.is_live else self.worker
+        item = worker.latest_frame.take()
+        if item is None:
+            return
+        rgb, frame, info = item
+        # Video frames are in the frame store; only the latest is kept for snapshots
+        self.current_frames = [frame]
+        with profiler.stage("ui_handoff"):
+            self.preview.set_rgb_image(rgb)
+        self.update_stats(info.get("statistics"))
+        
+        if "captured_at" in info:
+            latency_ms = (time.perf_counter() - info["captured_at"]) * 1000.0
+            self.display_latency_ms = latency_ms if not self.display_latency_ms else (
+                0.8 * self.display_latency_ms + 0.2 * latency_ms
+            )
+    
+    def _stop_preview(self):
+        """Stop polling after showing whatever frame is still waiting"""
+        if self.preview_timer.isActive():
+            self.preview_timer.stop()
+            self.poll_preview()
+    
+    def _reset_statistics(self, name: str):
+        """Start counting a new run"""
+        from src.core.statistics import DetectionStatistics
+        self.statistics = DetectionStatistics()
+        self.statistics_name = name
+        self.save_stats_btn.setEnabled(False)
+        self.update_stats()
+    
+    def update_stats(self, summary: Optional[dict] = None):
+        """Refresh the statistics panel from a DetectionStatistics summary (default: the current one)"""
+        if summary is None:
+            if self.statistics is None:
+                return
+            summary = self.statistics.summary()
+        
+        text = f"Objects: {summary['total']}"
+        if summary["frames"] > 1:
+            text += (
+                f"\nPer frame: {summary['average_per_frame']:.1f} avg, "
+                f"{summary['peak']} peak (frame {summary['peak_frame'] + 1})"
+            )
+        self.count_label.setText(text)
+        classes = summary["classes"]
+        self.class_label.setText("\n".join(f"{name}: {count}" for name, count in classes.items()) or "No detections")
+    
+    def on_threshold_changed(self, _value=None):
+        """Update slider labels and schedule a re-threshold"""
+        self.settings_panel.conf_label.setText(f"{self.settings_panel.conf_slider.value() / 100:.2f}")
+        self.settings_panel.iou_label.setText(f"{self.settings_panel.iou_slider.value() / 100:.2f}")
+        self.threshold_timer.start()
+    
+    def apply_thresholds(self):
+        """Re-filter cached raw candidates with the current sliders, without re-inference"""
+        if self.is_processing or self.candidate_cache is None or not self.current_detections:
+            return
+        
+        settings_dict = self.settings_panel.get_settings()
+        conf, iou = settings_dict["confidence"], settings_dict["iou"]
+        if conf < CANDIDATE_CONFIG["conf_floor"]:
+            return  # Below the cached floor; needs a new detection run
+        
+        self.detector.set_thresholds(conf, iou)
+        start = time.perf_counter()
+        refiltered = self.worker.refilter(conf, iou)
+        if refiltered is None or len(refiltered) != len(self.current_detections):
+            self.preview.set_info("Thresholds will apply on the next detection run (candidates not cached)", "info")
+            return
+        
+        for position, detections in enumerate(refiltered):
+            self.current_detections[position] = detections
+            self.statistics.replace(position, detections)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.update_stats()
+        self.preview.set_info(
+            f"✓ Re-filtered {len(refiltered)} frame(s) at conf {conf:.2f} / IoU {iou:.2f} in {elapsed_ms:.0f} ms",
+            "success",
+        )
+        self.rerender()
     
     @pyqtSlot(list)
     def on_processing_finished(self, frames):
         """Handle processing completion"""
-        self.current_frames = frames
+        self._stop_preview()
+        if frames:
+            self.current_frames = frames
+        # Per-frame detections indexed by frame number (the signal only carried processed frames)
+        self.current_detections = list(self.worker.all_detections)
+        self.statistics = self.worker.statistics
+        self.update_stats()
         self.is_processing = False
         self.process_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -538,9 +880,81 @@ class MainWindow(QMainWindow):
         
         self.save_image_btn.setEnabled(True)
         self.save_video_btn.setEnabled(True)
-        
-        total = sum(len(d) for d in self.current_detections)
-        self.preview.set_info(f"✓ Complete! Detected {total} objects", "success")
+        self.save_stats_btn.setEnabled(True)
+        if self.frame_store is not None:
+            self.preview.set_scrub_range(len(self.frame_store))
+        
+        message = f"✓ Complete! Detected {self.statistics.total} objects"
+        if self.worker.is_video and self.worker.motion_gate is not None:
+            message += f" (motion gate saved {self.worker.motion_gate.saved_fraction:.0%} of inferences)"
+        adaptive = self.detector.adaptive
+        if adaptive is not None and adaptive.changes:
+            message += f" (resolution adapted {len(adaptive.changes)}x, ended at {adaptive.size})"
+        self.preview.set_info(message, "success")
+        
+        if self.rerender_pending:
+            self.rerender()
+    
+    @pyqtSlot()
+    def on_processing_cancelled(self):
+        """Show what a stopped video run counted, without treating it as complete"""
+        self._stop_preview()
+        self.statistics = self.worker.statistics
+        self.update_stats()
+        self.is_processing = False
+        self.rerender_pending = False
+        self.process_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        if self.frame_store is not None:
+            self.preview.set_scrub_range(len(self.frame_store))
+        self.preview.set_info(f"Processing stopped after {self.statistics.frames} frame(s)", "info")
+    
+    @pyqtSlot(dict)
+    def on_pipeline_stats(self, stats):
+        """Show per-stage busy/wait times from the video pipeline"""
+        lines = [
+            f"{name}: busy {s['busy_s']:.1f}s, waiting {s['wait_s']:.1f}s ({s['utilization']:.0%})"
+            for name, s in stats.items()
+        ]
+        self.preview.info_label.setToolTip("\n".join(lines))
+    
+    @pyqtSlot(dict)
+    def on_profile_updated(self, snapshot):
+        """Show live per-stage timings, queue depths and memory"""
+        lines = [f"{snapshot['fps']:.1f} fps, peak {snapshot['memory']['peak_rss_mb']:.0f} MB"]
+        lines += [
+            f"{name[:11]:<11} {s['mean_ms']:6.1f} / {s['p95_ms']:6.1f} ms"
+            for name, s in snapshot["stages"].items()
+        ]
+        lines += [f"{name}: {q['depth']} (max {q['max']})" for name, q in snapshot["queues"].items()]
+        self.profile_label.setText("\n".join(lines))
+        self.profile_label.setToolTip("Stage timings are mean / p95 per frame")
+    
+    @pyqtSlot(dict)
+    def on_live_stats(self, stats):
+        """Show live throughput, latency and dropped frames"""
+        lines = [
+            f"Live: {stats['fps']:.1f} fps (source {stats['source_fps']:.0f})",
+            f"Inference: {stats['inference_ms']:.0f} ms at {stats['input_size']}px",
+            f"Latency: {stats['annotate_latency_ms']:.0f} ms annotated, {self.display_latency_ms:.0f} ms shown",
+            f"Dropped: {stats['dropped']} of {stats['captured']} captured, {stats['preview_dropped']} in preview",
+        ]
+        self.live_label.setText("\n".join(lines))
+    
+    @pyqtSlot()
+    def on_live_finished(self):
+        """Reset the UI after the live source stops"""
+        self._stop_preview()
+        self.is_live = False
+        self.is_processing = False
+        self.statistics = self.live_worker.statistics
+        self.update_stats()
+        self.process_btn.setEnabled(self.current_media_path is not None)
+        self.stop_btn.setEnabled(False)
+        self.save_image_btn.setEnabled(bool(self.current_frames))
+        self.save_stats_btn.setEnabled(self.statistics.frames > 0)
+        self.preview.set_info("Live stream stopped", "info")
     
     @pyqtSlot(int)
     def on_progress(self, value):
@@ -550,6 +964,7 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str)
     def on_error(self, error_msg):
         """Handle processing error"""
+        self._stop_preview()
         self.is_processing = False
         self.process_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -563,6 +978,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "No processed image to save")
             return
         
+        from src.core.media_handler import MediaHandler
         output_path = OUTPUTS_DIR / f"{self.current_media_path.stem}_detected.png"
         try:
             MediaHandler.save_image(self.current_frames[-1], output_path)
@@ -572,17 +988,56 @@ class MainWindow(QMainWindow):
     
     def save_video(self):
         """Save annotated video"""
-        if not self.current_frames:
+        has_store = self.frame_store is not None and len(self.frame_store) > 0
+        if not has_store and not self.current_frames:
             QMessageBox.warning(self, "Error", "No processed video to save")
             return
         
+        from src.core.media_handler import MediaHandler
         output_path = OUTPUTS_DIR / f"{self.current_media_path.stem}_detected.mp4"
         try:
-            MediaHandler.save_video(self.current_frames, output_path)
+            if has_store:
+                MediaHandler.save_video(self.frame_store, output_path, self.frame_store.fps or VIDEO_CONFIG["output_fps"])
+            else:
+                MediaHandler.save_video(self.current_frames, output_path)
             QMessageBox.information(self, "Success", f"Video saved:\n{output_path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save: {str(e)}")
     
+    def save_statistics(self):
+        """Export per-class totals and the per-frame count series as JSON"""
+        if self.statistics is None or self.statistics.frames == 0:
+            QMessageBox.warning(self, "Error", "No statistics to export")
+            return
+        
+        output_path = OUTPUTS_DIR / f"{self.statistics_name}_stats.json"
+        try:
+            self.statistics.save_json(output_path)
+            QMessageBox.information(self, "Success", f"Statistics saved:\n{output_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save: {str(e)}")
+    
+    def _close_frame_store(self):
+        """Delete the frame store of the previous run, if any"""
+        if self.frame_store is not None:
+            self.frame_store.close()
+            self.frame_store = None
+    
+    def on_scrub(self, index: int):
+        """Show a stored frame of the processed video"""
+        if self.is_processing or self.frame_store is None or index >= len(self.frame_store):
+            return
+        frame = self.frame_store[index]
+        self.current_frames = [frame]
+        self.preview.set_image(frame)
+        if self.statistics is not None and index < self.statistics.frames:
+            count = int(self.statistics.series[index])
+            classes = ", ".join(f"{name}: {n}" for name, n in self.statistics.frame_breakdown(index))
+            self.preview.set_info(
+                f"Frame {index + 1}/{len(self.frame_store)}: {count} objects" + (f" ({classes})" if classes else ""),
+                "info",
+            )
+    
     def open_outputs_folder(self):
         """Open outputs folder in explorer"""
         import os
@@ -607,14 +1062,26 @@ class MainWindow(QMainWindow):
         self.settings_panel.show_confidence.setChecked(settings.get("show_confidence", True))
         self.settings_panel.show_count.setChecked(settings.get("show_count", False))
         self.settings_panel.side_by_side.setChecked(settings.get("side_by_side", True))
+        self.settings_panel.tiled.setChecked(settings.get("tiled", False))
+        self.settings_panel.input_size.setCurrentText(str(settings.get("input_size", MODEL_CONFIG["input_size"])))
+        self.settings_panel.latency_budget.setValue(settings.get("latency_budget_ms") or 0)
         self.settings_panel.frame_skip.setValue(settings.get("frame_skip", 1))
+        self.settings_panel.sample_interval.setValue(settings.get("sample_interval_s") or 0.0)
+        self.settings_panel.sampled_only.setChecked(not settings.get("keep_skipped_frames", True))
+        self.settings_panel.interpolate.setChecked(settings.get("interpolate_skipped", True))
+        self.settings_panel.motion_gate.setChecked(settings.get("motion_gate", False))
     
     def closeEvent(self, event):
         """Save settings on close"""
         settings_dict = self.settings_panel.get_settings()
         settings.update(**settings_dict)
         
-        self.worker.stop()
+        if self.worker is not None:
+            self.worker.stop()
+            self.live_worker.stop()
+        # A load in progress cannot be interrupted; let it finish before the thread is destroyed
+        self.model_loader.wait()
+        self._close_frame_store()
         event.accept()
 
 
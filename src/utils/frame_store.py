@@ -0,0 +1,122 @@
+"""Disk-backed Store for Processed Video Frames"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.config import FRAME_STORE_CONFIG
+
+
+class FrameStore:
+    """Append-only sequence of equally sized frames kept in a memory-mapped file
+    
+    Frames live on disk, so memory use does not grow with video length; the
+    operating system pages them in on access. Random access (scrubbing) goes
+    through an LRU of in-memory copies bounded by cache_mb, while iteration
+    (saving) streams frames in order without touching the cache. The file
+    grows chunk_frames at a time and is deleted by close().
+    """
+    
+    def __init__(
+        self,
+        directory: Optional[Path] = FRAME_STORE_CONFIG["directory"],
+        cache_mb: float = FRAME_STORE_CONFIG["cache_mb"],
+        chunk_frames: int = FRAME_STORE_CONFIG["chunk_frames"],
+        fps: Optional[float] = None,
+    ):
+        fd, path = tempfile.mkstemp(prefix="frames_", suffix=".raw", dir=directory)
+        os.close(fd)
+        self.path = Path(path)
+        self.cache_budget = int(cache_mb * 1024 * 1024)
+        self.chunk_frames = max(1, chunk_frames)
+        self.fps = fps
+        self.frame_shape: Optional[Tuple[int, ...]] = None
+        self._map: Optional[np.memmap] = None
+        self._capacity = 0
+        self._count = 0
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __enter__(self) -> "FrameStore":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes of frame data on disk"""
+        return self._count * int(np.prod(self.frame_shape)) if self.frame_shape else 0
+    
+    def append(self, frame: np.ndarray) -> int:
+        """Copy frame to disk and return its index"""
+        with self._lock:
+            if self.frame_shape is None:
+                self.frame_shape = frame.shape
+            elif frame.shape != self.frame_shape:
+                raise ValueError(f"Frame shape {frame.shape} does not match store shape {self.frame_shape}")
+            
+            if self._count == self._capacity:
+                self._grow()
+            self._map[self._count] = frame
+            self._count += 1
+            return self._count - 1
+    
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Frame at index (negative indices count from the end); do not modify the result"""
+        with self._lock:
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError(f"Frame index {index} out of range ({self._count} frames)")
+            
+            frame = self._cache.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+                return frame
+            
+            frame = np.array(self._map[index])
+            self._cache[index] = frame
+            self._cache_bytes += frame.nbytes
+            while self._cache_bytes > self.cache_budget and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+            return frame
+    
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Stream frames in order, bypassing the LRU"""
+        for index in range(self._count):
+            with self._lock:
+                frame = np.array(self._map[index])
+            yield frame
+    
+    def close(self) -> None:
+        """Release the mapping and delete the backing file"""
+        with self._lock:
+            self._map = None
+            self._cache.clear()
+            self._cache_bytes = 0
+            self._count = 0
+            self._capacity = 0
+            self.path.unlink(missing_ok=True)
+    
+    def _grow(self) -> None:
+        """Extend the file by one chunk and remap it"""
+        if self._map is not None:
+            self._map.flush()
+            self._map = None  # Unmap before resizing (required on Windows)
+        
+        self._capacity += self.chunk_frames
+        frame_bytes = int(np.prod(self.frame_shape))
+        with open(self.path, "r+b") as f:
+            f.truncate(self._capacity * frame_bytes)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(self._capacity, *self.frame_shape))
@@ -0,0 +1,51 @@
+"""Background Model Loading"""
+import time
+from pathlib import Path
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.config import MODEL_PATH
+
+
+class ModelLoader(QThread):
+    """Import the inference stack, load the detector and warm it up off the GUI thread
+    
+    Importing ultralytics/torch/OpenCV and the first forward pass take
+    seconds, so the window is shown first and this thread does the rest.
+    The modules imported here are then cached for the UI's deferred imports.
+    """
+    
+    loaded = pyqtSignal(object, dict)  # (AerialDetector, {"import_s", "load_s", "warmup_s"})
+    failed = pyqtSignal(str)
+    
+    def __init__(self, model_path: Path = MODEL_PATH):
+        super().__init__()
+        self.model_path = model_path
+    
+    def run(self):
+        try:
+            start = time.perf_counter()
+            import numpy as np
+            import ultralytics  # noqa: F401  Imports torch; the bulk of the import time
+            from src.core.detector import AerialDetector
+            import src.utils.worker  # noqa: F401  Workers, media handling and OpenCV, used right after
+            imported = time.perf_counter()
+            
+            if not self.model_path.exists():
+                raise FileNotFoundError(f"Model not found: {self.model_path}")
+            detector = AerialDetector(self.model_path)
+            loaded = time.perf_counter()
+            
+            # The first call builds the predictor and fuses layers; pay for it now
+            size = detector.input_size
+            detector.detect(np.zeros((size, size, 3), dtype=np.uint8), imgsz=size)
+            warmed = time.perf_counter()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        
+        self.loaded.emit(detector, {
+            "import_s": imported - start,
+            "load_s": loaded - imported,
+            "warmup_s": warmed - loaded,
+        })
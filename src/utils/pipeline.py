@@ -0,0 +1,204 @@
+"""Threaded Stage Pipeline"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_END = object()  # Marks the end of a stage's output
+
+
+class StageStats:
+    """Busy and wait time accumulated by one pipeline stage"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.wait_time = 0.0  # Blocked on an empty input or full output queue
+        self.total_time = 0.0
+    
+    @property
+    def busy_time(self) -> float:
+        return max(0.0, self.total_time - self.wait_time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "busy_s": self.busy_time,
+            "wait_s": self.wait_time,
+            "utilization": self.busy_time / self.total_time if self.total_time > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    """Chain of generator stages, each on its own thread, joined by bounded queues
+    
+    The source is a callable returning an iterable. Every other stage is a
+    callable that takes an iterable of upstream items and returns an iterable
+    of downstream items, so stages may batch, reorder or drop items freely.
+    Full queues block the producer (backpressure); stop() unblocks everything.
+    """
+    
+    def __init__(self, queue_size: int = 4, poll_interval: float = 0.05):
+        self.queue_size = max(1, queue_size)
+        self.poll_interval = poll_interval
+        self._source: Optional[Callable[[], Iterable]] = None
+        self._stages: List[tuple] = []  # (name, fn)
+        self._stats: Dict[str, StageStats] = {}
+        self._queues: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._error: Optional[BaseException] = None
+    
+    def set_source(self, name: str, fn: Callable[[], Iterable]) -> "Pipeline":
+        """Set the first stage, which produces items without input"""
+        self._source = fn
+        self._stats[name] = StageStats(name)
+        self._source_name = name
+        return self
+    
+    def add_stage(self, name: str, fn: Callable[[Iterable], Iterable]) -> "Pipeline":
+        """Append a transform stage"""
+        self._stages.append((name, fn))
+        self._stats[name] = StageStats(name)
+        return self
+    
+    def run(self) -> Iterator[Any]:
+        """Start all stages and yield the last stage's output on the calling thread"""
+        if self._source is None:
+            raise ValueError("Pipeline has no source")
+        
+        self._stop_event.clear()
+        self._error = None
+        self._queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self._stages) + 1)]
+        self._threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(self._source_name, lambda _: self._source(), None, self._queues[0]),
+                daemon=True,
+            )
+        ]
+        for i, (name, fn) in enumerate(self._stages):
+            self._threads.append(threading.Thread(
+                target=self._run_stage,
+                args=(name, fn, self._queues[i], self._queues[i + 1]),
+                daemon=True,
+            ))
+        
+        for thread in self._threads:
+            thread.start()
+        
+        try:
+            while True:
+                item = self._get(self._queues[-1], None)
+                if item is _END:
+                    break
+                yield item
+        finally:
+            self.stop()
+            self.join()
+        
+        if self._error is not None:
+            raise self._error
+    
+    def stop(self) -> None:
+        """Ask every stage to finish as soon as possible"""
+        self._stop_event.set()
+    
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for stage threads to exit"""
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+    
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage item counts, busy and wait seconds"""
+        return {name: stage.to_dict() for name, stage in self._stats.items()}
+    
+    def queue_depths(self) -> List[int]:
+        """Current number of items in each inter-stage queue"""
+        return [q.qsize() for q in self._queues]
+    
+    def named_queue_depths(self) -> Dict[str, int]:
+        """Queue depths keyed "producer->consumer"; the last queue feeds the caller ("output")"""
+        names = [self._source_name] + [name for name, _ in self._stages] + ["output"]
+        return {f"{names[i]}->{names[i + 1]}": q.qsize() for i, q in enumerate(self._queues)}
+    
+    def _run_stage(self, name: str, fn: Callable, in_queue: Optional[queue.Queue], out_queue: queue.Queue):
+        """Thread body: feed the stage from in_queue and push its output to out_queue"""
+        stats = self._stats[name]
+        start = time.perf_counter()
+        inputs = self._iter_queue(in_queue, stats) if in_queue is not None else None
+        outputs = None
+        
+        try:
+            outputs = iter(fn(inputs))
+            while not self._stop_event.is_set():
+                try:
+                    item = next(outputs)
+                except StopIteration:
+                    break
+                stats.items += 1
+                if not self._put(out_queue, item, stats):
+                    break
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+            self._stop_event.set()
+        finally:
+            # Closing a generator runs its cleanup (release captures, writers, ...)
+            close = getattr(outputs, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+            stats.total_time = time.perf_counter() - start
+            self._put(out_queue, _END, None, force=True)
+    
+    def _iter_queue(self, in_queue: queue.Queue, stats: StageStats) -> Iterator[Any]:
+        """Yield items from in_queue until the upstream end marker or stop"""
+        while True:
+            item = self._get(in_queue, stats)
+            if item is _END:
+                return
+            yield item
+    
+    def _get(self, q: queue.Queue, stats: Optional[StageStats]) -> Any:
+        """Blocking get that gives up when the pipeline is stopped"""
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return q.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    if self._stop_event.is_set():
+                        return _END
+        finally:
+            if stats is not None:
+                stats.wait_time += time.perf_counter() - start
+    
+    def _put(self, q: queue.Queue, item: Any, stats: Optional[StageStats], force: bool = False) -> bool:
+        """Blocking put; returns False if the pipeline was stopped first"""
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    q.put(item, timeout=self.poll_interval)
+                    return True
+                except queue.Full:
+                    if self._stop_event.is_set():
+                        if force:
+                            # Drop the oldest item so the end marker always fits
+                            try:
+                                q.get_nowait()
+                            except queue.Empty:
+                                pass
+                            continue
+                        return False
+        finally:
+            if stats is not None:
+                stats.wait_time += time.perf_counter() - start
@@ -0,0 +1,112 @@
+"""Coalescing Preview Channel between the Worker and the UI"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import UI_CONFIG
+
+
+def to_preview_rgb(
+    frame: np.ndarray,
+    max_width: int = UI_CONFIG["preview_max_width"],
+    max_height: int = UI_CONFIG["preview_max_height"],
+) -> np.ndarray:
+    """Downscale a BGR frame to fit the preview and convert it to contiguous RGB"""
+    h, w = frame.shape[:2]
+    if w > max_width or h > max_height:
+        scale = min(max_width / w, max_height / h)
+        frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+class LatestFrame:
+    """Single-slot mailbox holding only the newest preview frame
+    
+    The producer publishes every frame it likes; the consumer polls at its
+    own rate and gets the newest one, so frames published in between are
+    dropped instead of queuing up. Preview downscaling and color conversion
+    happen on the producer's thread, at most max_fps times a second; call
+    flush() after the last frame so it is not held back.
+    """
+    
+    def __init__(
+        self,
+        max_width: int = UI_CONFIG["preview_max_width"],
+        max_height: int = UI_CONFIG["preview_max_height"],
+        max_fps: float = UI_CONFIG["preview_fps"],
+    ):
+        self.max_width = max_width
+        self.max_height = max_height
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._lock = threading.Lock()
+        self._item: Optional[Tuple[np.ndarray, np.ndarray, Dict[str, Any]]] = None
+        self._pending: Optional[Tuple[np.ndarray, Dict[str, Any]]] = None
+        self._last_convert = 0.0
+        self.published = 0
+        self.taken = 0
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._item = None
+            self._pending = None
+            self._last_convert = 0.0
+            self.published = 0
+            self.taken = 0
+    
+    def publish(self, frame: np.ndarray, info: Optional[Dict[str, Any]] = None) -> None:
+        """Offer frame for display; info travels along (e.g. running detection counts)"""
+        now = time.perf_counter()
+        if now - self._last_convert < self.min_interval:
+            # Too soon to be shown; keep it only in case it turns out to be the last frame
+            self._pending = (frame, info or {})
+            return
+        self._last_convert = now
+        self._store(frame, info or {})
+    
+    def flush(self) -> None:
+        """Make a frame held back by the rate limit available"""
+        if self._pending is not None:
+            frame, info = self._pending
+            self._store(frame, info)
+    
+    def _store(self, frame: np.ndarray, info: Dict[str, Any]) -> None:
+        preview = to_preview_rgb(frame, self.max_width, self.max_height)
+        with self._lock:
+            self._item = (preview, frame, info)
+            self._pending = None
+            self.published += 1
+    
+    def take(self) -> Optional[Tuple[np.ndarray, np.ndarray, Dict[str, Any]]]:
+        """(preview RGB, full-size frame, info) if a frame arrived since the last take, else None"""
+        with self._lock:
+            item, self._item = self._item, None
+            if item is not None:
+                self.taken += 1
+            return item
+    
+    @property
+    def dropped(self) -> int:
+        """Converted previews that were replaced before the consumer saw them"""
+        return self.published - self.taken
+
+
+class ProgressThrottle:
+    """Let a percentage through only when it changed and min_interval has passed (100 always passes)"""
+    
+    def __init__(self, min_interval: float = UI_CONFIG["progress_interval_ms"] / 1000.0):
+        self.min_interval = min_interval
+        self.last_value = -1
+        self.last_time = 0.0
+    
+    def update(self, value: int) -> bool:
+        if value == self.last_value:
+            return False
+        now = time.perf_counter()
+        if value < 100 and now - self.last_time < self.min_interval:
+            return False
+        self.last_value = value
+        self.last_time = now
+        return True
@@ -0,0 +1,270 @@
+"""Per-stage Profiling and Metrics Export"""
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.config import PROFILING_CONFIG
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimings:
+    """Ring buffer of the most recent per-frame timings of one stage, plus running totals"""
+    
+    def __init__(self, window: int):
+        self.samples = np.zeros(max(1, window), dtype=np.float64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float, count: int = 1) -> None:
+        """Add count frames that together took seconds"""
+        per_frame = seconds / count
+        window = len(self.samples)
+        for i in range(self.count, self.count + min(count, window)):
+            self.samples[i % window] = per_frame
+        self.count += count
+        self.total += seconds
+        self.max = max(self.max, per_frame)
+    
+    def summary(self) -> Dict[str, float]:
+        recent = self.samples[:min(self.count, len(self.samples))]
+        p50, p95 = np.percentile(recent, [50, 95]) if len(recent) else (0.0, 0.0)
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50_ms": float(p50) * 1000.0,
+            "p95_ms": float(p95) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+
+class _StageTimer:
+    """Context manager recording the time spent inside it"""
+    
+    __slots__ = ("profiler", "name", "count", "start")
+    
+    def __init__(self, profiler: "Profiler", name: str, count: int):
+        self.profiler = profiler
+        self.name = name
+        self.count = count
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start, self.count)
+        return False
+
+
+class _NullTimer:
+    """Shared do-nothing context manager handed out while profiling is off"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """Collect per-frame stage timings, queue depths and memory high-water marks
+    
+    Instrumented code calls timer()/record_since() or uses stage() as a
+    context manager. While disabled these return immediately without reading
+    the clock, so the hooks can stay in hot loops. Results are available from
+    snapshot() and, if a path is configured, as a Prometheus text file.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = PROFILING_CONFIG["enabled"],
+        window: int = PROFILING_CONFIG["window"],
+        prometheus_path: Optional[Path] = PROFILING_CONFIG["prometheus_path"],
+        export_interval: float = PROFILING_CONFIG["export_interval_s"],
+    ):
+        self.enabled = enabled
+        self.window = window
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.export_interval = export_interval
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Drop all collected data and restart the clock"""
+        with self._lock:
+            self._stages: Dict[str, StageTimings] = {}
+            self._queues: Dict[str, Dict[str, int]] = {}
+            self._rss = 0
+            self._peak_rss = 0
+            self._process_peak_rss = 0
+            self._frames = 0
+            self._started = time.perf_counter()
+            self._last_memory_sample = 0.0
+            self._last_export = 0.0
+    
+    def timer(self) -> float:
+        """Start time for record_since(), or 0.0 while disabled"""
+        return time.perf_counter() if self.enabled else 0.0
+    
+    def record_since(self, stage: str, start: float, count: int = 1) -> None:
+        """Record the time since a timer() value for count frames"""
+        if self.enabled and start:
+            self.record(stage, time.perf_counter() - start, count)
+    
+    def record(self, stage: str, seconds: float, count: int = 1) -> None:
+        """Record that count frames spent seconds in stage"""
+        if not self.enabled or count <= 0:
+            return
+        with self._lock:
+            timings = self._stages.get(stage)
+            if timings is None:
+                timings = self._stages[stage] = StageTimings(self.window)
+            timings.add(seconds, count)
+    
+    def stage(self, name: str, count: int = 1):
+        """Context manager timing its body as one stage sample of count frames"""
+        return _StageTimer(self, name, count) if self.enabled else _NULL_TIMER
+    
+    def sample_queues(self, depths: Dict[str, int]) -> None:
+        """Record current queue depths and keep the per-queue maximum"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, depth in depths.items():
+                entry = self._queues.setdefault(name, {"depth": 0, "max": 0})
+                entry["depth"] = depth
+                entry["max"] = max(entry["max"], depth)
+    
+    def frame_done(self) -> None:
+        """Count a finished frame; samples memory and exports metrics at their own intervals"""
+        if not self.enabled:
+            return
+        self._frames += 1
+        
+        now = time.perf_counter()
+        if now - self._last_memory_sample >= 0.25:
+            self._last_memory_sample = now
+            self.sample_memory()
+        if self.prometheus_path and now - self._last_export >= self.export_interval:
+            self._last_export = now
+            self.export_prometheus()
+    
+    def sample_memory(self) -> None:
+        """Update current resident set size, the peak since reset() and the process-lifetime peak
+        
+        The run peak is the highest sampled RSS, so short spikes between samples
+        can be missed; the OS-reported peak covers the whole process, including
+        earlier runs and model loading.
+        """
+        rss = _current_rss()
+        process_peak = _process_peak_rss()
+        with self._lock:
+            self._rss = rss
+            self._peak_rss = max(self._peak_rss, rss)
+            self._process_peak_rss = max(self._process_peak_rss, process_peak, rss)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of everything collected so far"""
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            return {
+                "enabled": self.enabled,
+                "elapsed_s": elapsed,
+                "frames": self._frames,
+                "fps": self._frames / elapsed if elapsed > 0 else 0.0,
+                "stages": {name: t.summary() for name, t in self._stages.items()},
+                "queues": {name: dict(q) for name, q in self._queues.items()},
+                "memory": {
+                    "rss_mb": self._rss / 2**20,
+                    "peak_rss_mb": self._peak_rss / 2**20,
+                    "process_peak_rss_mb": self._process_peak_rss / 2**20,
+                },
+            }
+    
+    def to_prometheus(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Render a snapshot in the Prometheus text exposition format"""
+        snap = snapshot or self.snapshot()
+        lines = [
+            "# HELP aerial_stage_seconds Per-frame time spent in each processing stage",
+            "# TYPE aerial_stage_seconds summary",
+        ]
+        for stage, s in snap["stages"].items():
+            lines.append(f'aerial_stage_seconds{{stage="{stage}",quantile="0.5"}} {s["p50_ms"] / 1000.0:.6f}')
+            lines.append(f'aerial_stage_seconds{{stage="{stage}",quantile="0.95"}} {s["p95_ms"] / 1000.0:.6f}')
+            lines.append(f'aerial_stage_seconds_sum{{stage="{stage}"}} {s["total_s"]:.6f}')
+            lines.append(f'aerial_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        
+        lines += ["# HELP aerial_queue_depth Items waiting between pipeline stages", "# TYPE aerial_queue_depth gauge"]
+        lines += [f'aerial_queue_depth{{queue="{name}"}} {q["depth"]}' for name, q in snap["queues"].items()]
+        lines += ["# HELP aerial_queue_depth_max Highest queue depth seen", "# TYPE aerial_queue_depth_max gauge"]
+        lines += [f'aerial_queue_depth_max{{queue="{name}"}} {q["max"]}' for name, q in snap["queues"].items()]
+        
+        lines += [
+            "# HELP aerial_frames_total Frames that completed the pipeline",
+            "# TYPE aerial_frames_total counter",
+            f"aerial_frames_total {snap['frames']}",
+            "# HELP aerial_memory_rss_bytes Resident set size",
+            "# TYPE aerial_memory_rss_bytes gauge",
+            f"aerial_memory_rss_bytes {int(snap['memory']['rss_mb'] * 2**20)}",
+            "# HELP aerial_memory_peak_rss_bytes Highest sampled resident set size since the last reset",
+            "# TYPE aerial_memory_peak_rss_bytes gauge",
+            f"aerial_memory_peak_rss_bytes {int(snap['memory']['peak_rss_mb'] * 2**20)}",
+            "# HELP aerial_memory_process_peak_rss_bytes Resident set size high-water mark over the process lifetime",
+            "# TYPE aerial_memory_process_peak_rss_bytes gauge",
+            f"aerial_memory_process_peak_rss_bytes {int(snap['memory']['process_peak_rss_mb'] * 2**20)}",
+        ]
+        return "\n".join(lines) + "\n"
+    
+    def export_prometheus(self, path: Optional[Path] = None) -> Optional[Path]:
+        """Atomically write metrics so a collector never reads a partial file"""
+        path = Path(path) if path else self.prometheus_path
+        if path is None:
+            return None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(path.suffix + ".tmp")
+            temp.write_text(self.to_prometheus())
+            os.replace(temp, path)
+        except OSError as e:
+            logger.warning("Error writing metrics to %s: %s", path, e)
+            return None
+        return path
+
+
+def _current_rss() -> int:
+    """Resident set size in bytes (Linux /proc; 0 where unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _process_peak_rss() -> int:
+    """Peak resident set size in bytes over the process lifetime, as reported by the OS"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Process-wide profiler used by the detector, media handler and worker
+profiler = Profiler()
@@ -1,28 +1,52 @@
 """Processing Worker Thread"""
+import time
 import cv2
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal
 
-from src.core.detector import AerialDetector, Detection
+from src.config import VIDEO_CONFIG, PROFILING_CONFIG, LIVE_CONFIG
+from src.core.candidate_cache import CandidateCache
+from src.core.detector import AerialDetector, Detection, Detections
+from src.core.live_source import LiveSource
 from src.core.media_handler import MediaHandler
+from src.core.motion import MotionGate
+from src.core.statistics import DetectionStatistics
+from src.core.tracker import IoUTracker
+from src.utils.pipeline import Pipeline
+from src.utils.preview import LatestFrame, ProgressThrottle
+from src.utils.profiling import profiler
 
 
 class ProcessingWorker(QThread):
     """Background worker for image/video processing"""
     
-    progress = pyqtSignal(int)  # 0-100
-    frame_processed = pyqtSignal(object, list)  # (frame_image, detections)
+    progress = pyqtSignal(int)  # 0-100, throttled for videos
+    frame_processed = pyqtSignal(object, object)  # (frame_image, Detections); stills only, videos use latest_frame
     finished = pyqtSignal(list)  # all_frames
+    cancelled = pyqtSignal()  # Video run stopped before the end; all_detections holds the partial run
     error = pyqtSignal(str)
+    pipeline_stats = pyqtSignal(dict)  # stage name -> busy/wait seconds
+    profile_updated = pyqtSignal(dict)  # Profiler.snapshot(), while profiling is enabled
     
-    def __init__(self, detector: AerialDetector):
+    def __init__(self, detector: AerialDetector, candidate_cache: Optional[CandidateCache] = None):
         super().__init__()
         self.detector = detector
+        self.candidate_cache = candidate_cache  # Raw candidates for re-thresholding
+        self.all_detections: List[Detections] = []  # Per-frame detections of the last run
+        # (source frame index, "infer" / "reuse" / "skip") of each entry in all_detections
+        self.frame_schedule: List[Tuple[int, str]] = []
+        self.tracked = False  # Whether the last run filled skipped frames with a tracker
+        self.media_key: Optional[str] = None  # Candidate cache key of the last run; None if it bypassed the cache
+        self.render_detections: Optional[List[Detections]] = None  # Set for render-only runs
         self.is_running = True
         self.media_path: Optional[Path] = None
         self.is_video = False
         self.settings = {}
+        self.pipeline: Optional[Pipeline] = None
+        self.motion_gate: Optional[MotionGate] = None  # Last video run's gate, for its stats
+        self.latest_frame = LatestFrame()  # Newest annotated video frame, polled by the UI
+        self.statistics = DetectionStatistics()  # Counts of the last run, updated per frame
     
     def set_media(self, media_path: Path, is_video: bool = False):
         """Set media to process"""
@@ -33,8 +57,22 @@ class ProcessingWorker(QThread):
         """Set processing settings"""
         self.settings.update(kwargs)
     
+    def set_render_only(self, detections: Optional[List[Detections]]):
+        """Redraw the next run from stored per-frame detections instead of running the model
+        
+        Raw frames are re-decoded from the media file, so only drawing and
+        encoding are paid for. Applies to one run; None disables it.
+        """
+        self.render_detections = detections
+    
     def run(self):
         """Run processing"""
+        self.is_running = True
+        self.all_detections = []
+        self.statistics = DetectionStatistics()
+        self.latest_frame.clear()
+        profiler.enabled = self.settings.get("profiling", PROFILING_CONFIG["enabled"])
+        profiler.reset()
         try:
             if not self.media_path:
                 self.error.emit("No media selected")
@@ -47,24 +85,43 @@ class ProcessingWorker(QThread):
         
         except Exception as e:
             self.error.emit(f"Processing error: {str(e)}")
+        
+        finally:
+            self.render_detections = None
+            if profiler.enabled:
+                self.profile_updated.emit(profiler.snapshot())
+                profiler.export_prometheus()
     
     def _process_image(self):
         """Process single image"""
         try:
             image = MediaHandler.load_image(self.media_path)
-            detections = self.detector.detect(image)
+            if self.render_detections:
+                detections = self.render_detections[0]
+            elif self.settings.get("tiled", False):
+                self.media_key = None
+                detections = self.detector.detect_tiled(image)
+            elif self.candidate_cache is not None:
+                self.media_key = CandidateCache.media_key(self.media_path, self.detector)
+                detections = self.candidate_cache.detect(self.detector, self.media_key, [(0, image)])[0]
+            else:
+                self.media_key = None
+                detections = self.detector.detect(image)
+            self.all_detections = [detections]
+            if not self.render_detections:
+                self.frame_schedule = [(0, "infer")]
+                self.tracked = False
+            self.statistics.add(detections)
             
-            annotated = self.detector.draw_detections(
+            annotated = MediaHandler.annotate_frame(
                 image,
                 detections,
                 show_boxes=self.settings.get("show_boxes", True),
                 show_labels=self.settings.get("show_labels", True),
                 show_confidence=self.settings.get("show_confidence", True),
+                show_count=self.settings.get("show_count", False),
             )
             
-            if self.settings.get("show_count", False):
-                annotated = MediaHandler.add_count_overlay(annotated, detections)
-            
             self.frame_processed.emit(annotated, detections)
             self.progress.emit(100)
             self.finished.emit([annotated])
@@ -73,46 +130,283 @@ class ProcessingWorker(QThread):
             self.error.emit(f"Image processing failed: {str(e)}")
     
     def _process_video(self):
-        """Process video frames"""
+        """Process video frames
+        
+        Decode, inference, render and encode run as separate pipeline stages
+        connected by bounded queues, so they overlap. Annotated frames are not
+        emitted one by one: latest_frame keeps only the newest, scaled for the
+        preview at display rate, for the UI to poll. When an "output_path"
+        setting is given, annotated frames are streamed to that file, and with
+        a "frame_store" setting they are appended to that FrameStore; either
+        way they are not kept in memory and finished emits an empty list.
+        A run ended by stop() emits cancelled instead of finished.
+        Without "keep_skipped_frames" only sampled frames are decoded and
+        output. In render-only mode the inference stage is replaced by a
+        lookup of stored detections.
+        """
+        cap = None
         try:
             cap, metadata = MediaHandler.load_video(self.media_path)
+            output_path = self.settings.get("output_path")
+            frame_store = self.settings.get("frame_store")
+            fps = metadata["fps"] or VIDEO_CONFIG["output_fps"]
+            frame_skip = MediaHandler.sampling_stride(
+                fps,
+                self.settings.get("frame_skip", 1),
+                self.settings.get("sample_interval_s", VIDEO_CONFIG["sample_interval_s"]),
+            )
+            if self.settings.get("keep_skipped_frames", VIDEO_CONFIG["keep_skipped_frames"]):
+                source = MediaHandler.iter_frames(cap)
+            else:
+                # Only sampled frames are decoded and output, at a frame rate that keeps the duration
+                source = MediaHandler.sample_frames(cap, frame_skip)
+                fps /= frame_skip
+                frame_skip = 1
+            if frame_store is not None:
+                frame_store.fps = fps
             frames = []
-            frame_count = 0
-            frame_skip = self.settings.get("frame_skip", 1)
+            interpolate = self.settings.get("interpolate_skipped", VIDEO_CONFIG["interpolate_skipped"])
+            render_only = self.render_detections is not None
+            if not render_only:
+                use_gate = self.settings.get("motion_gate", VIDEO_CONFIG["motion_gate"])
+                self.motion_gate = MotionGate() if use_gate else None
+                # Render-only runs keep the schedule and cache key of the run they redraw
+                self.frame_schedule = []
+                self.tracked = interpolate
+                # Adaptive resolution changes the input size mid-run, which one cache key cannot describe
+                use_cache = self.candidate_cache is not None and self.detector.adaptive is None
+                self.media_key = CandidateCache.media_key(self.media_path, self.detector) if use_cache else None
             
-            while self.is_running:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                frame_count += 1
+            def decode():
+                yield from source
+            
+            def infer(items):
+                return MediaHandler.detect_frames(
+                    items,
+                    self.detector,
+                    frame_skip=frame_skip,
+                    batch_size=self.settings.get("batch_size", VIDEO_CONFIG["batch_size"]),
+                    tracker=IoUTracker() if interpolate else None,
+                    motion_gate=self.motion_gate,
+                    candidate_cache=self.candidate_cache if self.media_key is not None else None,
+                    media_key=self.media_key,
+                )
+            
+            def lookup(items):
+                # Stored detections are per output frame, which is not the frame index when sampling
+                stored = self.render_detections
+                for position, (index, frame) in enumerate(items):
+                    detections = stored[position] if position < len(stored) else Detections()
+                    yield index, frame, detections, True
+            
+            def render(items):
+                for index, frame, detections, inferred in items:
+                    if inferred or len(detections):
+                        frame = MediaHandler.annotate_frame(
+                            frame,
+                            detections,
+                            show_boxes=self.settings.get("show_boxes", True),
+                            show_labels=self.settings.get("show_labels", True),
+                            show_confidence=self.settings.get("show_confidence", True),
+                            show_count=self.settings.get("show_count", False),
+                            inplace=True,
+                        )
+                    yield index, frame, detections, inferred
+            
+            def encode(items):
+                writer = None
+                try:
+                    for item in items:
+                        frame = item[1]
+                        if frame_store is not None:
+                            start = profiler.timer()
+                            frame_store.append(frame)
+                            profiler.record_since("encode", start)
+                        elif output_path:
+                            if writer is None:
+                                writer = MediaHandler.open_video_writer(Path(output_path), frame.shape, fps)
+                            start = profiler.timer()
+                            writer.write(frame)
+                            profiler.record_since("encode", start)
+                        else:
+                            frames.append(frame)
+                        yield item
+                finally:
+                    # Close the file before the pipeline ends so readers see a complete video
+                    if writer is not None:
+                        writer.release()
+            
+            self.pipeline = (
+                Pipeline(queue_size=self.settings.get("queue_size", VIDEO_CONFIG["queue_size"]))
+                .set_source("decode", decode)
+                .add_stage("lookup" if render_only else "inference", lookup if render_only else infer)
+                .add_stage("render", render)
+                .add_stage("encode", encode)
+            )
+            
+            last_emit = 0.0
+            throttle = ProgressThrottle()
+            for index, frame, detections, inferred in self.pipeline.run():
+                if not self.is_running:
+                    self.pipeline.stop()
+                    continue
                 
-                if frame_count % frame_skip == 0:
-                    detections = self.detector.detect(frame)
-                    annotated = self.detector.draw_detections(
-                        frame,
-                        detections,
-                        show_boxes=self.settings.get("show_boxes", True),
-                        show_labels=self.settings.get("show_labels", True),
-                        show_confidence=self.settings.get("show_confidence", True),
-                    )
-                    
-                    if self.settings.get("show_count", False):
-                        annotated = MediaHandler.add_count_overlay(annotated, detections)
-                    
-                    frames.append(annotated)
-                    self.frame_processed.emit(annotated, detections)
-                else:
-                    frames.append(frame)
+                self.all_detections.append(detections)
+                if not render_only:
+                    mode = "infer" if inferred else "reuse" if (index + 1) % frame_skip == 0 else "skip"
+                    self.frame_schedule.append((index, mode))
+                self.statistics.add(detections)
+                if inferred or len(detections):
+                    self.latest_frame.publish(frame, {"frames": index + 1, "statistics": self.statistics.summary()})
+                if metadata["total_frames"] > 0:
+                    percent = min(100, int(((index + 1) / metadata["total_frames"]) * 100))
+                    if throttle.update(percent):
+                        self.progress.emit(percent)
                 
-                progress = int((frame_count / metadata["total_frames"]) * 100)
-                self.progress.emit(progress)
+                if profiler.enabled:
+                    profiler.sample_queues(self.pipeline.named_queue_depths())
+                    profiler.frame_done()
+                    now = time.perf_counter()
+                    if now - last_emit >= PROFILING_CONFIG["emit_interval_s"]:
+                        last_emit = now
+                        self.profile_updated.emit(profiler.snapshot())
             
-            cap.release()
-            self.finished.emit(frames)
+            self.latest_frame.flush()
+            self.pipeline_stats.emit(self.pipeline.stats())
+            if self.is_running:
+                self.finished.emit(frames)
+            else:
+                # A partial run must not look complete to the UI
+                self.cancelled.emit()
         
         except Exception as e:
             self.error.emit(f"Video processing failed: {str(e)}")
+        
+        finally:
+            # Released here, not in the decode stage, which never starts if the run stops first
+            if cap is not None:
+                cap.release()
+    
+    def refilter(self, conf: float, iou: float) -> Optional[List[Detections]]:
+        """Per-frame detections of the last run at new thresholds, from cached candidates
+        
+        Keyframes are re-filtered and the frames derived from them (tracked or
+        reused by the motion gate) are rebuilt from the new keyframes. Returns
+        None when the run bypassed the cache or a keyframe has been evicted.
+        """
+        if self.candidate_cache is None or self.media_key is None or not self.frame_schedule:
+            return None
+        keyframes = self.candidate_cache.refilter(self.media_key, conf, iou)
+        if any(mode == "infer" and index not in keyframes for index, mode in self.frame_schedule):
+            return None
+        
+        tracker = IoUTracker() if self.tracked else None
+        return MediaHandler.replay_detections(self.frame_schedule, keyframes, tracker)
+    
+    def stop(self):
+        """Stop processing"""
+        self.is_running = False
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        self.wait()
+
+
+class LiveWorker(QThread):
+    """Background worker running detection on a live camera or stream
+    
+    Each iteration takes the newest captured frame, so frames that arrive
+    while the model is busy are dropped rather than queued. Annotated frames
+    go to latest_frame with their capture time, for the UI to poll and
+    measure capture-to-display latency.
+    """
+    
+    live_stats = pyqtSignal(dict)  # fps, inference and capture-to-annotation latency, drop counts
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    
+    def __init__(self, detector: AerialDetector):
+        super().__init__()
+        self.detector = detector
+        self.source: Optional[LiveSource] = None
+        self.latest_frame = LatestFrame()
+        self.statistics = DetectionStatistics()  # Counts since the source was started
+        self.is_running = True
+        self.settings = {}
+    
+    def set_source(self, source):
+        """Device index, stream URL or video file replayed at native rate"""
+        self.source = LiveSource(source)
+    
+    def set_settings(self, **kwargs):
+        """Set processing settings"""
+        self.settings.update(kwargs)
+    
+    def run(self):
+        """Detect on the newest frame until stopped or the source ends"""
+        self.is_running = True
+        self.latest_frame.clear()
+        self.statistics = DetectionStatistics()
+        try:
+            self.source.start()
+        except ValueError as e:
+            self.error.emit(str(e))
+            return
+        
+        # Averages cover the frames since the last stats emit
+        processed = window = 0
+        inference_s = latency_s = 0.0
+        last_emit = time.perf_counter()
+        try:
+            while self.is_running and self.source.running:
+                item = self.source.read(timeout=0.5)
+                if item is None:
+                    continue
+                _, captured_at, frame = item
+                
+                start = time.perf_counter()
+                detections = self.detector.detect(frame)
+                inference_s += time.perf_counter() - start
+                
+                frame = MediaHandler.annotate_frame(
+                    frame,
+                    detections,
+                    show_boxes=self.settings.get("show_boxes", True),
+                    show_labels=self.settings.get("show_labels", True),
+                    show_confidence=self.settings.get("show_confidence", True),
+                    show_count=self.settings.get("show_count", False),
+                    inplace=True,
+                )
+                self.statistics.add(detections)
+                self.latest_frame.publish(frame, {"captured_at": captured_at, "statistics": self.statistics.summary()})
+                processed += 1
+                window += 1
+                latency_s += time.perf_counter() - captured_at
+                
+                now = time.perf_counter()
+                if now - last_emit >= LIVE_CONFIG["stats_interval_s"]:
+                    self.live_stats.emit({
+                        **self.source.stats(),
+                        "processed": processed,
+                        "fps": window / (now - last_emit),
+                        "inference_ms": inference_s / window * 1000.0,
+                        "annotate_latency_ms": latency_s / window * 1000.0,
+                        "preview_dropped": self.latest_frame.dropped,
+                        "input_size": self.detector.input_size,
+                    })
+                    window = 0
+                    inference_s = latency_s = 0.0
+                    last_emit = now
+            
+            self.latest_frame.flush()
+            if self.source.error:
+                self.error.emit(self.source.error)
+        
+        except Exception as e:
+            self.error.emit(f"Live processing failed: {str(e)}")
+        
+        finally:
+            self.source.stop()
+            self.finished.emit()
     
     def stop(self):
         """Stop processing"""
@@ -0,0 +1,122 @@
+"""Tests for CandidateCache and re-deriving frames from re-filtered keyframes"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.core.candidate_cache import CandidateCache
+from src.core.detector import Detections
+from src.core.media_handler import MediaHandler
+from src.core.tracker import IoUTracker
+
+NAMES = {0: "pedestrian"}
+
+
+def candidates(*confidences: float, x: int = 0) -> Detections:
+    """Non-overlapping boxes starting at x, one per confidence"""
+    n = len(confidences)
+    boxes = np.array([[x + 20 * i, 0, x + 20 * i + 10, 10] for i in range(n)]).reshape(-1, 4)
+    return Detections(boxes, np.array(confidences), np.zeros(n, dtype=np.int32), NAMES)
+
+
+class StubDetector:
+    """detect_candidates() returns canned candidates and counts the frames it was given"""
+    
+    def __init__(self, conf: float = 0.5, iou: float = 0.5):
+        self.conf_threshold = conf
+        self.iou_threshold = iou
+        self.calls = 0
+    
+    def detect_candidates(self, frames, batch_size=8):
+        self.calls += len(frames)
+        return [candidates(0.9, 0.4) for _ in frames]
+
+
+def test_get_put_and_clear():
+    cache = CandidateCache()
+    assert cache.get("a", 0) is None
+    
+    cache.put("a", 0, candidates(0.9))
+    cache.put("a", 1, candidates(0.9, 0.8))
+    cache.put("b", 0, candidates(0.7))
+    assert len(cache) == 3
+    assert len(cache.get("a", 1)) == 2
+    assert sorted(cache.frames("a")) == [0, 1]
+    
+    # Replacing an entry does not count its bytes twice
+    nbytes = cache.nbytes
+    cache.put("a", 0, candidates(0.5))
+    assert cache.nbytes == nbytes
+    
+    cache.clear("a")
+    assert len(cache) == 1
+    assert cache.nbytes == candidates(0.7).nbytes
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_evicts_least_recently_used_over_budget():
+    entry = candidates(0.9, 0.8)
+    cache = CandidateCache(memory_budget_mb=2.5 * entry.nbytes / (1024 * 1024))
+    cache.put("a", 0, entry)
+    cache.put("a", 1, candidates(0.9, 0.8))
+    cache.get("a", 0)  # Frame 0 becomes the most recently used
+    cache.put("a", 2, candidates(0.9, 0.8))
+    
+    assert sorted(cache.frames("a")) == [0, 2]
+    assert cache.evictions == 1
+    assert cache.nbytes <= cache.memory_budget
+
+
+def test_keeps_one_entry_larger_than_the_budget():
+    cache = CandidateCache(memory_budget_mb=0)
+    cache.put("a", 0, candidates(0.9))
+    cache.put("a", 1, candidates(0.9))
+    assert list(cache.frames("a")) == [1]
+
+
+def test_detect_runs_the_model_only_for_missing_frames():
+    detector = StubDetector(conf=0.5)
+    cache = CandidateCache()
+    frames = [(9, None), (19, None)]
+    
+    first = cache.detect(detector, "a", frames)
+    assert detector.calls == 2
+    assert [len(d) for d in first] == [1, 1]
+    
+    detector.conf_threshold = 0.3
+    second = cache.detect(detector, "a", frames + [(29, None)])
+    assert detector.calls == 3
+    assert [len(d) for d in second] == [2, 2, 2]
+    # Keys are source frame indices, not positions
+    assert sorted(cache.refilter("a", 0.5, 0.5)) == [9, 19, 29]
+
+
+def test_media_key_tracks_file_and_model_setup(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"frames")
+    detector = SimpleNamespace(backend="onnx", precision="fp32", input_size=640)
+    
+    key = CandidateCache.media_key(path, detector)
+    assert CandidateCache.media_key(path, detector) == key
+    for field, value in (("input_size", 480), ("backend", "openvino"), ("precision", "int8-dynamic")):
+        changed = SimpleNamespace(**{**vars(detector), field: value})
+        assert CandidateCache.media_key(path, changed) != key
+
+
+def test_replay_rebuilds_reused_and_skipped_frames():
+    # Sampled run: keyframes 9 and 19, then a motion-gated reuse and skipped frames in between
+    schedule = [(9, "infer"), (10, "skip"), (19, "infer"), (20, "skip"), (29, "reuse")]
+    keyframes = {9: candidates(0.9, 0.6), 19: candidates(0.9, 0.6, x=2)}
+    refiltered = {index: c.filter(0.7, 0.5) for index, c in keyframes.items()}
+    
+    untracked = MediaHandler.replay_detections(schedule, refiltered)
+    assert [len(d) for d in untracked] == [1, 0, 1, 0, 1]
+    assert untracked[4] is untracked[2]
+    
+    tracked = MediaHandler.replay_detections(schedule, refiltered, IoUTracker())
+    assert [len(d) for d in tracked] == [1, 1, 1, 1, 1]
+    # The keyframe box keeps its track, predicted boxes carry it on and the reused frame repeats keyframe 19
+    assert [d.track_ids.tolist() for d in tracked] == [[1]] * 5
+    assert tracked[2].boxes.tolist() == [[2, 0, 12, 10]]
+    assert tracked[4] is tracked[2]
@@ -0,0 +1,55 @@
+"""Tests for FrameStore"""
+import numpy as np
+import pytest
+
+from src.utils.frame_store import FrameStore
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+def test_append_and_read_back(tmp_path):
+    with FrameStore(directory=tmp_path, chunk_frames=2) as store:
+        for i in range(5):
+            assert store.append(frame(i)) == i
+        
+        assert len(store) == 5
+        assert store.nbytes == 5 * frame(0).nbytes
+        assert store[3][0, 0, 0] == 3
+        assert store[-1][0, 0, 0] == 4
+        assert [f[0, 0, 0] for f in store] == [0, 1, 2, 3, 4]
+        with pytest.raises(IndexError):
+            store[5]
+
+
+def test_rejects_a_different_frame_shape(tmp_path):
+    with FrameStore(directory=tmp_path) as store:
+        store.append(frame(0))
+        with pytest.raises(ValueError):
+            store.append(np.zeros((2, 2, 3), dtype=np.uint8))
+
+
+def test_cache_keeps_recently_viewed_frames_within_budget(tmp_path):
+    frame_mb = frame(0).nbytes / (1024 * 1024)
+    with FrameStore(directory=tmp_path, cache_mb=2.5 * frame_mb) as store:
+        for i in range(4):
+            store.append(frame(i))
+        store[0]
+        store[1]
+        store[0]  # Frame 1 is now the least recently viewed
+        store[2]
+        
+        assert list(store._cache) == [0, 2]
+        assert store._cache_bytes <= store.cache_budget
+
+
+def test_close_deletes_the_file(tmp_path):
+    store = FrameStore(directory=tmp_path)
+    store.append(frame(1))
+    path = store.path
+    assert path.exists()
+    
+    store.close()
+    assert not path.exists()
+    assert len(store) == 0
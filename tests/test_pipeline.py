@@ -0,0 +1,79 @@
+"""Tests for the threaded Pipeline"""
+import threading
+
+import pytest
+
+from src.utils.pipeline import Pipeline
+
+
+def double(items):
+    for item in items:
+        yield item * 2
+
+
+def test_items_flow_through_stages_in_order():
+    pipeline = Pipeline(queue_size=2).set_source("source", lambda: range(100)).add_stage("double", double)
+    assert list(pipeline.run()) == [2 * i for i in range(100)]
+    
+    stats = pipeline.stats()
+    assert stats["source"]["items"] == 100
+    assert stats["double"]["items"] == 100
+
+
+def test_stages_may_batch_and_drop_items():
+    def pairs(items):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == 2:
+                yield sum(batch)
+                batch = []
+        if batch:
+            yield sum(batch)
+    
+    pipeline = Pipeline().set_source("source", lambda: range(5)).add_stage("pairs", pairs)
+    assert list(pipeline.run()) == [1, 5, 4]
+
+
+def test_stop_ends_an_endless_source():
+    pipeline = Pipeline(queue_size=1).set_source("source", lambda: iter(int, 1)).add_stage("double", double)
+    received = 0
+    for _ in pipeline.run():
+        received += 1
+        if received == 10:
+            pipeline.stop()
+    
+    assert pipeline.stopped
+    assert not any(thread.is_alive() for thread in pipeline._threads)
+
+
+def test_stage_errors_reach_the_caller():
+    def fail(items):
+        for item in items:
+            if item == 3:
+                raise RuntimeError("bad frame")
+            yield item
+    
+    pipeline = Pipeline().set_source("source", lambda: range(10)).add_stage("fail", fail)
+    with pytest.raises(RuntimeError, match="bad frame"):
+        list(pipeline.run())
+
+
+def test_requires_a_source():
+    with pytest.raises(ValueError):
+        list(Pipeline().add_stage("double", double).run())
+
+
+def test_source_cleanup_runs_after_stop():
+    released = threading.Event()
+    
+    def source():
+        try:
+            yield from iter(int, 1)
+        finally:
+            released.set()
+    
+    pipeline = Pipeline(queue_size=1).set_source("source", source)
+    for _ in pipeline.run():
+        pipeline.stop()
+    assert released.wait(1.0)
@@ -0,0 +1,57 @@
+"""Tests for NumPy NMS and Detections.filter"""
+import numpy as np
+
+from src.core.detector import Detections
+from src.core.postprocess import batched_nms, box_overlap, nms
+
+
+def test_box_overlap():
+    box = np.array([0, 0, 10, 10], dtype=np.float32)
+    boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30], [0, 0, 5, 10]], dtype=np.float32)
+    
+    np.testing.assert_allclose(box_overlap(box, boxes), [1.0, 50 / 150, 0.0, 0.5])
+    # Intersection over the smaller box: a box fully inside another scores 1
+    np.testing.assert_allclose(box_overlap(box, boxes, "ios"), [1.0, 0.5, 0.0, 1.0])
+
+
+def test_nms_keeps_best_of_overlapping_boxes():
+    boxes = np.array([[0, 0, 10, 10], [1, 0, 11, 10], [20, 20, 30, 30], [21, 20, 31, 30]])
+    scores = np.array([0.6, 0.9, 0.5, 0.7])
+    
+    assert nms(boxes, scores, 0.5).tolist() == [1, 3]
+    # Nothing overlaps by more than 0.95
+    assert nms(boxes, scores, 0.95).tolist() == [1, 3, 0, 2]
+
+
+def test_nms_empty():
+    assert nms(np.zeros((0, 4)), np.zeros(0), 0.5).tolist() == []
+    assert batched_nms(np.zeros((0, 4)), np.zeros(0), np.zeros(0, dtype=np.int32), 0.5).tolist() == []
+
+
+def test_batched_nms_is_class_aware():
+    boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [1, 1, 10, 10]])
+    scores = np.array([0.8, 0.9, 0.7])
+    class_ids = np.array([0, 1, 0])
+    
+    # Identical boxes of different classes both survive; the same-class duplicate does not
+    assert sorted(batched_nms(boxes, scores, class_ids, 0.5).tolist()) == [0, 1]
+    assert nms(boxes, scores, 0.5).tolist() == [1]
+
+
+def test_filter_applies_confidence_nms_and_max_det():
+    candidates = Detections(
+        np.array([[0, 0, 10, 10], [1, 0, 11, 10], [20, 20, 30, 30], [40, 40, 50, 50]]),
+        np.array([0.9, 0.8, 0.3, 0.6]),
+        np.array([0, 0, 0, 1]),
+        {0: "pedestrian", 1: "car"},
+        track_ids=np.array([1, 2, 3, 4]),
+    )
+    
+    kept = candidates.filter(conf=0.5, iou=0.5)
+    assert kept.confidences.tolist() == np.float32([0.9, 0.6]).tolist()
+    assert kept.track_ids.tolist() == [1, 4]
+    assert kept.names == candidates.names
+    
+    assert len(candidates.filter(conf=0.1, iou=0.5)) == 3
+    assert len(candidates.filter(conf=0.1, iou=0.5, max_det=2)) == 2
+    assert len(candidates.filter(conf=0.95, iou=0.5)) == 0
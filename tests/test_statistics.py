@@ -0,0 +1,120 @@
+"""Tests for DetectionStatistics"""
+import json
+
+import numpy as np
+import pytest
+
+from src.core.detector import Detections
+from src.core.statistics import DetectionStatistics, class_breakdown
+
+NAMES = {0: "pedestrian", 1: "people", 2: "car"}
+
+
+def frame(*class_ids: int) -> Detections:
+    """Detections with one dummy box per class id"""
+    n = len(class_ids)
+    boxes = np.tile([0, 0, 10, 10], (n, 1))
+    return Detections(boxes, np.full(n, 0.9), np.array(class_ids, dtype=np.int32), NAMES)
+
+
+def test_empty():
+    stats = DetectionStatistics()
+    assert stats.frames == 0
+    assert stats.total == 0
+    assert stats.average == 0.0
+    assert stats.peak == (0, -1)
+    assert stats.class_totals() == {}
+    assert len(stats.series) == 0
+
+
+def test_add_counts_frames_and_classes():
+    stats = DetectionStatistics(num_classes=3)
+    assert stats.add(frame(2, 0, 2)) == 0
+    assert stats.add(frame()) == 1
+    assert stats.add(frame(1)) == 2
+    
+    assert stats.frames == 3
+    assert stats.total == 4
+    assert stats.average == pytest.approx(4 / 3)
+    assert stats.series.tolist() == [3, 0, 1]
+    assert stats.class_series("car").tolist() == [2, 0, 0]
+    assert stats.class_series("bicycle").tolist() == [0, 0, 0]
+    # First appearance order, not class id order
+    assert list(stats.class_totals().items()) == [("car", 2), ("pedestrian", 1), ("people", 1)]
+    assert stats.peak == (3, 0)
+    assert stats.last_breakdown == [("people", 1)]
+
+
+def test_grows_past_capacity_and_class_count():
+    stats = DetectionStatistics(num_classes=1, capacity=2)
+    for i in range(5):
+        stats.add(frame(*range(i + 1)))
+    
+    assert stats.frames == 5
+    assert stats.series.tolist() == [1, 2, 3, 4, 5]
+    assert stats.class_series("pedestrian").tolist() == [1, 1, 1, 1, 1]
+    assert stats.class_totals()["Class 4"] == 1
+    assert stats.frame_breakdown(2) == [("pedestrian", 1), ("people", 1), ("car", 1)]
+
+
+def test_replace_updates_totals_and_peak():
+    stats = DetectionStatistics(num_classes=3)
+    for detections in (frame(0), frame(0, 0, 1), frame(2, 2)):
+        stats.add(detections)
+    assert stats.peak == (3, 1)
+    
+    # Lowering the peak frame forces a recompute on the next read
+    stats.replace(1, frame(1))
+    assert stats.total == 4
+    assert stats.series.tolist() == [1, 1, 2]
+    assert stats.class_totals() == {"pedestrian": 1, "people": 1, "car": 2}
+    assert stats.peak == (2, 2)
+    
+    # A new maximum is taken immediately
+    stats.replace(0, frame(0, 0, 0, 0))
+    assert stats.peak == (4, 0)
+    assert stats.total == 7
+    
+    # Replacing the last frame refreshes the overlay breakdown
+    stats.replace(2, frame())
+    assert stats.last_breakdown == []
+    assert "car" not in stats.class_totals()
+
+
+def test_replace_and_breakdown_reject_unknown_frames():
+    stats = DetectionStatistics()
+    stats.add(frame(0))
+    with pytest.raises(IndexError):
+        stats.replace(1, frame())
+    with pytest.raises(IndexError):
+        stats.frame_breakdown(-1)
+
+
+def test_reset():
+    stats = DetectionStatistics(num_classes=3)
+    stats.add(frame(0, 1))
+    stats.reset()
+    assert stats.frames == 0
+    assert stats.total == 0
+    assert stats.class_totals() == {}
+    assert stats.peak == (0, -1)
+
+
+def test_save_json(tmp_path):
+    stats = DetectionStatistics.from_detections([frame(0), frame(0, 2)])
+    path = stats.save_json(tmp_path / "stats" / "run.json")
+    data = json.loads(path.read_text())
+    
+    assert data["frames"] == 2
+    assert data["total"] == 3
+    assert data["peak"] == 2
+    assert data["peak_frame"] == 1
+    assert data["classes"] == {"pedestrian": 2, "car": 1}
+    assert data["series"] == [1, 2]
+    assert data["class_series"] == {"pedestrian": [1, 1], "car": [0, 1]}
+    assert "series" not in stats.to_dict(include_series=False)
+
+
+def test_class_breakdown_order():
+    assert class_breakdown(frame()) == []
+    assert class_breakdown(frame(2, 0, 2)) == [("car", 2), ("pedestrian", 1)]
@@ -0,0 +1,67 @@
+"""Tests for IoUTracker"""
+import numpy as np
+
+from src.core.detector import Detections
+from src.core.tracker import IoUTracker, iou_matrix
+
+
+def boxes(*xs: int, class_ids=None, names=None) -> Detections:
+    """10x10 boxes at the given x positions"""
+    n = len(xs)
+    return Detections(
+        np.array([[x, 0, x + 10, 10] for x in xs]).reshape(-1, 4),
+        np.full(n, 0.9),
+        np.zeros(n, dtype=np.int32) if class_ids is None else np.array(class_ids),
+        names or {0: "pedestrian", 1: "car"},
+    )
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10], [100, 100, 110, 110]])
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10]])
+    np.testing.assert_allclose(iou_matrix(a, b), [[1.0, 50 / 150], [0.0, 0.0]], rtol=1e-6)
+
+
+def test_ids_follow_moving_objects():
+    tracker = IoUTracker(iou_threshold=0.3)
+    first = tracker.update(boxes(0, 100), 0)
+    assert first.track_ids.tolist() == [1, 2]
+    
+    # Listed in the other order and shifted a little: ids stay with their objects
+    second = tracker.update(boxes(102, 2), 1)
+    assert second.track_ids.tolist() == [2, 1]
+    
+    third = tracker.update(boxes(4, 300), 2)
+    assert third.track_ids.tolist() == [1, 3]
+
+
+def test_classes_never_match_each_other():
+    tracker = IoUTracker()
+    tracker.update(boxes(0, class_ids=[0]), 0)
+    assert tracker.update(boxes(0, class_ids=[1]), 1).track_ids.tolist() == [2]
+
+
+def test_predict_extrapolates_and_drops_lost_tracks():
+    tracker = IoUTracker(iou_threshold=0.1, max_misses=1, velocity_smoothing=0.0)
+    tracker.update(boxes(0), 0)
+    tracker.update(boxes(4), 2)
+    
+    predicted = tracker.predict(3)
+    assert predicted.track_ids.tolist() == [1]
+    assert predicted.boxes.tolist() == [[6, 0, 16, 10]]  # 2 px per frame
+    
+    # Unmatched tracks are not predicted, and are dropped after max_misses keyframes
+    tracker.update(Detections(), 4)
+    assert len(tracker.predict(5)) == 0
+    tracker.update(Detections(), 6)
+    assert tracker.tracks == []
+
+
+def test_reset_forgets_tracks_and_names():
+    tracker = IoUTracker()
+    tracker.update(boxes(0, names={0: "old"}), 0)
+    tracker.reset()
+    
+    assert tracker.tracks == []
+    assert tracker.names == {}
+    assert tracker.update(boxes(0), 0).track_ids.tolist() == [1]